@@ -4,35 +4,65 @@ Bitwarden agent for credential retrieval with user approval.
 This agent handles the entire credential request flow including user
 prompts, vault operations, and audit logging.
 """
+import asyncio
+import atexit
 import getpass
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
 
 from src.models.credential_response import CredentialResponse, CredentialStatus
-from src.utils.bitwarden_cli import BitwardenCLI, BitwardenCLIError
+from src.utils.bitwarden_cli import (
+    LOGIN_ITEM_TYPE, BitwardenCLI, BitwardenCLIError, is_stale_session_error, make_cli
+)
 from src.utils.credential_handler import SecureCredential
 from src.utils.audit_logger import AuditLogger
+from src.utils.session_cache import SessionCache
 
 logger = logging.getLogger(__name__)
 
+# Approval panel body, formatted per request
+APPROVAL_PANEL_TEMPLATE = (
+    "[bold cyan]Agent:[/bold cyan] {agent_name}\n"
+    "[bold cyan]Domain:[/bold cyan] {domain}\n"
+    "[bold cyan]Reason:[/bold cyan] {reason}\n\n"
+    "[bold yellow]Allow this agent to access your credentials?[/bold yellow]\n\n"
+    "[green]\\[Y][/green] Approve    [red]\\[N][/red] Deny    [dim]\\[Ctrl+C][/dim] Cancel"
+)
+
 
 class BitwardenAgent:
     """Agent responsible for credential retrieval from Bitwarden vault."""
 
-    def __init__(self, cli: Optional[BitwardenCLI] = None):
+    def __init__(
+        self,
+        cli: Optional[BitwardenCLI] = None,
+        session_ttl: Optional[int] = None,
+        session_cache: Optional[SessionCache] = None
+    ):
         """
         Initialize Bitwarden agent.
 
         Args:
-            cli: BitwardenCLI instance (injected for testing)
+            cli: BitwardenCLI instance (default: make_cli(); injected for testing)
+            session_ttl: Seconds a cached vault session stays valid
+                (default: BW_SESSION_TTL environment variable, or 900)
+            session_cache: Shared SessionCache (default: one owned by this agent)
         """
-        self.cli = cli or BitwardenCLI()
+        self.cli = cli or make_cli()
         self.audit_logger = AuditLogger()
-        self._session_key: Optional[str] = None
+        self.console = Console()
+        self.session_cache = session_cache or SessionCache(
+            self.cli,
+            self._get_vault_password,
+            ttl=session_ttl
+        )
+
+        # Lock the vault even if the process exits without reaching cleanup
+        atexit.register(self.ensure_locked)
 
     def request_credential(
         self,
@@ -67,51 +97,108 @@ class BitwardenAgent:
         )
 
         if not approval:
-            self.audit_logger.log_denial(agent_id, domain)
-            return CredentialResponse(
-                status=CredentialStatus.DENIED,
-                credential=None,
-                error_message="User denied credential access"
-            )
+            return self._denied_response(agent_id, domain)
 
-        # Get vault password
-        password = self._get_vault_password()
-        if not password:
-            return CredentialResponse(
-                status=CredentialStatus.ERROR,
-                credential=None,
-                error_message="No password provided"
-            )
+        # Retrieve credential (vault stays unlocked until ensure_locked())
+        try:
+            credential = self._retrieve_credential(domain)
+        except BitwardenCLIError as e:
+            return self._error_response(agent_id, domain, e)
+
+        return self._credential_response(agent_id, domain, credential)
+
+    async def request_credential_async(
+        self,
+        domain: str,
+        reason: str,
+        agent_id: str,
+        agent_name: str,
+        timeout: int = 300
+    ) -> CredentialResponse:
+        """
+        Request credential without blocking the event loop.
+
+        The approval prompt and vault unlock run in worker threads and vault
+        searches use async subprocesses, so browser automation keeps
+        running while waiting on the user or on bw.
+
+        Args:
+            domain: Domain name (e.g., "aa.com")
+            reason: Human-readable reason for request
+            agent_id: Unique identifier of requesting agent
+            agent_name: Display name of requesting agent
+            timeout: Seconds to wait for user approval
+
+        Returns:
+            CredentialResponse with status and optional credential
+        """
+        # Log request (no credentials)
+        self.audit_logger.log_request(agent_id, domain, reason)
 
-        # Retrieve credential with automatic vault locking
+        # Display approval prompt
+        approval = await asyncio.to_thread(
+            self._prompt_for_approval,
+            agent_name=agent_name,
+            domain=domain,
+            reason=reason,
+            timeout=timeout
+        )
+
+        if not approval:
+            return self._denied_response(agent_id, domain)
+
+        # Retrieve credential (vault stays unlocked until ensure_locked())
         try:
-            credential = self._retrieve_credential(domain, password)
-            if credential:
-                self.audit_logger.log_success(agent_id, domain)
-                return CredentialResponse(
-                    status=CredentialStatus.APPROVED,
-                    credential=credential,
-                    error_message=None
-                )
-            else:
-                self.audit_logger.log_not_found(agent_id, domain)
-                return CredentialResponse(
-                    status=CredentialStatus.NOT_FOUND,
-                    credential=None,
-                    error_message=f"No credential found for {domain}"
-                )
+            credential = await self._retrieve_credential_async(domain)
         except BitwardenCLIError as e:
-            self.audit_logger.log_error(agent_id, domain, str(e))
+            return self._error_response(agent_id, domain, e)
+
+        return self._credential_response(agent_id, domain, credential)
+
+    def _denied_response(self, agent_id: str, domain: str) -> CredentialResponse:
+        """Audit and build response for a denied request."""
+        self.audit_logger.log_denial(agent_id, domain)
+        return CredentialResponse(
+            status=CredentialStatus.DENIED,
+            credential=None,
+            error_message="User denied credential access"
+        )
+
+    def _error_response(
+        self,
+        agent_id: str,
+        domain: str,
+        error: BitwardenCLIError
+    ) -> CredentialResponse:
+        """Audit and build response for a failed vault operation."""
+        self.audit_logger.log_error(agent_id, domain, str(error))
+        return CredentialResponse(
+            status=CredentialStatus.ERROR,
+            credential=None,
+            error_message=str(error)
+        )
+
+    def _credential_response(
+        self,
+        agent_id: str,
+        domain: str,
+        credential: Optional[SecureCredential]
+    ) -> CredentialResponse:
+        """Audit and build response for a completed vault lookup."""
+        if credential:
+            self.audit_logger.log_success(agent_id, domain)
             return CredentialResponse(
-                status=CredentialStatus.ERROR,
-                credential=None,
-                error_message=str(e)
+                status=CredentialStatus.APPROVED,
+                credential=credential,
+                error_message=None
             )
-        finally:
-            # Clear password from memory
-            if password:
-                password = "X" * len(password)
-                del password
+
+        self.audit_logger.log_not_found(agent_id, domain)
+        return CredentialResponse(
+            status=CredentialStatus.NOT_FOUND,
+            credential=None,
+            error_message=f"No credential found for {domain}"
+        )
 
     def _prompt_for_approval(
         self,
@@ -128,18 +215,16 @@ class BitwardenAgent:
         Returns:
             True if approved, False if denied
         """
-        console = Console()
-
         panel = Panel(
-            f"[bold cyan]Agent:[/bold cyan] {agent_name}\n"
-            f"[bold cyan]Domain:[/bold cyan] {domain}\n"
-            f"[bold cyan]Reason:[/bold cyan] {reason}\n\n"
-            f"[bold yellow]Allow this agent to access your credentials?[/bold yellow]\n\n"
-            f"[green]\\[Y][/green] Approve    [red]\\[N][/red] Deny    [dim]\\[Ctrl+C][/dim] Cancel",
+            APPROVAL_PANEL_TEMPLATE.format(
+                agent_name=agent_name,
+                domain=domain,
+                reason=reason
+            ),
             title="🔐 Credential Access Request",
             border_style="blue"
         )
-        console.print(panel)
+        self.console.print(panel)
 
         response = Prompt.ask(
             "Decision",
@@ -149,26 +234,24 @@ class BitwardenAgent:
 
         return response.upper() == "Y"
 
-    def _get_vault_password(self) -> str:
+    def _get_vault_password(self) -> bytearray:
         """
         Securely collect vault password from user.
 
         Returns:
-            Password string (will be cleared after use)
+            Password bytes in a mutable buffer (zeroed after use)
         """
-        return getpass.getpass("Enter Bitwarden vault password: ")
+        return bytearray(getpass.getpass("Enter Bitwarden vault password: ").encode('utf-8'))
 
-    def _retrieve_credential(
-        self,
-        domain: str,
-        password: str
-    ) -> Optional[SecureCredential]:
+    def _retrieve_credential(self, domain: str) -> Optional[SecureCredential]:
         """
-        Unlock vault, retrieve credential, lock vault.
+        Retrieve credential using the cached vault session.
+
+        If the cached session has been invalidated (e.g. vault locked
+        externally), the session is dropped and the vault unlocked once more.
 
         Args:
             domain: Domain to search for
-            password: Vault password
 
         Returns:
             SecureCredential if found, None otherwise
@@ -176,45 +259,88 @@ class BitwardenAgent:
         Raises:
             BitwardenCLIError: If CLI operations fail
         """
-        session_key = None
-        try:
-            # Unlock vault
-            logger.info("Unlocking Bitwarden vault...")
-            session_key = self.cli.unlock(password)
+        had_cached_session = self.session_cache.cached_session_key() is not None
+        session_key = self.session_cache.get_session_key()
 
-            # Search for credential
-            logger.info(f"Searching vault for {domain}...")
+        logger.info(f"Searching vault for {domain}...")
+        try:
+            items = self.cli.list_items(domain, session_key)
+        except BitwardenCLIError as e:
+            if not had_cached_session or not is_stale_session_error(e):
+                raise
+            logger.info("Cached vault session rejected, unlocking again...")
+            self.session_cache.invalidate()
+            session_key = self.session_cache.get_session_key()
             items = self.cli.list_items(domain, session_key)
 
-            # Find first login item
-            login_item = next(
-                (item for item in items if item.get("type") == 1),  # type=1 is login
-                None
-            )
+        return self._extract_credential(domain, items)
 
-            if not login_item:
-                return None
+    async def _retrieve_credential_async(self, domain: str) -> Optional[SecureCredential]:
+        """
+        Async variant of _retrieve_credential().
 
-            # Extract credentials
-            username = login_item.get("login", {}).get("username")
-            password_value = login_item.get("login", {}).get("password")
+        Raises:
+            BitwardenCLIError: If CLI operations fail
+        """
+        had_cached_session = self.session_cache.cached_session_key() is not None
+        session_key = await asyncio.to_thread(self.session_cache.get_session_key)
 
-            if not username or not password_value:
-                raise BitwardenCLIError(
-                    f"Credential for {domain} missing username or password"
-                )
+        logger.info(f"Searching vault for {domain}...")
+        try:
+            items = await self.cli.list_items_async(domain, session_key)
+        except BitwardenCLIError as e:
+            if not had_cached_session or not is_stale_session_error(e):
+                raise
+            logger.info("Cached vault session rejected, unlocking again...")
+            self.session_cache.invalidate()
+            session_key = await asyncio.to_thread(self.session_cache.get_session_key)
+            items = await self.cli.list_items_async(domain, session_key)
 
-            return SecureCredential(username, password_value)
+        return self._extract_credential(domain, items)
 
-        finally:
-            # Always lock vault
-            if session_key:
-                logger.info("Locking vault...")
-                self.cli.lock()
+    def _extract_credential(self, domain: str, items: List[Dict]) -> Optional[SecureCredential]:
+        """
+        Pick the first login item and wrap it as a SecureCredential.
+
+        Args:
+            domain: Domain searched for (used in error messages)
+            items: Vault items returned by the search
+
+        Returns:
+            SecureCredential if a login item was found, None otherwise
+
+        Raises:
+            BitwardenCLIError: If the login item lacks username or password
+        """
+        # Find first login item
+        login_item = next(
+            (item for item in items if item.get("type") == LOGIN_ITEM_TYPE),
+            None
+        )
+
+        if not login_item:
+            return None
+
+        # Extract credentials
+        username = login_item.get("login", {}).get("username")
+        password_value = login_item.get("login", {}).get("password")
+
+        if not username or not password_value:
+            raise BitwardenCLIError(
+                f"Credential for {domain} missing username or password"
+            )
+
+        return SecureCredential(username, password_value)
 
     def ensure_locked(self) -> None:
-        """Ensure vault is locked (called during cleanup)."""
+        """Ensure vault is locked (called during cleanup and at exit)."""
+        atexit.unregister(self.ensure_locked)
+        self.session_cache.invalidate()
         try:
+            logger.info("Locking vault...")
             self.cli.lock()
         except Exception as e:
             logger.warning(f"Failed to lock vault during cleanup: {e}")
+        finally:
+            self.cli.close()
+            self.audit_logger.close()
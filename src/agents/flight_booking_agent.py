@@ -7,7 +7,7 @@ import asyncio
 import logging
 from typing import Optional
 
-from playwright.async_api import async_playwright, Browser, Page, Playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright, Browser, BrowserContext, ElementHandle, Locator, Page, Playwright, TimeoutError as PlaywrightTimeoutError
 from playwright_stealth import Stealth
 
 from src.agents.bitwarden_agent import BitwardenAgent
@@ -16,6 +16,26 @@ from src.utils.credential_handler import SecureCredential
 
 logger = logging.getLogger(__name__)
 
+# aa.com login form selectors
+USERNAME_SELECTOR = 'input[type="email"], input[name="username"]'
+PASSWORD_SELECTOR = 'input[type="password"], input[name="password"]'
+SUBMIT_SELECTOR = 'button.adc-button.kind-primary'
+
+# OneTrust "Reject All" button on the cookie consent popup
+COOKIE_REJECT_SELECTOR = 'button.ot-pc-refuse-all-handler'
+
+# Installed into every page at creation; collects visible error/alert text
+ERROR_SCRAPER_SCRIPT = """
+window.__scrapeErrors = () => {
+    // Look for any element with error-related classes or text
+    const errorElements = document.querySelectorAll('[class*="error"], [class*="alert"], [role="alert"]');
+    return Array.from(errorElements)
+        .filter(el => el.offsetParent !== null)  // Only visible elements
+        .map(el => el.textContent.trim())
+        .join(' | ');
+};
+"""
+
 
 class FlightBookingAgent:
     """Agent responsible for aa.com login automation."""
@@ -23,7 +43,8 @@ class FlightBookingAgent:
     def __init__(
             self,
             bitwarden_agent: BitwardenAgent,
-            headless: bool = False
+            headless: bool = False,
+            user_data_dir: Optional[str] = None
     ):
         """
         Initialize flight booking agent.
@@ -31,68 +52,136 @@ class FlightBookingAgent:
         Args:
             bitwarden_agent: BitwardenAgent instance for credential requests
             headless: Whether to run browser in headless mode
+            user_data_dir: Browser profile directory to keep cookies across
+                runs (default: None, a fresh context)
         """
         self.bitwarden_agent = bitwarden_agent
         self.headless = headless
+        self.user_data_dir = user_data_dir
+        self._playwright_cm = None
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._context: Optional[BrowserContext] = None
+
+    async def __aenter__(self) -> 'FlightBookingAgent':
+        """Start browser for reuse across run() calls."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Shut down browser."""
+        await self.close()
+
+    async def start(self) -> None:
+        """
+        Launch browser and context once.
+
+        Subsequent run() calls open a page in the existing context instead of
+        paying full browser startup again.
+        """
+        if self._context is not None:
+            return
+
+        # Use stealth context manager for the entire browser session
+        self._playwright_cm = Stealth().use_async(async_playwright())
+        self._playwright = await self._playwright_cm.__aenter__()
+
+        # Launch browser with stealth mode applied
+        logger.info(f"Launching browser with stealth mode (headless={self.headless})...")
+        if self.user_data_dir:
+            self._context = await self._playwright.chromium.launch_persistent_context(
+                self.user_data_dir,
+                headless=self.headless,
+                chromium_sandbox=False
+            )
+        else:
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.headless,
+                chromium_sandbox=False
+            )
+            self._context = await self._browser.new_context()
+        await self._context.add_init_script(ERROR_SCRAPER_SCRIPT)
+        logger.debug("Stealth mode applied to browser")
+
+    async def close(self) -> None:
+        """Close browser context, browser and Playwright."""
+        try:
+            if self._context is not None:
+                await self._context.close()
+            if self._browser is not None:
+                await self._browser.close()
+        finally:
+            if self._playwright_cm is not None:
+                await self._playwright_cm.__aexit__(None, None, None)
+            self._context = None
+            self._browser = None
+            self._playwright = None
+            self._playwright_cm = None
 
     async def run(self) -> bool:
         """
         Execute flight booking task (login to aa.com).
 
+        Reuses the browser started by start()/async with; otherwise a browser
+        is launched for this run only.
+
         Returns:
             True if login successful, False otherwise
         """
-        # Use stealth context manager for the entire browser session
-        async with Stealth().use_async(async_playwright()) as playwright:
-            try:
-                # Launch browser with stealth mode applied
-                logger.info(f"Launching browser with stealth mode (headless={self.headless})...")
-                browser = await playwright.chromium.launch(headless=self.headless)
-                page = await browser.new_page()
-                logger.debug("Stealth mode applied to browser")
-
-                # Navigate to login page
-                logger.info("Navigating to aa.com...")
-                await page.goto("https://www.aa.com/login")
-
-                # Wait for login form
-                await self._wait_for_login_form(page)
-
-                # Request credentials
-                logger.info("Requesting credentials from Bitwarden...")
-                response = self.bitwarden_agent.request_credential(
-                    domain="aa.com",
-                    reason="Logging in to search and book flights",
-                    agent_id="flight-booking-001",
-                    agent_name="Flight Booking Agent"
-                )
+        owns_browser = self._context is None
+        if owns_browser:
+            await self.start()
 
-                # Handle response
-                if response.status == CredentialStatus.DENIED:
-                    logger.info("User denied credential access")
-                    return False
+        page = await self._context.new_page()
+        try:
+            # Load the login page first: the approval prompt runs in a worker
+            # thread that cannot be cancelled, so it is only shown once there
+            # is a form to fill
+            await self._navigate_to_login(page)
+
+            logger.info("Requesting credentials from Bitwarden...")
+            response = await self.bitwarden_agent.request_credential_async(
+                domain="aa.com",
+                reason="Logging in to search and book flights",
+                agent_id="flight-booking-001",
+                agent_name="Flight Booking Agent"
+            )
+
+            # Handle response
+            if response.status == CredentialStatus.DENIED:
+                logger.info("User denied credential access")
+                return False
+
+            if response.status == CredentialStatus.NOT_FOUND:
+                logger.error(f"Credential not found: {response.error_message}")
+                return False
+
+            if response.status == CredentialStatus.ERROR:
+                logger.error(f"Error retrieving credential: {response.error_message}")
+                return False
 
-                if response.status == CredentialStatus.NOT_FOUND:
-                    logger.error(f"Credential not found: {response.error_message}")
-                    return False
+            # Fill login form with credential
+            with response.credential as cred:
+                success = await self._login(page, cred)
 
-                if response.status == CredentialStatus.ERROR:
-                    logger.error(f"Error retrieving credential: {response.error_message}")
-                    return False
+            return success
 
-                # Fill login form with credential
-                with response.credential as cred:
-                    success = await self._login(page, cred)
+        finally:
+            # Cleanup page (and browser if launched for this run only)
+            await page.close()
+            if owns_browser:
+                await self.close()
 
-                return success
+    async def _navigate_to_login(self, page: Page) -> None:
+        """
+        Open aa.com login page and wait for the form.
 
-            finally:
-                # Cleanup browser
-                if 'page' in locals():
-                    await page.close()
-                if 'browser' in locals():
-                    await browser.close()
-                # playwright context manager handles cleanup
+        Args:
+            page: Playwright page object
+        """
+        logger.info("Navigating to aa.com...")
+        await page.goto("https://www.aa.com/login")
+        await self._wait_for_login_form(page)
 
     async def _wait_for_login_form(self, page: Page) -> None:
         """
@@ -102,46 +191,82 @@ class FlightBookingAgent:
             page: Playwright page object
         """
         logger.info("Waiting for login form...")
-        await page.wait_for_selector(
-            'input[type="email"], input[name="username"]',
-            timeout=30000
-        )
+        await page.wait_for_selector(USERNAME_SELECTOR, timeout=30000)
 
-    async def _dismiss_cookie_consent(self, page: Page) -> None:
-        """Dismiss OneTrust cookie consent popup (often in iframe)."""
+    async def _is_visible(self, locator: Locator, timeout: float = 5000) -> bool:
+        """
+        Wait for locator to become visible.
+
+        Args:
+            locator: Playwright locator
+            timeout: Maximum wait in milliseconds
+
+        Returns:
+            True if visible within timeout, False otherwise
+        """
         try:
-            logger.info("Checking for cookie consent popup...")
+            await locator.wait_for(state='visible', timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    async def _wait_for_visible_in_any_frame(
+            self,
+            page: Page,
+            selector: str,
+            timeout: float
+    ) -> Optional[ElementHandle]:
+        """
+        Wait for selector to become visible in the page or any of its frames.
 
-            # OneTrust cookie popup is often in an iframe
-            # Wait for iframe to load
-            await page.wait_for_timeout(2000)
+        Returns as soon as the first frame shows a match instead of sleeping
+        for a fixed duration.
 
-            # Try to find the OneTrust iframe
-            frames = page.frames
-            logger.debug(f"Found {len(frames)} frames on page")
+        Args:
+            page: Playwright page object
+            selector: CSS selector to wait for
+            timeout: Maximum wait in milliseconds
 
-            for frame in frames:
-                # Look for Reject All button in each frame
+        Returns:
+            Element handle of the first visible match, or None on timeout
+        """
+        tasks = [
+            asyncio.create_task(
+                frame.wait_for_selector(selector, state='visible', timeout=timeout)
+            )
+            for frame in page.frames
+        ]
+        try:
+            for finished in asyncio.as_completed(tasks):
                 try:
-                    reject_button = await frame.query_selector('button.ot-pc-refuse-all-handler')
-                    if reject_button and await reject_button.is_visible():
-                        logger.info("Found Reject All button in iframe, clicking...")
-                        await reject_button.click()
-                        await page.wait_for_timeout(1000)
-                        logger.info("Cookie popup dismissed")
-                        return
-                except:
-                    continue
-
-            # If not in iframe, try main page
-            reject_button = await page.query_selector('button.ot-pc-refuse-all-handler')
-            if reject_button and await reject_button.is_visible():
-                logger.info("Dismissing cookie consent popup (Reject All)...")
-                await reject_button.click()
-                await page.wait_for_timeout(1000)
-                logger.info("Cookie popup dismissed")
-            else:
+                    handle = await finished
+                except Exception:
+                    continue  # Timed out or frame detached
+                if handle:
+                    return handle
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _dismiss_cookie_consent(self, page: Page) -> None:
+        """Dismiss OneTrust cookie consent popup (often in iframe)."""
+        try:
+            logger.info("Checking for cookie consent popup...")
+
+            # OneTrust popup may be in the main page or an iframe
+            reject_button = await self._wait_for_visible_in_any_frame(
+                page, COOKIE_REJECT_SELECTOR, timeout=2000
+            )
+            if not reject_button:
                 logger.debug("No visible cookie consent popup found (may have auto-dismissed)")
+                return
+
+            logger.info("Dismissing cookie consent popup (Reject All)...")
+            await reject_button.click()
+            await reject_button.wait_for_element_state('hidden', timeout=2000)
+            logger.info("Cookie popup dismissed")
 
         except Exception as e:
             logger.warning(f"Cookie consent handling failed (non-critical): {e}")
@@ -164,30 +289,34 @@ class FlightBookingAgent:
 
             logger.info("Filling login form...")
 
+            # Locators are resolved lazily and auto-wait, so each field is a
+            # single round trip when used
+            username_field = page.locator(USERNAME_SELECTOR).first
+            password_field = page.locator(PASSWORD_SELECTOR).first
+            submit_button = page.locator(SUBMIT_SELECTOR).first
+
             # Find and focus username field
-            username_field = await page.query_selector('input[type="email"], input[name="username"]')
-            if not username_field:
+            if not await self._is_visible(username_field):
                 logger.error("Username field not found")
                 return False
 
-            # Click to focus, then type (triggers validation events)
+            # Click to focus, then fill (fill() waits for the field to be editable
+            # and fires the input event the validator listens for)
             await username_field.click()
-            await page.wait_for_timeout(500)  # Brief pause
-            await username_field.type(credential.username, delay=50)  # Type with delay
-            logger.debug("Username typed")
+            await username_field.fill(credential.username)
+            logger.debug("Username filled")
 
-            # Tab or click to password field (triggers blur event on username)
+            # Tab to password field (triggers blur event on username)
             await page.keyboard.press('Tab')
-            await page.wait_for_timeout(500)
 
-            # Type password
-            password_field = await page.query_selector('input[type="password"], input[name="password"]')
-            if not password_field:
+            # Fill password
+            if not await self._is_visible(password_field):
                 logger.error("Password field not found")
                 return False
 
-            await password_field.type(credential.password, delay=50)  # Type with delay
-            logger.debug("Password typed")
+            await password_field.fill(credential.password)
+            await password_field.dispatch_event('change')
+            logger.debug("Password filled")
 
             # Wait a moment for any validation to complete
             await page.wait_for_timeout(1000)
@@ -196,9 +325,7 @@ class FlightBookingAgent:
             logger.info("Submitting login form...")
 
             # Check if submit button is now enabled (validation may have disabled it)
-            submit_button = await page.query_selector('button.adc-button.kind-primary')
-
-            if not submit_button:
+            if not await self._is_visible(submit_button):
                 logger.error("Submit button not found")
                 await page.screenshot(path="no_submit_button.png")
                 return False
@@ -234,14 +361,7 @@ class FlightBookingAgent:
                 logger.info("Screenshot saved to login_failed.png")
 
                 # Check for any visible errors
-                error_text = await page.evaluate('''() => {
-                    // Look for any element with error-related classes or text
-                    const errorElements = document.querySelectorAll('[class*="error"], [class*="alert"], [role="alert"]');
-                    return Array.from(errorElements)
-                        .filter(el => el.offsetParent !== null)  // Only visible elements
-                        .map(el => el.textContent.trim())
-                        .join(' | ');
-                }''')
+                error_text = await page.evaluate('window.__scrapeErrors()')
 
                 if error_text:
                     logger.error(f"Errors found on page: {error_text}")
@@ -10,7 +10,7 @@ Usage:
 
 The client will:
 - Display pairing codes when agents initiate pairing
-- Prompt for pairing code + master password
+- Prompt for pairing code + master password (once per vault session)
 - Prompt for credential approvals (Y/N only, no password)
 - Run until Ctrl+C
 
@@ -24,11 +24,14 @@ import logging
 import sys
 import threading
 import getpass
-import time
+from collections import deque
+from typing import Optional
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 from src.server.approval_server import run_server, pairing_manager
+from src.utils.bitwarden_cli import BitwardenCLIError, make_cli
+from src.utils.session_cache import SessionCache
 
 logger = logging.getLogger(__name__)
 
@@ -36,10 +39,34 @@ logger = logging.getLogger(__name__)
 class ApprovalCallbackHandler:
     """Callback handler for PairingManager to interact with UI."""
 
-    def __init__(self):
-        """Initialize callback handler."""
+    # Panel bodies, formatted per event
+    PAIRING_PANEL_TEMPLATE = (
+        "[bold cyan]Agent:[/bold cyan] {agent_name}\n"
+        "[bold cyan]Agent ID:[/bold cyan] {agent_id}\n\n"
+        "[bold yellow]Pairing code:[/bold yellow] [bold green]{pairing_code}[/bold green]\n\n"
+        "A pairing request has been received.\n"
+        "You will be prompted to enter the code and master password."
+    )
+    REQUEST_PANEL_TEMPLATE = (
+        "[bold cyan]Agent:[/bold cyan] {agent_name}\n"
+        "[bold cyan]Domain:[/bold cyan] {domain}\n"
+        "[bold cyan]Reason:[/bold cyan] {reason}\n\n"
+        "[bold yellow]Allow this agent to access your credentials?[/bold yellow]"
+    )
+
+    def __init__(self, session_cache: Optional[SessionCache] = None):
+        """
+        Initialize callback handler.
+
+        Args:
+            session_cache: Shared vault SessionCache; when set, approved
+                requests fetch a current session key from it
+        """
         self.console = Console()
-        self.pending_pairings = []
+        self.session_cache = session_cache
+        self.pending_pairings = deque()
+        self._pending_lock = threading.Lock()  # Producer: Flask thread, consumer: UI thread
+        self.new_pairing = threading.Event()  # Set when a pairing is queued
 
     def on_pairing_created(self, pairing_state):
         """
@@ -50,25 +77,39 @@ class ApprovalCallbackHandler:
         """
         self.console.print()
         panel = Panel(
-            f"[bold cyan]Agent:[/bold cyan] {pairing_state.agent_name}\n"
-            f"[bold cyan]Agent ID:[/bold cyan] {pairing_state.agent_id}\n\n"
-            f"[bold yellow]Pairing code:[/bold yellow] [bold green]{pairing_state.pairing_code}[/bold green]\n\n"
-            f"A pairing request has been received.\n"
-            f"You will be prompted to enter the code and master password.",
+            self.PAIRING_PANEL_TEMPLATE.format(
+                agent_name=pairing_state.agent_name,
+                agent_id=pairing_state.agent_id,
+                pairing_code=pairing_state.pairing_code
+            ),
             title="🔗 New Pairing Request",
             border_style="blue"
         )
         self.console.print(panel)
         self.console.print()
 
-        # Store for processing
-        self.pending_pairings.append(pairing_state)
+        # Store for processing and wake the UI thread
+        with self._pending_lock:
+            self.pending_pairings.append(pairing_state)
+        self.new_pairing.set()
+
+    def next_pairing(self):
+        """
+        Pop the oldest pending pairing.
+
+        Returns:
+            PairingState, or None if no pairing is pending
+        """
+        with self._pending_lock:
+            return self.pending_pairings.popleft() if self.pending_pairings else None
 
     def handle_credential_request(self, session, domain, reason):
         """
         Prompt user for approval of credential request.
 
-        CRITICAL: Vault is already unlocked (during pairing). No password prompt here.
+        CRITICAL: Vault is already unlocked (during pairing). The session key is
+        taken from the session cache, which only prompts for the password again
+        once the vault session TTL has expired.
 
         Args:
             session: Session object with agent details
@@ -76,17 +117,18 @@ class ApprovalCallbackHandler:
             reason: Reason provided by agent
 
         Returns:
-            Dict with 'approved' bool
+            Dict with 'approved' bool and, if approved, current 'session_token'
         """
         self.console.print()
         self.console.print("[bold yellow]═══ Incoming Credential Request ═══[/bold yellow]")
         self.console.print()
 
         panel = Panel(
-            f"[bold cyan]Agent:[/bold cyan] {session.agent_name}\n"
-            f"[bold cyan]Domain:[/bold cyan] {domain}\n"
-            f"[bold cyan]Reason:[/bold cyan] {reason}\n\n"
-            f"[bold yellow]Allow this agent to access your credentials?[/bold yellow]",
+            self.REQUEST_PANEL_TEMPLATE.format(
+                agent_name=session.agent_name,
+                domain=domain,
+                reason=reason
+            ),
             title="🔐 Credential Access Request",
             border_style="blue"
         )
@@ -97,9 +139,17 @@ class ApprovalCallbackHandler:
         approved = Confirm.ask("[bold]Approve?[/bold]", default=False)
 
         if approved:
+            result = {"approved": True}
+            if self.session_cache:
+                try:
+                    result["session_token"] = self.session_cache.get_session_key()
+                except BitwardenCLIError as e:
+                    self.console.print(f"[red]✗[/red] Vault unlock failed: {e}")
+                    self.console.print()
+                    return {"approved": False, "error": f"Vault unlock failed: {e}"}
             self.console.print("[green]✓[/green] Approved - retrieving credential...")
             self.console.print()
-            return {"approved": True}
+            return result
         else:
             self.console.print("[red]✗[/red] Denied")
             self.console.print()
@@ -112,7 +162,10 @@ class ApprovalClient:
     def __init__(self):
         """Initialize approval client."""
         self.console = Console()
-        self.callback_handler = ApprovalCallbackHandler()
+        # One CLI for unlock and every lookup (`bw serve` backed if BW_SERVE=1)
+        self.cli = make_cli()
+        self.session_cache = SessionCache(self.cli, self._get_master_password)
+        self.callback_handler = ApprovalCallbackHandler(self.session_cache)
         self.running = True
 
     def run(self, host='127.0.0.1', port=5000):
@@ -123,20 +176,25 @@ class ApprovalClient:
             host: Host to bind server to (default: 127.0.0.1)
             port: Port to bind server to (default: 5000)
         """
-        # Register callback handler
+        # Register callback handler and share the vault CLI and session cache
         pairing_manager.set_callback_handler(self.callback_handler)
+        pairing_manager.set_cli(self.cli, self.session_cache)
 
         # Start Flask server in background thread
+        server_ready = threading.Event()
         server_thread = threading.Thread(
             target=run_server,
-            args=(host, port),
+            args=(host, port, server_ready),
             daemon=True
         )
         server_thread.start()
-        logger.info(f"Flask server started on {host}:{port}")
 
-        # Give server time to start
-        time.sleep(1)
+        # Wait until the server socket is bound
+        if not server_ready.wait(timeout=5.0):
+            logger.error(f"Flask server failed to start on {host}:{port}")
+            self.console.print(f"[red]✗[/red] Server failed to start on {host}:{port}")
+            return
+        logger.info(f"Flask server started on {host}:{port}")
 
         # Display welcome
         self.console.print()
@@ -151,15 +209,16 @@ class ApprovalClient:
         self.console.print()
 
         try:
-            # Simple loop that checks for pending pairings
+            # Sleep until a pairing arrives (timeout keeps Ctrl+C responsive)
             while self.running:
-                # Check for pending pairings
-                if self.callback_handler.pending_pairings:
-                    pairing = self.callback_handler.pending_pairings.pop(0)
-                    self._handle_pairing_prompt(pairing)
+                if not self.callback_handler.new_pairing.wait(timeout=1.0):
+                    continue
+                self.callback_handler.new_pairing.clear()
 
-                # Sleep briefly to avoid busy-wait
-                time.sleep(0.5)
+                pairing = self.callback_handler.next_pairing()
+                while pairing is not None:
+                    self._handle_pairing_prompt(pairing)
+                    pairing = self.callback_handler.next_pairing()
 
         except KeyboardInterrupt:
             self.console.print()
@@ -181,26 +240,35 @@ class ApprovalClient:
             self.console.print()
             return
 
-        # Get master password
+        # Get vault session (prompts for master password only if not cached)
         self.console.print()
-        master_password = getpass.getpass("Bitwarden master password: ")
-
-        if not master_password:
-            self.console.print("[red]✗[/red] Password required")
+        try:
+            session_token = self.session_cache.get_session_key()
+        except BitwardenCLIError as e:
+            self.console.print(f"[red]✗[/red] Vault unlock failed: {e}")
             self.console.print()
             return
 
         # Process pairing
-        success = pairing_manager.mark_user_entered_code(code, master_password)
+        success = pairing_manager.mark_user_entered_code(code, session_token=session_token)
 
         if success:
             self.console.print("[green]✓[/green] Pairing successful - vault unlocked")
             self.console.print("[yellow]Waiting for credential requests...[/yellow]")
             self.console.print()
         else:
-            self.console.print("[red]✗[/red] Pairing failed (incorrect password or expired code)")
+            self.console.print("[red]✗[/red] Pairing failed (expired code)")
             self.console.print()
 
+    def _get_master_password(self) -> bytearray:
+        """
+        Collect master password from user.
+
+        Returns:
+            Password bytes in a mutable buffer (zeroed after unlock)
+        """
+        return bytearray(getpass.getpass("Bitwarden master password: ").encode('utf-8'))
+
 
 def main():
     """Main entry point for approval client."""
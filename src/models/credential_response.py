@@ -19,7 +19,13 @@ class CredentialStatus(Enum):
     ERROR = "error"            # Error during retrieval
 
 
-@dataclass
+class CredentialErrorCode(Enum):
+    """Machine-readable reason for an ERROR response."""
+    INVALID_SESSION = "invalid_session"    # Session unknown or revoked
+    EXPIRED_SESSION = "expired_session"    # Session timed out
+
+
+@dataclass(slots=True)
 class CredentialResponse:
     """
     Response to credential request.
@@ -28,7 +34,9 @@ class CredentialResponse:
         status: Outcome of request
         credential: SecureCredential if approved, None otherwise
         error_message: Error details if status is ERROR or NOT_FOUND
+        error_code: Reason for an ERROR, if the server reported one
     """
     status: CredentialStatus
     credential: Optional[SecureCredential]
     error_message: Optional[str]
+    error_code: Optional[CredentialErrorCode] = None
@@ -11,20 +11,40 @@ Workflow:
 4. Agent calls request_credential() to get credentials
 5. Credentials are encrypted with PAKE-derived key during transmission
 """
-from typing import Optional
-import requests
-import json
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
 import time
+import random
 import logging
 import base64
 import secrets
 import datetime
-from src.models.credential_response import CredentialResponse, CredentialStatus
+import itertools
+from src.models.credential_response import (
+    CredentialErrorCode,
+    CredentialResponse,
+    CredentialStatus
+)
 from src.utils.credential_handler import SecureCredential
 from src.sdk.pake_handler import PAKEHandler
+from src.utils import json_codec
+
+# requests is imported on first use to keep module import cheap
+if TYPE_CHECKING:
+    import requests
 
 logger = logging.getLogger(__name__)
 
+# Read timeout on the pairing event stream; the server sends a keepalive
+# comment every 15 seconds, so a longer silence means the stream is dead
+SSE_READ_TIMEOUT = 30
+
+# Backoff between reconnects if the pairing event stream drops (seconds)
+RECONNECT_INITIAL_DELAY = 1.0
+RECONNECT_MAX_DELAY = 5.0
+
+# Server "code" values -> CredentialErrorCode (unknown codes map to None)
+_ERROR_CODES = {code.value: code for code in CredentialErrorCode}
+
 
 class CredentialClient:
     """
@@ -51,6 +71,8 @@ class CredentialClient:
             with response.credential as cred:
                 # Use cred.username and cred.password
                 pass
+
+        client.close()  # Or use: with CredentialClient(...) as client
     """
 
     def __init__(self, server_url: str = "http://localhost:5000"):
@@ -63,8 +85,59 @@ class CredentialClient:
         self.server_url = server_url.rstrip('/')
         self.session_id: Optional[str] = None
         self.pake_handler: Optional[PAKEHandler] = None
+        self._http_session: Optional["requests.Session"] = None
+        self._pairing_code_callback: Optional[Callable[[str], None]] = None
+
+        # Request nonces: random per-client prefix + counter (unique without
+        # reading the CSPRNG on every request)
+        self._nonce_prefix = secrets.token_hex(4)
+        self._nonce_counter = itertools.count()
         logger.info(f"Initialized CredentialClient for server: {self.server_url}")
 
+    def __enter__(self) -> 'CredentialClient':
+        """Use client as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Release pooled connections."""
+        self.close()
+
+    @property
+    def _http(self) -> "requests.Session":
+        """HTTP session keeping connections to the server alive across calls."""
+        if self._http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=8,
+                max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+            )
+            self._http_session = requests.Session()
+            self._http_session.mount("http://", adapter)
+            self._http_session.mount("https://", adapter)
+        return self._http_session
+
+    def set_pairing_code_callback(self, callback: Optional[Callable[[str], None]]) -> None:
+        """
+        Register a callback that receives the pairing code as soon as it is issued.
+
+        pair() blocks until the user has entered the code, so callers that
+        need to show the code use this hook instead of the return value.
+
+        Args:
+            callback: Called once per pairing with the code, or None to clear
+        """
+        self._pairing_code_callback = callback
+
+    def close(self) -> None:
+        """Close pooled HTTP connections to the approval server."""
+        if self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
+
     def pair(self, agent_id: str, agent_name: str, timeout: int = 60) -> str:
         """
         Initiate pairing with approval server.
@@ -72,7 +145,7 @@ class CredentialClient:
         This method performs the complete PAKE pairing flow:
         1. Request pairing code from server
         2. Start PAKE exchange on client side
-        3. Poll server until user enters code
+        3. Wait on the server's event stream until user enters code
         4. Complete PAKE exchange and establish session
 
         Returns pairing code for user to enter in approval client.
@@ -89,20 +162,99 @@ class CredentialClient:
             ConnectionError: If server unreachable
             TimeoutError: If user doesn't enter code within timeout
         """
+        pairing_code, _ = self._pair(agent_id, agent_name, timeout)
+        return pairing_code
+
+    def pair_and_request(
+        self,
+        agent_id: str,
+        agent_name: str,
+        domain: str,
+        reason: str,
+        timeout: int = 60
+    ) -> CredentialResponse:
+        """
+        Pair and request the first credential in the same exchange call.
+
+        The server sends its SPAKE2_B message with the "ready" event, so the
+        client derives the session key before /pairing/exchange and sends the
+        encrypted credential request along with its PAKE message. This saves
+        one round trip compared to pair() followed by request_credential().
+
+        Args:
+            agent_id: Unique agent identifier
+            agent_name: Human-readable agent name
+            domain: Domain name (e.g., "aa.com")
+            reason: Human-readable reason for request
+            timeout: Maximum time to wait for user to enter code (seconds)
+
+        Returns:
+            CredentialResponse with status and credential (if approved)
+
+        Raises:
+            ConnectionError: If server unreachable
+            TimeoutError: If user doesn't enter code within timeout
+        """
+        _, data = self._pair(
+            agent_id,
+            agent_name,
+            timeout,
+            credential_request={
+                "domain": domain,
+                "reason": reason,
+                "agent_id": agent_id,
+                "agent_name": agent_name
+            }
+        )
+
+        if 'credential' not in data:
+            # Server did not send SPAKE2_B early - fall back to a separate request
+            return self.request_credential(domain, reason, agent_id, agent_name)
+
+        return self._credential_response(domain, data['credential'])
+
+    def _pair(
+        self,
+        agent_id: str,
+        agent_name: str,
+        timeout: int,
+        credential_request: Optional[Dict] = None
+    ) -> Tuple[str, Dict]:
+        """
+        Run the pairing flow, optionally piggybacking a credential request.
+
+        Args:
+            agent_id: Unique agent identifier
+            agent_name: Human-readable agent name
+            timeout: Maximum time to wait for user to enter code (seconds)
+            credential_request: domain/reason/agent_id/agent_name to encrypt
+                and send with the PAKE message (if the key is known in time)
+
+        Returns:
+            (pairing_code, /pairing/exchange response body)
+
+        Raises:
+            ConnectionError: If server unreachable
+            TimeoutError: If user doesn't enter code within timeout
+        """
+        import requests
+
         logger.info(f"Starting pairing for agent: {agent_name} ({agent_id})")
 
         # Step 1: Request pairing code from server
         try:
-            response = requests.post(
+            response = self._http.post(
                 f"{self.server_url}/pairing/initiate",
                 json={"agent_id": agent_id, "agent_name": agent_name},
                 timeout=10
             )
             response.raise_for_status()
-            data = response.json()
+            data = json_codec.loads(response.content)
             pairing_code = data['pairing_code']
 
             logger.info(f"Pairing code generated: {pairing_code}")
+            if self._pairing_code_callback is not None:
+                self._pairing_code_callback(pairing_code)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to connect to approval server: {e}")
@@ -114,52 +266,144 @@ class CredentialClient:
         # Step 2: Start PAKE exchange on client side (SPAKE2_A)
         self.pake_handler = PAKEHandler(role="client")
         msg_out_a = self.pake_handler.start_exchange(pairing_code)
+        # Encode while the user is still typing; only the POST remains after
+        pake_msg_b64 = base64.b64encode(msg_out_a).decode('ascii')
         logger.debug("Started PAKE exchange (SPAKE2_A)")
 
-        # Step 3: Poll server until user enters code
+        # Step 3: Wait until user enters code (one event stream, no polling)
         logger.info("Waiting for user to enter pairing code in approval client...")
-        max_attempts = timeout // 2  # Poll every 2 seconds
+        ready_event = self._wait_for_user_entry(pairing_code, timeout)
 
-        for attempt in range(max_attempts):
-            try:
-                response = requests.post(
-                    f"{self.server_url}/pairing/exchange",
-                    json={
-                        "pairing_code": pairing_code,
-                        "pake_message": base64.b64encode(msg_out_a).decode('utf-8')
-                    },
-                    timeout=10
-                )
-
-                # 202 Accepted = user hasn't entered code yet
-                if response.status_code == 202:
-                    logger.debug(f"Waiting for user (attempt {attempt + 1}/{max_attempts})...")
-                    time.sleep(2)
-                    continue
+        body = {
+            "pairing_code": pairing_code,
+            "pake_message": pake_msg_b64
+        }
 
-                response.raise_for_status()
-                data = response.json()
+        # Server sent SPAKE2_B early: derive key now so a request can ride along
+        if ready_event.get('pake_message'):
+            self.pake_handler.finish_exchange(base64.b64decode(ready_event['pake_message']))
+            if credential_request:
+                body["encrypted_payload"] = self._encrypt_request(**credential_request)
 
-                # Step 4: Complete PAKE exchange
-                msg_in_b = base64.b64decode(data['pake_message'])
-                self.pake_handler.finish_exchange(msg_in_b)
+        # Step 4: Send PAKE message and complete exchange
+        try:
+            response = self._http.post(
+                f"{self.server_url}/pairing/exchange",
+                json=body,
+                # Piggybacked request waits for user approval
+                timeout=120 if "encrypted_payload" in body else 10
+            )
+            response.raise_for_status()
+            data = json_codec.loads(response.content)
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"PAKE exchange request failed: {e}")
+            raise ConnectionError(f"PAKE exchange with approval server failed: {e}")
 
-                self.session_id = data['session_id']
-                logger.info(f"Pairing successful! Session established: {self.session_id}")
+        if not self.pake_handler.is_ready():
+            msg_in_b = base64.b64decode(data['pake_message'])
+            self.pake_handler.finish_exchange(msg_in_b)
 
-                return pairing_code
+        self.session_id = data['session_id']
+        logger.info(f"Pairing successful! Session established: {self.session_id}")
+
+        return pairing_code, data
+
+    def _wait_for_user_entry(self, pairing_code: str, timeout: int) -> Dict:
+        """
+        Block on the server's pairing event stream until user enters code.
+
+        If the stream drops, it is reopened with exponential backoff and
+        jitter (so agents sharing a server don't reconnect in lockstep) until
+        the timeout is used up.
+
+        Args:
+            pairing_code: 6-digit pairing code
+            timeout: Maximum time to wait for user to enter code (seconds)
+
+        Returns:
+            The "ready" event (may carry the server's SPAKE2_B message)
+
+        Raises:
+            ConnectionError: If stream cannot be opened or reports an error
+            TimeoutError: If user doesn't enter code within timeout
+        """
+        import requests
+
+        deadline = time.monotonic() + timeout
+        delay = RECONNECT_INITIAL_DELAY
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            try:
+                ready_event = self._stream_pairing_events(pairing_code, remaining)
+                if ready_event:
+                    return ready_event
+                break  # Server reported timeout
+
+            except requests.exceptions.HTTPError as e:
+                # Invalid or expired code - reconnecting won't help
+                logger.error(f"Pairing event stream rejected: {e}")
+                raise ConnectionError(f"Approval server rejected pairing: {e}")
 
             except requests.exceptions.RequestException as e:
-                if attempt == max_attempts - 1:
-                    logger.error("Pairing timed out - user did not enter code")
-                    raise TimeoutError(
-                        f"Pairing timed out after {timeout} seconds. "
-                        "User did not enter the pairing code in approval client."
-                    )
-                logger.debug(f"Request failed (attempt {attempt + 1}), retrying: {e}")
-                time.sleep(2)
+                wait = delay * random.uniform(0.8, 1.2)
+                if time.monotonic() + wait >= deadline:
+                    logger.error(f"Pairing event stream failed: {e}")
+                    raise ConnectionError(f"Lost connection to approval server while pairing: {e}")
+                logger.debug(f"Pairing event stream dropped, reconnecting in {wait:.1f}s: {e}")
+                time.sleep(wait)
+                delay = min(delay * 1.5, RECONNECT_MAX_DELAY)
+
+        logger.error("Pairing timed out - user did not enter code")
+        raise TimeoutError(
+            f"Pairing timed out after {timeout} seconds. "
+            "User did not enter the pairing code in approval client."
+        )
+
+    def _stream_pairing_events(self, pairing_code: str, timeout: float) -> Optional[Dict]:
+        """
+        Read one pairing event stream until it reports an outcome.
+
+        Args:
+            pairing_code: 6-digit pairing code
+            timeout: Seconds the server should wait for the user
+
+        Returns:
+            The "ready" event if user entered code, None if the server
+            reported timeout
+
+        Raises:
+            ConnectionError: If server reports a pairing error
+            requests.exceptions.RequestException: If the stream fails
+        """
+        import requests
+
+        with self._http.get(
+            f"{self.server_url}/pairing/events",
+            params={"pairing_code": pairing_code, "timeout": round(timeout, 1)},
+            stream=True,
+            timeout=(10, SSE_READ_TIMEOUT)
+        ) as response:
+            response.raise_for_status()
+
+            for line in response.iter_lines(decode_unicode=True):
+                # Skip keepalive comments and blank event separators
+                if not line or not line.startswith("data:"):
+                    continue
+
+                event = json_codec.loads(line[len("data:"):])
+                if event['status'] == 'ready':
+                    return event
+                if event['status'] == 'timeout':
+                    return None
+                raise ConnectionError(f"Pairing failed: {event.get('error', 'Unknown error')}")
 
-        raise TimeoutError(f"Pairing timed out after {timeout} seconds")
+        # Stream closed without an outcome - treat as dropped connection
+        raise requests.exceptions.ConnectionError("Pairing event stream closed unexpectedly")
 
     def request_credential(
         self,
@@ -187,31 +431,19 @@ class CredentialClient:
         Raises:
             RuntimeError: If pair() not called first
         """
+        import requests
+
         if not self.session_id or not self.pake_handler:
             raise RuntimeError(
                 "Must call pair() first to establish session before requesting credentials"
             )
 
         logger.info(f"Requesting credential for domain: {domain}")
-
-        # Build request payload with timestamp and nonce (replay protection)
-        payload = {
-            "domain": domain,
-            "reason": reason,
-            "agent_id": agent_id,
-            "agent_name": agent_name,
-            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
-            "nonce": secrets.token_hex(8)
-        }
-
-        # Encrypt payload with PAKE-derived key
-        plaintext = json.dumps(payload)
-        encrypted_payload = self.pake_handler.encrypt(plaintext)
-        logger.debug("Encrypted credential request payload")
+        encrypted_payload = self._encrypt_request(domain, reason, agent_id, agent_name)
 
         # Send request to server
         try:
-            response = requests.post(
+            response = self._http.post(
                 f"{self.server_url}/credential/request",
                 json={
                     "session_id": self.session_id,
@@ -220,43 +452,7 @@ class CredentialClient:
                 timeout=120  # Allow time for user approval
             )
             response.raise_for_status()
-            data = response.json()
-
-            # Handle different response statuses
-            if data['status'] == 'approved':
-                # Decrypt credential
-                encrypted_cred = data['encrypted_payload']
-                decrypted = self.pake_handler.decrypt(encrypted_cred)
-                cred_data = json.loads(decrypted)
-
-                credential = SecureCredential(
-                    username=cred_data['username'],
-                    password=cred_data['password']
-                )
-
-                logger.info(f"Credential approved for domain: {domain}")
-                return CredentialResponse(
-                    status=CredentialStatus.APPROVED,
-                    credential=credential,
-                    error_message=None
-                )
-
-            elif data['status'] == 'denied':
-                logger.warning(f"Credential request denied for domain: {domain}")
-                return CredentialResponse(
-                    status=CredentialStatus.DENIED,
-                    credential=None,
-                    error_message="User denied credential access"
-                )
-
-            else:
-                error_msg = data.get('error', 'Unknown error')
-                logger.error(f"Credential request failed: {error_msg}")
-                return CredentialResponse(
-                    status=CredentialStatus.ERROR,
-                    credential=None,
-                    error_message=error_msg
-                )
+            data = json_codec.loads(response.content)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Request failed: {e}")
@@ -266,6 +462,129 @@ class CredentialClient:
                 error_message=f"Request failed: {e}"
             )
 
+        return self._credential_response(domain, data)
+
+    def _encrypt_request(
+        self,
+        domain: str,
+        reason: str,
+        agent_id: str,
+        agent_name: str
+    ) -> str:
+        """
+        Build and encrypt a credential request payload.
+
+        Returns:
+            Encrypted payload for the server
+        """
+        # Build request payload with timestamp and nonce (replay protection)
+        payload = {
+            "domain": domain,
+            "reason": reason,
+            "agent_id": agent_id,
+            "agent_name": agent_name,
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            "nonce": f"{self._nonce_prefix}{next(self._nonce_counter):08x}"
+        }
+
+        # Encrypt payload with PAKE-derived key
+        plaintext = json_codec.dumpb(payload)
+        encrypted_payload = self.pake_handler.encrypt(plaintext)
+        logger.debug("Encrypted credential request payload")
+        return encrypted_payload
+
+    def _credential_response(self, domain: str, data: Dict) -> CredentialResponse:
+        """
+        Convert the server's credential result into a CredentialResponse.
+
+        Args:
+            domain: Domain that was requested
+            data: Result with status and encrypted_payload or error
+
+        Returns:
+            CredentialResponse with status and credential (if approved)
+        """
+        # Handle different response statuses
+        if data['status'] == 'approved':
+            # Decrypt credential
+            encrypted_cred = data['encrypted_payload']
+            decrypted = self.pake_handler.decrypt(encrypted_cred)
+            cred_data = json_codec.loads(decrypted)
+
+            credential = SecureCredential(
+                username=cred_data['username'],
+                password=cred_data['password']
+            )
+
+            logger.info(f"Credential approved for domain: {domain}")
+            return CredentialResponse(
+                status=CredentialStatus.APPROVED,
+                credential=credential,
+                error_message=None
+            )
+
+        elif data['status'] == 'denied':
+            logger.warning(f"Credential request denied for domain: {domain}")
+            return CredentialResponse(
+                status=CredentialStatus.DENIED,
+                credential=None,
+                error_message="User denied credential access"
+            )
+
+        else:
+            error_msg = data.get('error', 'Unknown error')
+            logger.error(f"Credential request failed: {error_msg}")
+            return CredentialResponse(
+                status=CredentialStatus.ERROR,
+                credential=None,
+                error_message=error_msg,
+                error_code=_ERROR_CODES.get(data.get('code'))
+            )
+
+    def export_session(self) -> Tuple[str, bytes]:
+        """
+        Return the current session id and key for resume().
+
+        CRITICAL: The key decrypts credentials for this session. Store it only
+        somewhere as protected as the agent itself (e.g. the OS keyring).
+
+        Returns:
+            Tuple of (session_id, shared_key)
+
+        Raises:
+            RuntimeError: If no active session
+        """
+        if not self.session_id or not self.pake_handler:
+            raise RuntimeError("No active session")
+        return self.session_id, self.pake_handler.export_key()
+
+    def resume(self, session_id: str, shared_key: bytes) -> bool:
+        """
+        Re-attach to a session from export_session() without re-pairing.
+
+        Skips the pairing code prompt and SPAKE2 handshake; the server only
+        needs to still hold the session (not expired or revoked).
+
+        Args:
+            session_id: Session ID from export_session()
+            shared_key: Session key from export_session()
+
+        Returns:
+            True if the server still has the session
+        """
+        self.session_id = session_id
+        self.pake_handler = PAKEHandler.from_key("client", shared_key)
+
+        if self.get_session_status() is None:
+            logger.info(f"Session {session_id} no longer active, pair() required")
+            self.session_id = None
+            self.pake_handler.wipe()
+            self.pake_handler = None
+            return False
+
+        logger.info(f"Resumed session: {session_id}")
+        return True
+
     def revoke_session(self) -> bool:
         """
         Revoke current session.
@@ -276,11 +595,13 @@ class CredentialClient:
         Raises:
             RuntimeError: If no active session
         """
+        import requests
+
         if not self.session_id:
             raise RuntimeError("No active session to revoke")
 
         try:
-            response = requests.post(
+            response = self._http.post(
                 f"{self.server_url}/session/revoke",
                 json={"session_id": self.session_id},
                 timeout=10
@@ -289,6 +610,7 @@ class CredentialClient:
 
             logger.info(f"Session revoked: {self.session_id}")
             self.session_id = None
+            self.pake_handler.wipe()
             self.pake_handler = None
             return True
 
@@ -306,11 +628,13 @@ class CredentialClient:
         Raises:
             RuntimeError: If no active session
         """
+        import requests
+
         if not self.session_id:
             raise RuntimeError("No active session")
 
         try:
-            response = requests.get(
+            response = self._http.get(
                 f"{self.server_url}/session/status",
                 params={"session_id": self.session_id},
                 timeout=10
@@ -320,7 +644,7 @@ class CredentialClient:
                 return None
 
             response.raise_for_status()
-            return response.json()
+            return json_codec.loads(response.content)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get session status: {e}")
@@ -15,14 +15,71 @@ Security Properties:
 - Forward secrecy: session keys are ephemeral
 - Mutual authentication: both sides prove knowledge of password
 """
-from typing import Optional
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Optional, Union
 import base64
 import logging
-from spake2 import SPAKE2_A, SPAKE2_B
-from cryptography.fernet import Fernet
+import os
+
+from src.utils.credential_handler import wipe_bytes
+
+# spake2 and cryptography are imported on first use to keep module import cheap
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 logger = logging.getLogger(__name__)
 
+# AES-GCM nonce length in bytes (96-bit, the size GCM is specified for)
+NONCE_SIZE = 12
+
+
+def preload() -> None:
+    """
+    Import spake2 and the AES-GCM backend ahead of the first exchange.
+
+    Importing spake2 decodes its Ed25519 group constants (~30 ms); these are
+    module-level and shared by every later SPAKE2 instance. Long-running
+    processes call this at startup so the first pairing does not pay it.
+    """
+    import spake2  # noqa: F401
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM  # noqa: F401
+
+
+def _make_aead(key_bytes: bytes) -> "AESGCM":
+    """
+    Build the AES-GCM cipher for a key.
+
+    Each handler builds its cipher once, when the session key is set, and
+    keeps it until wipe(); keys are never held anywhere else.
+
+    Args:
+        key_bytes: 32-byte AES-256 key
+
+    Returns:
+        AESGCM cipher for key_bytes
+    """
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    return AESGCM(key_bytes)
+
+
+def _finish_serialized(role: str, state: bytes, msg_in: bytes) -> bytes:
+    """
+    Finish a serialized SPAKE2 exchange (runs in an executor worker).
+
+    Module-level so it can be pickled into a worker process.
+
+    Args:
+        role: "client" or "server"
+        state: Output of SPAKE2 serialize() after start()
+        msg_in: Inbound PAKE message from other party
+
+    Returns:
+        SPAKE2 shared secret
+    """
+    from spake2 import SPAKE2_A, SPAKE2_B
+    spake_cls = SPAKE2_A if role == "client" else SPAKE2_B
+    return spake_cls.from_serialized(state).finish(msg_in)
+
 
 class PAKEHandler:
     """
@@ -64,10 +121,52 @@ class PAKEHandler:
 
         self.role = role
         self._spake_instance = None
-        self._shared_key: Optional[bytes] = None
-        self._fernet: Optional[Fernet] = None
+        self._shared_key: Optional[bytearray] = None  # Mutable so wipe() can zero it
+        self._aead: Optional["AESGCM"] = None
         logger.debug(f"Initialized PAKEHandler with role: {role}")
 
+    @classmethod
+    def from_key(cls, role: str, shared_key: bytes) -> "PAKEHandler":
+        """
+        Rebuild a ready handler from a key saved with export_key().
+
+        Used to resume an existing session without a new SPAKE2 handshake.
+
+        Args:
+            role: Either "client" or "server"
+            shared_key: Shared secret from a completed exchange
+
+        Returns:
+            Handler ready for encrypt() and decrypt()
+
+        Raises:
+            ValueError: If role is invalid or key is shorter than 32 bytes
+        """
+        if len(shared_key) < 32:
+            raise ValueError("Shared key must be at least 32 bytes")
+
+        handler = cls(role)
+        handler._shared_key = bytearray(shared_key)
+        handler._aead = _make_aead(bytes(shared_key[:32]))
+        return handler
+
+    def export_key(self) -> bytes:
+        """
+        Return the shared key for later from_key() resumption.
+
+        CRITICAL: This is the session encryption key. Callers decide where
+        (and whether) to keep it; it is never persisted by this module.
+
+        Returns:
+            Shared secret bytes
+
+        Raises:
+            RuntimeError: If PAKE exchange not completed
+        """
+        if self._shared_key is None:
+            raise RuntimeError("PAKE exchange not completed - call finish_exchange() first")
+        return bytes(self._shared_key)
+
     def start_exchange(self, password: str) -> bytes:
         """
         Start PAKE protocol exchange.
@@ -90,6 +189,8 @@ class PAKEHandler:
         if self._spake_instance is not None:
             raise RuntimeError("PAKE exchange already started")
 
+        from spake2 import SPAKE2_A, SPAKE2_B
+
         password_bytes = password.encode('utf-8')
 
         # Create appropriate SPAKE2 instance based on role
@@ -106,7 +207,7 @@ class PAKEHandler:
 
         return msg_out
 
-    def finish_exchange(self, msg_in: bytes) -> None:
+    def finish_exchange(self, msg_in: bytes, executor: Optional[Executor] = None) -> None:
         """
         Complete PAKE protocol exchange and derive shared key.
 
@@ -118,6 +219,9 @@ class PAKEHandler:
 
         Args:
             msg_in: Inbound PAKE message from other party
+            executor: Optional executor to run the SPAKE2 math in. spake2 is
+                pure Python and holds the GIL, so only a process pool keeps
+                it off the calling interpreter.
 
         Raises:
             RuntimeError: If start_exchange not called first
@@ -131,41 +235,49 @@ class PAKEHandler:
 
         try:
             # Complete PAKE protocol and derive shared secret
-            self._shared_key = self._spake_instance.finish(msg_in)
-            logger.debug(f"PAKE exchange completed, derived key ({len(self._shared_key)} bytes)")
-
-            # Derive Fernet key from shared secret
-            # SPAKE2 with Ed25519 returns 32-byte shared secret
-            # Fernet requires 32-byte key, base64-urlsafe encoded
-            key_bytes = self._shared_key[:32]
-            fernet_key = base64.urlsafe_b64encode(key_bytes)
-            self._fernet = Fernet(fernet_key)
-            logger.debug("Derived Fernet encryption key from SPAKE2 shared secret")
+            if executor is not None:
+                state = self._spake_instance.serialize()
+                shared_key = executor.submit(
+                    _finish_serialized, self.role, state, msg_in
+                ).result()
+            else:
+                shared_key = self._spake_instance.finish(msg_in)
+            logger.debug(f"PAKE exchange completed, derived key ({len(shared_key)} bytes)")
+
+            # Use shared secret directly as AES-256-GCM key
+            # SPAKE2 with Ed25519 returns a 32-byte shared secret, so the
+            # slice is the same object (no extra copy of the key)
+            self._shared_key = bytearray(shared_key)
+            self._aead = _make_aead(shared_key[:32])
+            logger.debug("Derived AES-GCM encryption key from SPAKE2 shared secret")
 
         except Exception as e:
             logger.error(f"PAKE exchange failed: {e}")
             raise ValueError(f"PAKE exchange failed (wrong password or invalid message): {e}")
 
-    def encrypt(self, plaintext: str) -> str:
+    def encrypt(self, plaintext: Union[str, bytes]) -> str:
         """
         Encrypt data using PAKE-derived key.
 
         Args:
-            plaintext: JSON string to encrypt
+            plaintext: JSON string (or its UTF-8 bytes) to encrypt
 
         Returns:
-            Base64-encoded encrypted data
+            Base64-encoded nonce + AES-GCM ciphertext (with tag)
 
         Raises:
             RuntimeError: If PAKE exchange not completed
         """
-        if not self._fernet:
+        if not self._aead:
             raise RuntimeError("PAKE exchange not completed - call finish_exchange() first")
 
-        plaintext_bytes = plaintext.encode('utf-8')
-        encrypted = self._fernet.encrypt(plaintext_bytes)
-        encrypted_b64 = base64.b64encode(encrypted).decode('utf-8')
-        logger.debug(f"Encrypted {len(plaintext)} chars to {len(encrypted_b64)} chars")
+        # Fresh random nonce per message (never reuse a nonce with the same key)
+        nonce = os.urandom(NONCE_SIZE)
+        if isinstance(plaintext, str):
+            plaintext = plaintext.encode('utf-8')
+        encrypted = self._aead.encrypt(nonce, plaintext, None)
+        encrypted_b64 = base64.b64encode(nonce + encrypted).decode('ascii')
+        logger.debug(f"Encrypted {len(plaintext)} bytes to {len(encrypted_b64)} chars")
         return encrypted_b64
 
     def decrypt(self, ciphertext: str) -> str:
@@ -173,7 +285,7 @@ class PAKEHandler:
         Decrypt data using PAKE-derived key.
 
         Args:
-            ciphertext: Base64-encoded encrypted data
+            ciphertext: Base64-encoded nonce + ciphertext returned by encrypt()
 
         Returns:
             Decrypted JSON string
@@ -182,19 +294,32 @@ class PAKEHandler:
             RuntimeError: If PAKE exchange not completed
             ValueError: If decryption fails (wrong key, tampered data)
         """
-        if not self._fernet:
+        if not self._aead:
             raise RuntimeError("PAKE exchange not completed - call finish_exchange() first")
 
         try:
             encrypted = base64.b64decode(ciphertext)
-            plaintext_bytes = self._fernet.decrypt(encrypted)
-            plaintext = plaintext_bytes.decode('utf-8')
+            nonce, encrypted = encrypted[:NONCE_SIZE], encrypted[NONCE_SIZE:]
+            plaintext = self._aead.decrypt(nonce, encrypted, None).decode('utf-8')
             logger.debug(f"Decrypted {len(ciphertext)} chars to {len(plaintext)} chars")
             return plaintext
         except Exception as e:
             logger.error(f"Decryption failed: {e}")
             raise ValueError(f"Decryption failed (wrong key or tampered data): {e}")
 
+    def wipe(self) -> None:
+        """
+        Zero the shared key and disable encrypt()/decrypt().
+
+        Best effort: the immutable key copies held by SPAKE2 and the cipher
+        are dropped, not overwritten.
+        """
+        if self._shared_key is not None:
+            wipe_bytes(self._shared_key)
+        self._shared_key = None
+        self._aead = None
+        self._spake_instance = None
+
     def is_ready(self) -> bool:
         """
         Check if PAKE exchange completed and encryption ready.
@@ -202,4 +327,4 @@ class PAKEHandler:
         Returns:
             True if encrypt() and decrypt() can be called
         """
-        return self._fernet is not None
+        return self._aead is not None
@@ -8,19 +8,58 @@ PairingManager and focuses on HTTP routing and response formatting.
 API Endpoints:
 - GET  /health                 - Health check
 - POST /pairing/initiate       - Generate pairing code
+- GET  /pairing/events         - Wait for pairing code entry (SSE)
 - POST /pairing/exchange       - PAKE message exchange
 - POST /credential/request     - Request credential (encrypted)
 - POST /session/revoke         - Revoke session
 - GET  /session/status         - Check session status
 """
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask.json.provider import JSONProvider
 import logging
-from src.server.pairing_manager import PairingManager
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from waitress import create_server
+from src.server.pairing_manager import PairingManager, format_utc
+from src.sdk import pake_handler
+from src.utils import json_codec
 
 logger = logging.getLogger(__name__)
 
+# Seconds between SSE keepalive comments while waiting for the user
+SSE_KEEPALIVE_INTERVAL = 15
+
+# Upper bound on how long a client may hold a pairing event stream open
+SSE_MAX_TIMEOUT = 300
+
+# Pre-serialized body for the 202 "waiting" reply. A fresh Response is still
+# built per request: Flask and waitress mutate response headers, so one
+# shared Response object is not safe across worker threads.
+WAITING_BODY = b'{"status":"waiting"}'
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (used by jsonify and get_json)."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        """Serialize obj to JSON text."""
+        return json_codec.dumps(obj)
+
+    def loads(self, s, **kwargs):
+        """Parse JSON text or bytes."""
+        return json_codec.loads(s)
+
+
 # Create Flask app and pairing manager (module-level for import)
 app = Flask(__name__)
+# Serve "/pairing/initiate/" directly instead of a 308 redirect round trip
+# (must be set before the routes below are registered)
+app.url_map.strict_slashes = False
+if json_codec.HAS_ORJSON:
+    app.json = OrjsonProvider(app)
 pairing_manager = PairingManager()
 
 
@@ -76,10 +115,79 @@ def pairing_initiate():
 
     return jsonify({
         "pairing_code": pairing_code,
-        "expires_at": expires_at.isoformat() + "Z"
+        "expires_at": format_utc(expires_at)
     })
 
 
+@app.route('/pairing/events', methods=['GET'])
+def pairing_events():
+    """
+    Stream pairing progress as Server-Sent Events.
+
+    The agent holds this stream open instead of polling /pairing/exchange.
+    A single event is sent once the user enters the pairing code, then the
+    agent posts its PAKE message to /pairing/exchange.
+
+    Query Parameters:
+        pairing_code: 6-digit pairing code
+        timeout: Seconds to wait for the user (default: 60, max: 300)
+
+    Events:
+        data: {"status": "ready", "pake_message": "<base64 SPAKE2_B>"}
+                                     - user entered code, exchange can proceed
+        data: {"status": "timeout"}  - user did not enter code within timeout
+        data: {"status": "error", "error": "..."}
+
+    Status Codes:
+        200 - Event stream
+        400 - Missing pairing_code or bad timeout
+        404 - Invalid/expired pairing code
+    """
+    pairing_code = request.args.get('pairing_code')
+    if not pairing_code:
+        return jsonify({"error": "Missing pairing_code"}), 400
+
+    try:
+        timeout = min(float(request.args.get('timeout', 60)), SSE_MAX_TIMEOUT)
+    except ValueError:
+        return jsonify({"error": "Invalid timeout"}), 400
+
+    if pairing_manager.wait_for_user_entry(pairing_code, 0) is None:
+        return jsonify({"error": "Invalid or expired pairing code"}), 404
+
+    def generate():
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                payload = {"status": "timeout"}
+                break
+
+            entered = pairing_manager.wait_for_user_entry(
+                pairing_code, min(remaining, SSE_KEEPALIVE_INTERVAL)
+            )
+            if entered:
+                payload = {
+                    "status": "ready",
+                    "pake_message": pairing_manager.start_server_exchange(pairing_code)
+                }
+                break
+            if entered is None:
+                payload = {"status": "error", "error": "Pairing code expired"}
+                break
+
+            # SSE comment keeps intermediaries from closing an idle stream
+            yield ": keepalive\n\n"
+
+        yield f"data: {json_codec.dumps(payload)}\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @app.route('/pairing/exchange', methods=['POST'])
 def pairing_exchange():
     """
@@ -88,9 +196,15 @@ def pairing_exchange():
     Request Body:
         {
             "pairing_code": "847293",
-            "pake_message": "<base64-encoded SPAKE2_A message>"
+            "pake_message": "<base64-encoded SPAKE2_A message>",
+            "encrypted_payload": "<optional credential request>"
         }
 
+    encrypted_payload may be sent by agents that already derived the session
+    key from the SPAKE2_B message in the /pairing/events "ready" event. It is
+    handled like /credential/request once the session exists, and the result
+    is returned as "credential" (saves the agent one round trip).
+
     Response (user hasn't entered code yet):
         {"status": "waiting"}
         Status: 202 Accepted
@@ -99,7 +213,8 @@ def pairing_exchange():
         {
             "session_id": "sess_abc123...",
             "pake_message": "<base64-encoded SPAKE2_B message>",
-            "agent_id": "flight-001"
+            "agent_id": "flight-001",
+            "credential": {"status": "approved", ...}  # Only with encrypted_payload
         }
         Status: 200 OK
 
@@ -127,17 +242,30 @@ def pairing_exchange():
     result = pairing_manager.exchange_pake_message(pairing_code, msg_in_a)
 
     if result['status'] == 'waiting':
-        # User hasn't entered code yet (agent should poll)
-        return jsonify({"status": "waiting"}), 202
+        # User hasn't entered code yet (agent should wait on /pairing/events)
+        return app.response_class(WAITING_BODY, status=202, mimetype='application/json')
 
     elif result['status'] == 'success':
         # PAKE exchange complete, session established
         logger.info(f"PAKE exchange successful, session: {result['session_id']}")
-        return jsonify({
+        response = {
             "session_id": result['session_id'],
             "pake_message": result['pake_message'],  # base64-encoded SPAKE2_B
             "agent_id": result['agent_id']
-        })
+        }
+
+        # Piggybacked credential request (prompts user like /credential/request)
+        encrypted_payload = data.get('encrypted_payload')
+        if encrypted_payload:
+            response["credential"] = pairing_manager.handle_credential_request(
+                result['session_id'], encrypted_payload
+            )
+            logger.info(
+                f"Piggybacked credential request {response['credential']['status']} "
+                f"for session: {result['session_id']}"
+            )
+
+        return jsonify(response)
 
     else:
         # Error (expired, invalid, etc.)
@@ -153,7 +281,7 @@ def credential_request():
     Request Body:
         {
             "session_id": "sess_abc123...",
-            "encrypted_payload": "<base64-encoded encrypted request>"
+            "encrypted_payload": "<base64-encoded nonce + AES-GCM ciphertext>"
         }
 
     Encrypted Payload (decrypted by server):
@@ -169,7 +297,7 @@ def credential_request():
     Response (approved):
         {
             "status": "approved",
-            "encrypted_payload": "<base64-encoded encrypted credential>"
+            "encrypted_payload": "<base64-encoded nonce + AES-GCM ciphertext>"
         }
 
     Response (denied):
@@ -281,22 +409,58 @@ def session_status():
     return jsonify(status)
 
 
-def run_server(host='127.0.0.1', port=5000):
+def run_server(
+    host='127.0.0.1',
+    port=5000,
+    ready: Optional[threading.Event] = None,
+    threads: int = 16,
+    pake_workers: int = 0
+):
     """
-    Run approval server.
+    Run approval server under waitress.
 
     Args:
         host: Host to bind to (default: 127.0.0.1)
         port: Port to bind to (default: 5000)
+        ready: Event set once the socket is bound and requests can be accepted
+        threads: Worker threads, so concurrent agent requests don't serialize;
+            pairing event streams and pending approvals each hold one
+        pake_workers: Worker processes for SPAKE2 finish (default 0 runs it
+            on the request thread; a finish takes ~10 ms, so a pool only pays
+            off under many concurrent pairings)
     """
     logger.info(f"Starting approval server on {host}:{port}")
 
-    # CRITICAL FIX: Disable werkzeug request logging
-    # This prevents log spam from polling requests making Terminal 1 unusable
-    werkzeug_logger = logging.getLogger('werkzeug')
-    werkzeug_logger.setLevel(logging.ERROR)  # Only show errors, not every request
-
-    app.run(host=host, port=port, debug=False)
+    # Decode SPAKE2 group constants now rather than on the first pairing
+    pake_handler.preload()
+
+    # Optionally finish SPAKE2 in worker processes instead of holding the GIL
+    # the other request threads need. Spawn rather than fork, since the
+    # server process is already multi-threaded.
+    pake_pool = None
+    if pake_workers and pairing_manager.pake_executor is None:
+        pake_pool = ProcessPoolExecutor(
+            max_workers=pake_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=pake_handler.preload
+        )
+        # Start and warm every worker now, so the first pairing does not pay
+        # for process spawn and imports
+        warmups = [pake_pool.submit(pake_handler.preload) for _ in range(pake_workers)]
+        for warmup in warmups:
+            warmup.result()
+        pairing_manager.pake_executor = pake_pool
+
+    try:
+        # Bind explicitly so readiness can be signalled before serving
+        server = create_server(app, host=host, port=port, threads=threads)
+        if ready is not None:
+            ready.set()
+        server.run()
+    finally:
+        if pake_pool is not None:
+            pairing_manager.pake_executor = None
+            pake_pool.shutdown(cancel_futures=True)
 
 
 if __name__ == '__main__':
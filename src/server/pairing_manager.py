@@ -10,20 +10,68 @@ CRITICAL DESIGN NOTE - Vault Unlock Timing:
 - Session token is stored with the session (NOT the password)
 - Credential requests use the stored session token (no password prompt)
 - Session token never leaves this process (stays in Terminal 2)
+
+THREAD SAFETY:
+- The approval server handles requests on several worker threads
+- pending_pairings is only read/modified under _pairings_lock and
+  active_sessions under _sessions_lock, so pairing traffic and credential
+  requests do not contend for one lock
+- active_sessions is ordered least recently used first and capped at
+  MAX_ACTIVE_SESSIONS; the oldest sessions are dropped (without locking
+  the vault) when it overflows
+- Neither lock is held across vault calls or user prompts, and they are
+  never held together
 """
 import secrets
 import datetime
+import heapq
 import logging
-import json
 import base64
-from typing import Dict, Optional, Tuple
-from dataclasses import dataclass
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 from src.sdk.pake_handler import PAKEHandler
+from src.utils.bitwarden_cli import LOGIN_ITEM_TYPE, BitwardenCLI, BitwardenCLIError, is_stale_session_error
+from src.utils.session_cache import SessionCache
+from src.utils.vault_batcher import VaultBatcher
+from src.utils import json_codec
 
 logger = logging.getLogger(__name__)
 
+# Seconds vault lookups are reused for repeat requests on the same session
+ITEM_CACHE_TTL = 30
+
+# Upper bound on concurrent sessions; least recently used are dropped first
+MAX_ACTIVE_SESSIONS = 10_000
+
+
+def format_utc(timestamp: datetime.datetime) -> str:
+    """Format an aware UTC datetime as ISO 8601 with a "Z" suffix."""
+    return timestamp.isoformat().replace("+00:00", "Z")
+
+
+def _parse_ts(s: str) -> datetime.datetime:
+    """
+    Parse a request timestamp as an aware UTC datetime.
+
+    Timestamps from CredentialClient have the fixed layout
+    YYYY-MM-DDTHH:MM:SS.ffffffZ and are sliced directly; anything else
+    goes through fromisoformat().
+    """
+    if len(s) == 27 and s[26] == 'Z':
+        return datetime.datetime(
+            int(s[0:4]), int(s[5:7]), int(s[8:10]),
+            int(s[11:13]), int(s[14:16]), int(s[17:19]), int(s[20:26]),
+            tzinfo=datetime.timezone.utc
+        )
+    return datetime.datetime.fromisoformat(s.rstrip('Z')).replace(tzinfo=datetime.timezone.utc)
+
 
-@dataclass
+@dataclass(slots=True)
 class PairingState:
     """
     State of a pending pairing.
@@ -36,12 +84,15 @@ class PairingState:
     pairing_code: str
     created_at: datetime.datetime
     expires_at: datetime.datetime
-    agent_pake_message: Optional[bytes] = None  # SPAKE2_A message from agent
+    agent_pake_message: Optional[str] = None  # Base64 SPAKE2_A message from agent
     user_entered: bool = False
     bitwarden_session_token: Optional[str] = None  # Token from bw unlock
+    code_entered: threading.Event = field(default_factory=threading.Event)  # Set once user_entered
+    server_pake: Optional[PAKEHandler] = None  # SPAKE2_B started early (see start_server_exchange)
+    server_pake_message: Optional[bytes] = None  # Outbound SPAKE2_B message
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     """
     Active session with PAKE-derived key AND vault access.
@@ -59,6 +110,8 @@ class Session:
     created_at: datetime.datetime
     last_access: datetime.datetime
     expires_at: datetime.datetime
+    # domain -> (monotonic fetch time, vault items); see ITEM_CACHE_TTL
+    item_cache: Dict[str, Tuple[float, List[Dict]]] = field(default_factory=dict)
 
 
 class PairingManager:
@@ -77,11 +130,29 @@ class PairingManager:
     - Active sessions (PAKE exchange complete, vault unlocked)
     """
 
-    def __init__(self):
-        """Initialize pairing manager."""
+    def __init__(self, pake_executor: Optional[Executor] = None):
+        """
+        Initialize pairing manager.
+
+        Args:
+            pake_executor: Optional executor for SPAKE2 finish (a process pool
+                keeps the pure-Python key math from holding this process's GIL)
+        """
+        self.pake_executor = pake_executor
         self.pending_pairings: Dict[str, PairingState] = {}
-        self.active_sessions: Dict[str, Session] = {}
+        self.active_sessions: "OrderedDict[str, Session]" = OrderedDict()  # LRU order
+        self._max_sessions = MAX_ACTIVE_SESSIONS
+        self._pairings_lock = threading.Lock()  # Guards pending_pairings (+ expiry heap)
+        self._sessions_lock = threading.Lock()  # Guards active_sessions (+ expiry heap)
+        # Min-heaps of (expires_at, key) so cleanup only visits expiring
+        # entries; stale entries (already removed) are skipped lazily
+        self._pairing_expiry: List[Tuple[datetime.datetime, str]] = []
+        self._session_expiry: List[Tuple[datetime.datetime, str]] = []
         self._callback_handler = None  # For UI notifications
+        self._bw_cli: Optional[BitwardenCLI] = None  # Created on first vault call
+        self._session_cache: Optional[SessionCache] = None  # Shared with the approval UI
+        # Shares one `bw list items --search` between concurrent identical lookups
+        self._vault_batcher = VaultBatcher(self._get_cli)
         logger.info("PairingManager initialized")
 
     def set_callback_handler(self, handler):
@@ -97,6 +168,44 @@ class PairingManager:
         self._callback_handler = handler
         logger.debug("Callback handler registered")
 
+    def set_cli(self, cli: BitwardenCLI, session_cache: Optional[SessionCache] = None):
+        """
+        Use an existing BitwardenCLI for vault calls.
+
+        Lets the approval client share one `bw serve` backed CLI (which holds
+        the unlocked vault) between its session cache and this manager.
+
+        Args:
+            cli: BitwardenCLI (or BitwardenServeCLI) instance, e.g. from make_cli()
+            session_cache: SessionCache holding the key for cli; locking the
+                vault goes through it so the cached key is dropped too, and
+                a rejected session token is replaced from it
+        """
+        self._bw_cli = cli
+        self._session_cache = session_cache
+        if session_cache is not None:
+            # Cached vault items must not outlive the unlocked vault
+            session_cache.add_drop_listener(self._clear_item_caches)
+        logger.debug(f"Using {type(cli).__name__} for vault access")
+
+    def _get_cli(self) -> BitwardenCLI:
+        """
+        Return the shared BitwardenCLI, creating it on first use.
+
+        Returns:
+            Validated BitwardenCLI instance
+
+        Raises:
+            BitwardenCLIError: If CLI not installed or not logged in
+        """
+        if self._bw_cli is None:
+            self._bw_cli = BitwardenCLI()
+        return self._bw_cli
+
+    def _generate_pairing_code(self) -> str:
+        """Return a random 6-digit pairing code (100000-999999)."""
+        return str(secrets.randbelow(900000) + 100000)
+
     def create_pairing(self, agent_id: str, agent_name: str) -> Tuple[str, datetime.datetime]:
         """
         Create new pairing.
@@ -110,10 +219,9 @@ class PairingManager:
         Returns:
             (pairing_code, expires_at)
         """
-        # Generate 6-digit pairing code (100000-999999)
-        pairing_code = str(secrets.randbelow(900000) + 100000)
+        pairing_code = self._generate_pairing_code()
 
-        now = datetime.datetime.utcnow()
+        now = datetime.datetime.now(datetime.timezone.utc)
         expires_at = now + datetime.timedelta(minutes=5)
 
         pairing_state = PairingState(
@@ -124,7 +232,9 @@ class PairingManager:
             expires_at=expires_at
         )
 
-        self.pending_pairings[pairing_code] = pairing_state
+        with self._pairings_lock:
+            self.pending_pairings[pairing_code] = pairing_state
+            heapq.heappush(self._pairing_expiry, (expires_at, pairing_code))
         logger.info(f"Pairing created: {pairing_code} for {agent_name} ({agent_id}), expires {expires_at}")
 
         # Notify UI (if callback registered)
@@ -133,7 +243,12 @@ class PairingManager:
 
         return pairing_code, expires_at
 
-    def mark_user_entered_code(self, pairing_code: str, master_password: str) -> bool:
+    def mark_user_entered_code(
+        self,
+        pairing_code: str,
+        master_password: Optional[str] = None,
+        session_token: Optional[str] = None
+    ) -> bool:
         """
         Mark that user entered pairing code AND unlock vault for session.
 
@@ -149,33 +264,40 @@ class PairingManager:
         4. Master password is discarded (never stored)
         5. Future credential requests use the session token
 
+        If the approval client already holds an unlocked vault session, it
+        passes session_token instead and no unlock is performed.
+
         Args:
             pairing_code: 6-digit pairing code
             master_password: Bitwarden master password (used once to unlock vault)
+            session_token: Existing vault session token (skips unlock)
 
         Returns:
             True if pairing found, valid, and vault unlocked successfully
         """
-        pairing = self.pending_pairings.get(pairing_code)
+        now = datetime.datetime.now(datetime.timezone.utc)
 
-        if not pairing:
-            logger.warning(f"Invalid pairing code: {pairing_code}")
-            return False
+        with self._pairings_lock:
+            pairing = self.pending_pairings.get(pairing_code)
 
-        if datetime.datetime.utcnow() > pairing.expires_at:
-            logger.warning(f"Expired pairing code: {pairing_code}")
-            del self.pending_pairings[pairing_code]
-            return False
+            if not pairing:
+                logger.warning(f"Invalid pairing code: {pairing_code}")
+                return False
+
+            if now > pairing.expires_at:
+                logger.warning(f"Expired pairing code: {pairing_code}")
+                del self.pending_pairings[pairing_code]
+                return False
 
-        # Unlock vault with master password
+        # Unlock vault with master password (unless already unlocked)
         try:
-            from src.utils.bitwarden_cli import BitwardenCLI
-            cli = BitwardenCLI()
-            session_token = cli.unlock(master_password)
+            if session_token is None:
+                session_token = self._get_cli().unlock(master_password)
 
             # Store session token with pairing (NOT the password!)
             pairing.bitwarden_session_token = session_token
             pairing.user_entered = True
+            pairing.code_entered.set()  # Wake agents waiting on /pairing/events
 
             logger.info(f"Vault unlocked for pairing: {pairing_code}")
             logger.debug("Master password discarded, session token stored")
@@ -185,6 +307,53 @@ class PairingManager:
             logger.error(f"Failed to unlock vault: {e}")
             return False
 
+    def wait_for_user_entry(self, pairing_code: str, timeout: float) -> Optional[bool]:
+        """
+        Block until user enters pairing code (and vault is unlocked).
+
+        Args:
+            pairing_code: 6-digit pairing code
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if user entered code, False if still waiting after timeout,
+            None if pairing code is invalid or expired
+        """
+        with self._pairings_lock:
+            pairing = self.pending_pairings.get(pairing_code)
+
+        if not pairing or datetime.datetime.now(datetime.timezone.utc) > pairing.expires_at:
+            return None
+
+        return pairing.code_entered.wait(timeout)
+
+    def start_server_exchange(self, pairing_code: str) -> Optional[str]:
+        """
+        Start the server side of the PAKE exchange ahead of the agent's message.
+
+        SPAKE2_B does not depend on the agent's message, so it can be sent
+        with the "ready" event. The agent then derives the session key before
+        calling /pairing/exchange and can send an encrypted request with it.
+
+        Args:
+            pairing_code: 6-digit pairing code
+
+        Returns:
+            Base64-encoded SPAKE2_B message, or None if pairing not found
+        """
+        with self._pairings_lock:
+            pairing = self.pending_pairings.get(pairing_code)
+
+            if not pairing:
+                return None
+
+            if pairing.server_pake is None:
+                pairing.server_pake = PAKEHandler(role="server")
+                pairing.server_pake_message = pairing.server_pake.start_exchange(pairing_code)
+                logger.debug(f"Started SPAKE2_B early for pairing {pairing_code}")
+
+            return base64.b64encode(pairing.server_pake_message).decode('ascii')
+
     def exchange_pake_message(self, pairing_code: str, msg_in_a: str) -> Dict:
         """
         Handle PAKE message exchange.
@@ -209,34 +378,46 @@ class PairingManager:
             - {"status": "success", "session_id": "...", "pake_message": "...", "agent_id": "..."}
             - {"status": "error", "error": "..."}
         """
-        pairing = self.pending_pairings.get(pairing_code)
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        with self._pairings_lock:
+            pairing = self.pending_pairings.get(pairing_code)
 
-        if not pairing:
-            logger.warning(f"PAKE exchange failed: Invalid pairing code {pairing_code}")
-            return {"status": "error", "error": "Invalid pairing code"}
+            if not pairing:
+                logger.warning(f"PAKE exchange failed: Invalid pairing code {pairing_code}")
+                return {"status": "error", "error": "Invalid pairing code"}
 
-        if datetime.datetime.utcnow() > pairing.expires_at:
-            logger.warning(f"PAKE exchange failed: Expired pairing code {pairing_code}")
-            del self.pending_pairings[pairing_code]
-            return {"status": "error", "error": "Pairing code expired"}
+            if now > pairing.expires_at:
+                logger.warning(f"PAKE exchange failed: Expired pairing code {pairing_code}")
+                del self.pending_pairings[pairing_code]
+                return {"status": "error", "error": "Pairing code expired"}
 
-        # Store agent's PAKE message
-        pairing.agent_pake_message = base64.b64decode(msg_in_a)
-        logger.debug(f"Stored SPAKE2_A message for pairing {pairing_code}")
+            # Store agent's PAKE message
+            pairing.agent_pake_message = msg_in_a
+            logger.debug(f"Stored SPAKE2_A message for pairing {pairing_code}")
 
-        # Check if user has entered code yet
-        if not pairing.user_entered:
-            logger.debug(f"User hasn't entered pairing code {pairing_code} yet, returning waiting status")
-            return {"status": "waiting"}
+            # Check if user has entered code yet
+            if not pairing.user_entered:
+                logger.debug(f"User hasn't entered pairing code {pairing_code} yet, returning waiting status")
+                return {"status": "waiting"}
+
+            # Take over SPAKE2_B if it was already sent to the agent
+            pake_handler, msg_out_b = pairing.server_pake, pairing.server_pake_message
+            pairing.server_pake = None
 
         # User has entered code and vault is unlocked - complete PAKE exchange
         logger.info(f"Completing PAKE exchange for pairing {pairing_code}")
 
-        pake_handler = PAKEHandler(role="server")
-        msg_out_b = pake_handler.start_exchange(pairing_code)
+        if pake_handler is None:
+            pake_handler = PAKEHandler(role="server")
+            msg_out_b = pake_handler.start_exchange(pairing_code)
 
         try:
-            pake_handler.finish_exchange(pairing.agent_pake_message)
+            # Decoded here so a malformed message fails the exchange cleanly
+            pake_handler.finish_exchange(
+                base64.b64decode(pairing.agent_pake_message),
+                executor=self.pake_executor
+            )
             logger.debug("PAKE exchange completed successfully (SPAKE2_B)")
         except ValueError as e:
             logger.error(f"PAKE exchange failed: {e}")
@@ -244,7 +425,6 @@ class PairingManager:
 
         # Create session with PAKE key AND vault access
         session_id = f"sess_{secrets.token_hex(16)}"
-        now = datetime.datetime.utcnow()
 
         session = Session(
             session_id=session_id,
@@ -257,10 +437,23 @@ class PairingManager:
             expires_at=now + datetime.timedelta(minutes=30)
         )
 
-        self.active_sessions[session_id] = session
+        with self._pairings_lock:
+            # Remove pairing (one-time use); a concurrent exchange may have won
+            if self.pending_pairings.pop(pairing_code, None) is None:
+                logger.warning(f"PAKE exchange failed: Pairing {pairing_code} already completed")
+                return {"status": "error", "error": "Invalid pairing code"}
+
+        with self._sessions_lock:
+            self.active_sessions[session_id] = session
+            heapq.heappush(self._session_expiry, (session.expires_at, session_id))
+            overflow = len(self.active_sessions) - self._max_sessions
+            evicted = list(islice(self.active_sessions, overflow)) if overflow > 0 else []
 
-        # Remove pairing (one-time use)
-        del self.pending_pairings[pairing_code]
+        # Evicting only forgets the oldest sessions; the vault is shared with
+        # the remaining ones and stays unlocked
+        for sid in evicted:
+            logger.warning(f"Session limit reached, evicting least recently used: {sid}")
+            self._drop_session(sid)
 
         logger.info(f"Session established: {session_id} for {pairing.agent_name}, expires {session.expires_at}")
 
@@ -282,45 +475,58 @@ class PairingManager:
         4. Encrypt credential and return
 
         CRITICAL: Vault access uses session.bitwarden_session_token (stored during
-        pairing). No password prompt needed here.
+        pairing), or the refreshed token returned by the callback handler.
+        No password prompt needed here unless the vault session has expired.
 
         Args:
             session_id: Session identifier
-            encrypted_payload: Base64-encoded encrypted request
+            encrypted_payload: Base64-encoded AES-GCM encrypted request
 
         Returns:
             Dict with status and encrypted credential or error:
             - {"status": "approved", "encrypted_payload": "..."}
             - {"status": "denied", "error": "..."}
             - {"status": "error", "error": "..."}
+            - {"status": "error", "error": "...", "code": "..."} for session
+              errors (see CredentialErrorCode)
         """
-        session = self.active_sessions.get(session_id)
+        now = datetime.datetime.now(datetime.timezone.utc)
 
-        if not session:
-            logger.warning(f"Invalid or expired session: {session_id}")
-            return {"status": "error", "error": "Invalid or expired session"}
+        with self._sessions_lock:
+            session = self.active_sessions.get(session_id)
+
+            if not session:
+                logger.warning(f"Invalid or expired session: {session_id}")
+                return {
+                    "status": "error",
+                    "error": "Invalid or expired session",
+                    "code": "invalid_session"
+                }
 
-        # Update last access
-        session.last_access = datetime.datetime.utcnow()
+            # Update last access
+            session.last_access = now
+            self.active_sessions.move_to_end(session_id)
 
-        # Check timeout
-        if datetime.datetime.utcnow() > session.expires_at:
-            logger.warning(f"Session expired: {session_id}")
-            del self.active_sessions[session_id]
-            return {"status": "error", "error": "Session expired"}
+            # Check timeout
+            if now > session.expires_at:
+                logger.warning(f"Session expired: {session_id}")
+                del self.active_sessions[session_id]
+                session.pake_handler.wipe()
+                session.item_cache.clear()
+                return {"status": "error", "error": "Session expired", "code": "expired_session"}
 
         # Decrypt request
         try:
             plaintext = session.pake_handler.decrypt(encrypted_payload)
-            request_data = json.loads(plaintext)
+            request_data = json_codec.loads(plaintext)
             logger.debug(f"Decrypted credential request for domain: {request_data.get('domain')}")
         except Exception as e:
             logger.error(f"Failed to decrypt request: {e}")
             return {"status": "error", "error": "Decryption failed"}
 
         # Validate timestamp (prevent replay attacks)
-        timestamp = datetime.datetime.fromisoformat(request_data['timestamp'].rstrip('Z'))
-        age = (datetime.datetime.utcnow() - timestamp).total_seconds()
+        timestamp = _parse_ts(request_data['timestamp'])
+        age = (now - timestamp).total_seconds()
         if age > 300:  # 5 minutes
             logger.warning(f"Request too old: {age} seconds")
             return {"status": "error", "error": "Request too old (possible replay attack)"}
@@ -337,20 +543,15 @@ class PairingManager:
                 # Retrieve credential using stored vault token (no unlock needed!)
                 logger.info(f"User approved credential request for: {request_data['domain']}")
                 try:
-                    from src.utils.bitwarden_cli import BitwardenCLI
-                    cli = BitwardenCLI()
+                    # Prefer token from approval handler (re-unlocked after TTL)
+                    if result.get('session_token'):
+                        session.bitwarden_session_token = result['session_token']
 
-                    # Use stored session token (NOT password!)
-                    items = cli.list_items(
-                        request_data['domain'],
-                        session.bitwarden_session_token
-                    )
+                    # The vault is only read once the user has approved
+                    items = self._lookup_items(session, request_data['domain'])
 
-                    # Find login item
-                    login_item = next(
-                        (item for item in items if item.get("type") == 1),
-                        None
-                    )
+                    # First login item (list already filtered to logins)
+                    login_item = items[0] if items else None
 
                     if not login_item:
                         logger.warning(f"No credential found for: {request_data['domain']}")
@@ -374,11 +575,11 @@ class PairingManager:
                     cred_payload = {
                         "username": username,
                         "password": password,
-                        "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+                        "timestamp": format_utc(datetime.datetime.now(datetime.timezone.utc)),
                         "nonce": secrets.token_hex(8)
                     }
 
-                    encrypted_cred = session.pake_handler.encrypt(json.dumps(cred_payload))
+                    encrypted_cred = session.pake_handler.encrypt(json_codec.dumpb(cred_payload))
                     logger.info(f"Credential retrieved and encrypted for: {request_data['domain']}")
 
                     return {
@@ -402,6 +603,44 @@ class PairingManager:
             logger.error("No approval handler registered")
             return {"status": "error", "error": "No approval handler registered"}
 
+    def _lookup_items(self, session: Session, domain: str) -> List[Dict]:
+        """
+        Return the login items for domain, from the session's item cache if fresh.
+
+        Uses the stored session token (NOT password!). A token the vault
+        rejects as stale is replaced from the shared session cache and the
+        search retried once.
+
+        Args:
+            session: Session whose token and item cache are used
+            domain: Domain to search for
+
+        Returns:
+            Login items matching domain
+
+        Raises:
+            BitwardenCLIError: If the vault search fails
+        """
+        cached = session.item_cache.get(domain)
+        if cached and time.monotonic() - cached[0] < ITEM_CACHE_TTL:
+            return cached[1]
+
+        try:
+            items = self._vault_batcher.list_items(domain, session.bitwarden_session_token)
+        except BitwardenCLIError as e:
+            if self._session_cache is None or not is_stale_session_error(e):
+                raise
+            logger.info("Vault session token rejected, unlocking again...")
+            self._session_cache.invalidate()
+            session.bitwarden_session_token = self._session_cache.get_session_key()
+            items = self._vault_batcher.list_items(domain, session.bitwarden_session_token)
+
+        # Keep only login items, so notes/cards matching the search are
+        # never held in the item cache
+        items = [item for item in items if item.get("type") == LOGIN_ITEM_TYPE]
+        session.item_cache[domain] = (time.monotonic(), items)
+        return items
+
     def revoke_session(self, session_id: str):
         """
         Revoke session and lock vault.
@@ -409,21 +648,52 @@ class PairingManager:
         Args:
             session_id: Session to revoke
         """
-        if session_id in self.active_sessions:
-            session = self.active_sessions[session_id]
+        session = self._drop_session(session_id)
 
-            # Lock vault when revoking session
+        if session:
+            # Lock vault when revoking session (via the shared session cache,
+            # so its key is dropped as well)
             try:
-                from src.utils.bitwarden_cli import BitwardenCLI
-                cli = BitwardenCLI()
-                cli.lock()
+                if self._session_cache is not None:
+                    self._session_cache.lock()
+                else:
+                    self._get_cli().lock()
                 logger.info(f"Vault locked for session: {session_id}")
             except Exception as e:
                 logger.warning(f"Failed to lock vault: {e}")
+            finally:
+                # The vault is shared: no session may keep serving items
+                # read while it was unlocked
+                self._clear_item_caches()
 
-            del self.active_sessions[session_id]
             logger.info(f"Session revoked: {session_id}")
 
+    def _drop_session(self, session_id: str) -> Optional[Session]:
+        """
+        Remove a session and wipe its key material, leaving the vault unlocked.
+
+        Args:
+            session_id: Session to drop
+
+        Returns:
+            The dropped Session, or None if it was not active
+        """
+        with self._sessions_lock:
+            session = self.active_sessions.pop(session_id, None)
+
+        if session:
+            session.pake_handler.wipe()
+            session.item_cache.clear()
+            session.bitwarden_session_token = ""
+        return session
+
+    def _clear_item_caches(self) -> None:
+        """Drop the cached vault items of every active session."""
+        with self._sessions_lock:
+            for session in self.active_sessions.values():
+                session.item_cache.clear()
+        logger.debug("Cleared vault item caches of all sessions")
+
     def get_session_status(self, session_id: str) -> Optional[Dict]:
         """
         Get session status.
@@ -434,7 +704,10 @@ class PairingManager:
         Returns:
             Status dict or None if session not found
         """
-        session = self.active_sessions.get(session_id)
+        with self._sessions_lock:
+            session = self.active_sessions.get(session_id)
+            if session:
+                self.active_sessions.move_to_end(session_id)
 
         if not session:
             return None
@@ -442,8 +715,8 @@ class PairingManager:
         return {
             "active": True,
             "agent_name": session.agent_name,
-            "last_access": session.last_access.isoformat() + "Z",
-            "expires_at": session.expires_at.isoformat() + "Z"
+            "last_access": format_utc(session.last_access),
+            "expires_at": format_utc(session.expires_at)
         }
 
     def active_session_count(self) -> int:
@@ -453,26 +726,54 @@ class PairingManager:
         Returns:
             Number of active sessions
         """
-        return len(self.active_sessions)
+        with self._sessions_lock:
+            return len(self.active_sessions)
 
     def cleanup_expired(self):
         """Clean up expired pairings and sessions."""
-        now = datetime.datetime.utcnow()
-
-        # Cleanup expired pairings
-        expired_pairings = [
-            code for code, pairing in self.pending_pairings.items()
-            if now > pairing.expires_at
-        ]
-        for code in expired_pairings:
-            del self.pending_pairings[code]
-            logger.debug(f"Cleaned up expired pairing: {code}")
-
-        # Cleanup expired sessions
-        expired_sessions = [
-            sid for sid, session in self.active_sessions.items()
-            if now > session.expires_at
-        ]
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        with self._pairings_lock:
+            # Cleanup expired pairings
+            for code in self._pop_expired(self._pairing_expiry, self.pending_pairings, now):
+                del self.pending_pairings[code]
+                logger.debug(f"Cleaned up expired pairing: {code}")
+
+        with self._sessions_lock:
+            # Collect expired sessions (revoked outside the lock)
+            expired_sessions = self._pop_expired(self._session_expiry, self.active_sessions, now)
         for sid in expired_sessions:
             self.revoke_session(sid)
             logger.debug(f"Cleaned up expired session: {sid}")
+
+    @staticmethod
+    def _pop_expired(
+        expiry_heap: List[Tuple[datetime.datetime, str]],
+        entries: Dict,
+        now: datetime.datetime
+    ) -> List[str]:
+        """
+        Pop keys whose expiry has passed from an expiry heap.
+
+        Caller holds the lock guarding entries. Keys no longer in entries are
+        dropped; keys whose entry now expires later are pushed back.
+
+        Args:
+            expiry_heap: Heap of (expires_at, key)
+            entries: Dict the keys refer to (pairings or sessions)
+            now: Current time
+
+        Returns:
+            Keys of entries that have expired
+        """
+        expired = []
+        while expiry_heap and expiry_heap[0][0] < now:
+            _, key = heapq.heappop(expiry_heap)
+            entry = entries.get(key)
+            if entry is None:
+                continue
+            if now > entry.expires_at:
+                expired.append(key)
+            else:
+                heapq.heappush(expiry_heap, (entry.expires_at, key))
+        return expired
@@ -3,8 +3,20 @@ Audit logging for credential access events.
 
 This module provides audit logging functionality that tracks credential
 requests and outcomes WITHOUT logging any credential values.
+
+Events are queued by the caller and written to disk in batches by a
+background thread, so credential requests never wait on file I/O. The
+queue is bounded: near capacity producers briefly block, and events that
+still don't fit are dropped and counted.
 """
+import atexit
 import logging
+import queue
+import threading
+import time
+from typing import List, Union
+
+logger = logging.getLogger(__name__)
 
 
 class AuditLogger:
@@ -14,30 +26,159 @@ class AuditLogger:
     CRITICAL: Never logs credential values.
     """
 
-    def __init__(self, log_file: str = "credential_audit.log"):
+    def __init__(
+        self,
+        log_file: str = "credential_audit.log",
+        batch_size: int = 128,
+        flush_interval: float = 1.0,
+        buffer_size: int = 64 * 1024,
+        max_queue_size: int = 10_000,
+        backpressure_timeout: float = 0.1,
+        drop_warning_interval: int = 100
+    ):
         """
-        Initialize audit logger.
+        Initialize audit logger and start background writer.
 
         Args:
             log_file: Path to audit log file
+            batch_size: Maximum events written per batch
+            flush_interval: Seconds to wait for a batch to fill before writing
+            buffer_size: Size of the file write buffer in bytes
+            max_queue_size: Maximum events waiting to be written
+            backpressure_timeout: Seconds a producer may block when queue is 90% full
+            drop_warning_interval: Log a warning every N dropped events
         """
         self.log_file = log_file
-        self._setup_logger()
-
-    def _setup_logger(self) -> None:
-        """Configure audit logger."""
-        self.logger = logging.getLogger("credential_audit")
-        self.logger.setLevel(logging.INFO)
-
-        # File handler (append mode)
-        handler = logging.FileHandler(self.log_file, mode='a')
-        handler.setFormatter(
-            logging.Formatter(
-                '%(asctime)s | %(levelname)s | %(message)s',
-                datefmt='%Y-%m-%dT%H:%M:%SZ'
-            )
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.backpressure_timeout = backpressure_timeout
+        self.drop_warning_interval = drop_warning_interval
+        self.dropped_count = 0
+        self._drop_lock = threading.Lock()
+        self._high_watermark = int(max_queue_size * 0.9)
+        self._formatter = logging.Formatter(
+            '%(asctime)s | %(levelname)s | %(message)s',
+            datefmt='%Y-%m-%dT%H:%M:%SZ'
+        )
+        # None is the stop sentinel queued by close()
+        self._queue: "queue.Queue[Union[logging.LogRecord, threading.Event, None]]" = queue.Queue(
+            maxsize=max_queue_size
         )
-        self.logger.addHandler(handler)
+
+        # Append mode, buffered so each batch is a single write
+        self._file = open(log_file, 'ab', buffering=buffer_size)
+
+        self._writer = threading.Thread(
+            target=self._drain,
+            name="audit-writer",
+            daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _enqueue(self, level: int, msg: str, *args: str) -> None:
+        """
+        Queue an audit event for the background writer.
+
+        msg is a %-style format; it is merged with args by the writer thread,
+        not by the caller.
+        """
+        record = logging.LogRecord(
+            "credential_audit", level, __file__, 0, msg, args, None
+        )
+        try:
+            if self._queue.qsize() >= self._high_watermark:
+                # Near capacity: briefly block rather than lose security events
+                self._queue.put(record, timeout=self.backpressure_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self._record_drop()
+
+    def _record_drop(self) -> None:
+        """Count a dropped event and warn periodically."""
+        with self._drop_lock:
+            self.dropped_count += 1
+            dropped = self.dropped_count
+        if (dropped - 1) % self.drop_warning_interval == 0:
+            logger.warning(f"Audit queue full, {dropped} event(s) dropped so far")
+
+    def _drain(self) -> None:
+        """Background loop: collect events into batches and write them."""
+        while True:
+            batch: List[Union[logging.LogRecord, threading.Event, None]] = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+
+            # Collect until batch is full, interval elapses, or a flush or stop is requested
+            while (
+                len(batch) < self.batch_size
+                and batch[-1] is not None
+                and not isinstance(batch[-1], threading.Event)
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+            if batch[-1] is None:
+                return
+
+    def _write_batch(self, batch: List[Union[logging.LogRecord, threading.Event, None]]) -> None:
+        """Write a batch of events to disk and release any flush waiters."""
+        lines = [
+            self._formatter.format(item) + "\n"
+            for item in batch
+            if isinstance(item, logging.LogRecord)
+        ]
+        if lines:
+            self._file.write("".join(lines).encode('utf-8'))
+            self._file.flush()
+
+        for item in batch:
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """
+        Block until all queued events are written to disk.
+
+        Args:
+            timeout: Maximum seconds to wait for the writer
+        """
+        if not self._writer.is_alive():
+            return
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Write queued events, stop the writer thread and close the file.
+
+        Events logged after close() are discarded.
+
+        Args:
+            timeout: Maximum seconds to wait for the writer
+        """
+        atexit.unregister(self.flush)
+        if self._writer.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                logger.warning("Audit queue full, writer not stopped")
+                return
+            self._writer.join(timeout)
+            if self._writer.is_alive():
+                logger.warning("Audit writer did not stop, log file left open")
+                return
+        self._file.close()
 
     def log_request(
         self,
@@ -53,26 +194,30 @@ class AuditLogger:
             domain: Domain requested
             reason: Reason for request
         """
-        self.logger.info(
-            f"REQUEST | agent={agent_id} | domain={domain} | reason={reason}"
+        self._enqueue(
+            logging.INFO,
+            "REQUEST | agent=%s | domain=%s | reason=%s", agent_id, domain, reason
         )
 
     def log_denial(self, agent_id: str, domain: str) -> None:
         """Log user denial of credential request."""
-        self.logger.info(
-            f"DENIED | agent={agent_id} | domain={domain}"
+        self._enqueue(
+            logging.INFO,
+            "DENIED | agent=%s | domain=%s", agent_id, domain
         )
 
     def log_success(self, agent_id: str, domain: str) -> None:
         """Log successful credential retrieval and use."""
-        self.logger.info(
-            f"SUCCESS | agent={agent_id} | domain={domain}"
+        self._enqueue(
+            logging.INFO,
+            "SUCCESS | agent=%s | domain=%s", agent_id, domain
         )
 
     def log_not_found(self, agent_id: str, domain: str) -> None:
         """Log credential not found in vault."""
-        self.logger.warning(
-            f"NOT_FOUND | agent={agent_id} | domain={domain}"
+        self._enqueue(
+            logging.WARNING,
+            "NOT_FOUND | agent=%s | domain=%s", agent_id, domain
         )
 
     def log_error(
@@ -91,6 +236,7 @@ class AuditLogger:
         """
         # Sanitize error message (remove any potential credential data)
         safe_message = error_message[:200]  # Limit length
-        self.logger.error(
-            f"ERROR | agent={agent_id} | domain={domain} | error={safe_message}"
+        self._enqueue(
+            logging.ERROR,
+            "ERROR | agent=%s | domain=%s | error=%s", agent_id, domain, safe_message
         )
@@ -3,23 +3,59 @@ Bitwarden CLI wrapper for vault operations.
 
 This module provides a Python interface to the Bitwarden CLI tool,
 handling subprocess execution, error handling, and JSON parsing.
+
+BitwardenServeCLI offers the same interface backed by a long-running
+`bw serve` process, so each vault operation is a local HTTP round trip
+instead of a fresh Node.js process start. It is opt-in (BW_SERVE=1, see
+make_cli()): the `bw serve` API has no authentication, so while the vault
+is unlocked any local process can read every item through it.
 """
-import json
+import asyncio
+import atexit
 import logging
+import os
+import socket
 import subprocess
-from typing import List, Dict
+import time
+from typing import ClassVar, List, Dict, Optional, Set, Tuple, Union
+
+import requests
+
+from src.utils import json_codec
 
 logger = logging.getLogger(__name__)
 
+# Vault item type of login entries (2 = secure note, 3 = card, 4 = identity)
+LOGIN_ITEM_TYPE = 1
+
+# Error fragments reported by bw when a session key is no longer valid
+STALE_SESSION_MARKERS = ("locked", "session")
+
+# Environment variable opting in to the (unauthenticated) bw serve backend
+SERVE_ENV = "BW_SERVE"
+
 
 class BitwardenCLIError(Exception):
     """Exception raised for Bitwarden CLI errors."""
     pass
 
 
+def is_stale_session_error(error: BitwardenCLIError) -> bool:
+    """Check whether a CLI error means the session key is no longer valid."""
+    message = str(error).lower()
+    return any(marker in message for marker in STALE_SESSION_MARKERS)
+
+
 class BitwardenCLI:
     """Wrapper for Bitwarden CLI subprocess operations."""
 
+    # Environment variable used to pass the master password to `bw unlock`
+    PASSWORD_ENV = "BW_UNLOCK_PASSWORD"
+
+    # CLI paths already validated in this process (install + login checks
+    # cost two `bw` process starts, so they run once per path)
+    _validated_paths: ClassVar[Set[str]] = set()
+
     def __init__(self, cli_path: str = "bw"):
         """
         Initialize Bitwarden CLI wrapper.
@@ -28,65 +64,123 @@ class BitwardenCLI:
             cli_path: Path to bw executable (default: "bw" in PATH)
         """
         self.cli_path = cli_path
-        self._validate_cli_installed()
+        if cli_path not in BitwardenCLI._validated_paths:
+            self._validate_cli_installed()
+            BitwardenCLI._validated_paths.add(cli_path)
 
     def _validate_cli_installed(self) -> None:
         """
-        Verify Bitwarden CLI is installed and accessible.
+        Verify Bitwarden CLI is installed and the user is logged in.
+
+        A single `bw status` call covers both checks: it fails to start if
+        the CLI is missing and reports the login state otherwise.
 
         Raises:
             BitwardenCLIError: If CLI not found or not logged in
         """
         try:
             result = subprocess.run(
-                [self.cli_path, "--version"],
+                [self.cli_path, "status"],
                 capture_output=True,
-                text=True,
                 check=True,
                 timeout=5
             )
-            logger.debug(f"Bitwarden CLI version: {result.stdout.strip()}")
         except FileNotFoundError:
             raise BitwardenCLIError(
                 f"Bitwarden CLI not found at '{self.cli_path}'. "
                 "Please install from https://bitwarden.com/help/cli/"
             )
+        except subprocess.CalledProcessError as e:
+            raise BitwardenCLIError(f"Failed to get CLI status: {e.stderr.decode('utf-8', 'replace')}")
         except subprocess.TimeoutExpired:
             raise BitwardenCLIError("Bitwarden CLI command timed out")
 
-        # Check login status
-        self._check_login_status()
+        self._check_login_status(result.stdout)
 
-    def _check_login_status(self) -> None:
+    def _check_login_status(self, status_output: Union[str, bytes]) -> None:
         """
         Verify user is logged into Bitwarden CLI.
 
+        Args:
+            status_output: JSON printed by `bw status`
+
         Raises:
             BitwardenCLIError: If user not logged in
         """
         try:
-            result = subprocess.run(
-                [self.cli_path, "status"],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=5
+            status = json_codec.loads(status_output)
+        except ValueError as e:
+            raise BitwardenCLIError(f"Failed to parse CLI status: {e}")
+
+        logger.debug(f"Bitwarden CLI status: {status.get('status')}")
+        if status.get("status") == "unauthenticated":
+            raise BitwardenCLIError(
+                "Not logged into Bitwarden CLI. "
+                "Please run 'bw login' first."
             )
-            status = json.loads(result.stdout)
 
-            if status.get("status") == "unauthenticated":
-                raise BitwardenCLIError(
-                    "Not logged into Bitwarden CLI. "
-                    "Please run 'bw login' first."
-                )
+    def _unlock_env(self, password: Union[str, bytes, bytearray]) -> Dict:
+        """Build child environment carrying the master password for --passwordenv."""
+        if isinstance(password, str):
+            password = password.encode('utf-8')
+        env = dict(os.environ)
+        env[self.PASSWORD_ENV] = bytes(password)
+        return env
 
-        except json.JSONDecodeError as e:
-            raise BitwardenCLIError(f"Failed to parse CLI status: {e}")
+    def _unlock_args(self) -> List[str]:
+        """Command line for `bw unlock` reading the password from the environment."""
+        return [self.cli_path, "unlock", "--passwordenv", self.PASSWORD_ENV, "--raw"]
 
-    def unlock(self, password: str) -> str:
+    @staticmethod
+    def _parse_session_key(returncode: int, stdout: bytes, stderr: str) -> str:
+        """
+        Extract session key from `bw unlock --raw` output.
+
+        Raises:
+            BitwardenCLIError: If unlock failed or returned no key
+        """
+        if returncode != 0:
+            if "Invalid master password" in stderr:
+                raise BitwardenCLIError("Invalid master password")
+            raise BitwardenCLIError(f"Failed to unlock vault: {stderr}")
+
+        session_key = stdout.strip()
+        if not session_key:
+            raise BitwardenCLIError("Unlock returned empty session key")
+
+        return session_key.decode('ascii')
+
+    @staticmethod
+    def _parse_items(stdout: Union[str, bytes]) -> List[Dict]:
+        """
+        Parse `bw list items` JSON output.
+
+        Uses orjson when installed; large vaults make this the main cost
+        after the subprocess itself.
+
+        Raises:
+            BitwardenCLIError: If output is not a JSON list
+        """
+        try:
+            items = json_codec.loads(stdout)
+        except ValueError as e:
+            raise BitwardenCLIError(f"Failed to parse CLI output: {e}")
+
+        if not isinstance(items, list):
+            raise BitwardenCLIError(
+                f"Expected list from CLI, got {type(items)}"
+            )
+
+        return items
+
+    def unlock(self, password: Union[str, bytes, bytearray]) -> str:
         """
         Unlock Bitwarden vault.
 
+        The password is handed to bw through the child's environment
+        (--passwordenv), never on the command line where other users can
+        see it. bw only reads a password from stdin when attached to a TTY.
+
         Args:
             password: Master password
 
@@ -96,30 +190,22 @@ class BitwardenCLI:
         Raises:
             BitwardenCLIError: If unlock fails
         """
+        env = self._unlock_env(password)
         try:
             result = subprocess.run(
-                [self.cli_path, "unlock", password, "--raw"],
+                self._unlock_args(),
                 capture_output=True,
-                text=True,
+                env=env,
                 timeout=30
             )
-
-            if result.returncode != 0:
-                if "Invalid master password" in result.stderr:
-                    raise BitwardenCLIError("Invalid master password")
-                else:
-                    raise BitwardenCLIError(
-                        f"Failed to unlock vault: {result.stderr}"
-                    )
-
-            session_key = result.stdout.strip()
-            if not session_key:
-                raise BitwardenCLIError("Unlock returned empty session key")
-
-            return session_key
+            return self._parse_session_key(
+                result.returncode, result.stdout, result.stderr.decode('utf-8', 'replace')
+            )
 
         except subprocess.TimeoutExpired:
             raise BitwardenCLIError("Vault unlock timed out")
+        finally:
+            del env[self.PASSWORD_ENV]
 
     def list_items(self, search: str, session_key: str) -> List[Dict]:
         """
@@ -142,26 +228,16 @@ class BitwardenCLI:
                     "--search", search,
                     "--session", session_key
                 ],
-                capture_output=True,
-                text=True,
+                capture_output=True,  # Raw bytes: parsed without a decode pass
                 check=True,
                 timeout=30
             )
-
-            items = json.loads(result.stdout)
-            if not isinstance(items, list):
-                raise BitwardenCLIError(
-                    f"Expected list from CLI, got {type(items)}"
-                )
-
-            return items
+            return self._parse_items(result.stdout)
 
         except subprocess.CalledProcessError as e:
-            raise BitwardenCLIError(f"Failed to list items: {e.stderr}")
+            raise BitwardenCLIError(f"Failed to list items: {e.stderr.decode('utf-8', 'replace')}")
         except subprocess.TimeoutExpired:
             raise BitwardenCLIError("Item search timed out")
-        except json.JSONDecodeError as e:
-            raise BitwardenCLIError(f"Failed to parse CLI output: {e}")
 
     def lock(self) -> None:
         """
@@ -174,12 +250,11 @@ class BitwardenCLI:
             subprocess.run(
                 [self.cli_path, "lock"],
                 capture_output=True,
-                text=True,
                 check=True,
                 timeout=10
             )
         except subprocess.CalledProcessError as e:
-            raise BitwardenCLIError(f"Failed to lock vault: {e.stderr}")
+            raise BitwardenCLIError(f"Failed to lock vault: {e.stderr.decode('utf-8', 'replace')}")
         except subprocess.TimeoutExpired:
             raise BitwardenCLIError("Vault lock timed out")
 
@@ -197,10 +272,356 @@ class BitwardenCLI:
             result = subprocess.run(
                 [self.cli_path, "status"],
                 capture_output=True,
-                text=True,
                 check=True,
                 timeout=5
             )
-            return json.loads(result.stdout)
+            return json_codec.loads(result.stdout)
         except Exception as e:
             raise BitwardenCLIError(f"Failed to get status: {e}")
+
+    async def _run_async(
+        self,
+        args: List[str],
+        timeout: float,
+        env: Optional[Dict] = None
+    ) -> Tuple[int, bytes, str]:
+        """
+        Run a bw command without blocking the event loop.
+
+        Stdout is left as bytes for the JSON parser; only stderr is decoded.
+
+        Returns:
+            (returncode, stdout, stderr)
+
+        Raises:
+            asyncio.TimeoutError: If the command does not finish in time
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        return proc.returncode, stdout, stderr.decode('utf-8', 'replace')
+
+    async def unlock_async(self, password: Union[str, bytes, bytearray]) -> str:
+        """
+        Unlock Bitwarden vault without blocking the event loop.
+
+        Args:
+            password: Master password
+
+        Returns:
+            Session key for subsequent operations
+
+        Raises:
+            BitwardenCLIError: If unlock fails
+        """
+        env = self._unlock_env(password)
+        try:
+            returncode, stdout, stderr = await self._run_async(
+                self._unlock_args(), timeout=30, env=env
+            )
+            return self._parse_session_key(returncode, stdout, stderr)
+        except asyncio.TimeoutError:
+            raise BitwardenCLIError("Vault unlock timed out")
+        finally:
+            del env[self.PASSWORD_ENV]
+
+    async def list_items_async(self, search: str, session_key: str) -> List[Dict]:
+        """
+        Search vault for items matching domain without blocking the event loop.
+
+        Args:
+            search: Search term (domain name)
+            session_key: Session key from unlock()
+
+        Returns:
+            List of matching vault items
+
+        Raises:
+            BitwardenCLIError: If search fails
+        """
+        try:
+            returncode, stdout, stderr = await self._run_async(
+                [
+                    self.cli_path, "list", "items",
+                    "--search", search,
+                    "--session", session_key
+                ],
+                timeout=30
+            )
+        except asyncio.TimeoutError:
+            raise BitwardenCLIError("Item search timed out")
+
+        if returncode != 0:
+            raise BitwardenCLIError(f"Failed to list items: {stderr}")
+
+        return self._parse_items(stdout)
+
+    async def lock_async(self) -> None:
+        """
+        Lock Bitwarden vault without blocking the event loop.
+
+        Raises:
+            BitwardenCLIError: If lock fails
+        """
+        try:
+            returncode, _, stderr = await self._run_async(
+                [self.cli_path, "lock"], timeout=10
+            )
+        except asyncio.TimeoutError:
+            raise BitwardenCLIError("Vault lock timed out")
+
+        if returncode != 0:
+            raise BitwardenCLIError(f"Failed to lock vault: {stderr}")
+
+    def close(self) -> None:
+        """Release resources held by the wrapper (nothing for one-shot CLI calls)."""
+
+
+class BitwardenServeCLI(BitwardenCLI):
+    """
+    Bitwarden CLI wrapper backed by the `bw serve` REST API.
+
+    The `bw serve` process is started once and holds the unlocked vault
+    state, so unlock/list/lock calls avoid the per-call `bw` startup cost.
+    The server is bound to localhost only.
+
+    WARNING: `bw serve` does not authenticate callers and ignores session
+    keys. While the vault is unlocked, any local process can list every
+    item (passwords included) from its port. Use only on a single-user
+    machine; see make_cli().
+    """
+
+    def __init__(
+        self,
+        cli_path: str = "bw",
+        port: Optional[int] = None,
+        startup_timeout: float = 15.0
+    ):
+        """
+        Start `bw serve` and wait until it accepts requests.
+
+        Args:
+            cli_path: Path to bw executable (default: "bw" in PATH)
+            port: Local port for `bw serve` (default: any free port)
+            startup_timeout: Seconds to wait for the server to come up
+
+        Raises:
+            BitwardenCLIError: If CLI not installed/logged in or server fails to start
+        """
+        super().__init__(cli_path)
+        self.port = port or self._find_free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._http = requests.Session()
+        self._server_proc: Optional[subprocess.Popen] = None
+        self._start_server(startup_timeout)
+        atexit.register(self.close)
+
+    @staticmethod
+    def _find_free_port() -> int:
+        """Ask the OS for an unused localhost port."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def _start_server(self, startup_timeout: float) -> None:
+        """
+        Launch `bw serve` and poll /status until it responds.
+
+        Raises:
+            BitwardenCLIError: If the server exits or does not respond in time
+        """
+        logger.info(f"Starting bw serve on 127.0.0.1:{self.port}...")
+        self._server_proc = subprocess.Popen(
+            [
+                self.cli_path, "serve",
+                "--hostname", "127.0.0.1",
+                "--port", str(self.port)
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+
+        deadline = time.monotonic() + startup_timeout
+        try:
+            while time.monotonic() < deadline:
+                if self._server_proc.poll() is not None:
+                    raise BitwardenCLIError("bw serve exited during startup")
+                try:
+                    self._http.get(f"{self.base_url}/status", timeout=1)
+                    logger.debug("bw serve is ready")
+                    return
+                except requests.exceptions.RequestException:
+                    # Not listening yet, or too slow to answer the first /status
+                    time.sleep(0.1)
+            raise BitwardenCLIError("bw serve did not start in time")
+        except BaseException:
+            # Never leave the child running when startup fails
+            self.close()
+            raise
+
+    def _request(self, method: str, path: str, **kwargs) -> Dict:
+        """
+        Call the `bw serve` API and return the response data.
+
+        Raises:
+            BitwardenCLIError: If the request fails or the API reports an error
+        """
+        try:
+            response = self._http.request(
+                method,
+                f"{self.base_url}{path}",
+                timeout=kwargs.pop("timeout", 30),
+                **kwargs
+            )
+            body = json_codec.loads(response.content)
+        except requests.exceptions.Timeout:
+            raise BitwardenCLIError(f"bw serve request timed out: {path}")
+        except requests.exceptions.RequestException as e:
+            raise BitwardenCLIError(f"bw serve request failed: {e}")
+        except ValueError as e:
+            raise BitwardenCLIError(f"Failed to parse bw serve response: {e}")
+
+        if not body.get("success"):
+            raise BitwardenCLIError(body.get("message") or f"bw serve error on {path}")
+
+        return body.get("data") or {}
+
+    def unlock(self, password: Union[str, bytes, bytearray]) -> str:
+        """
+        Unlock vault held by `bw serve`.
+
+        Args:
+            password: Master password
+
+        Returns:
+            Session key for subsequent operations
+
+        Raises:
+            BitwardenCLIError: If unlock fails
+        """
+        if not isinstance(password, str):
+            password = bytes(password).decode('utf-8')  # JSON body needs text
+
+        try:
+            data = self._request("POST", "/unlock", json={"password": password})
+        except BitwardenCLIError as e:
+            if "invalid master password" in str(e).lower():
+                raise BitwardenCLIError("Invalid master password")
+            raise BitwardenCLIError(f"Failed to unlock vault: {e}")
+
+        session_key = data.get("raw", "")
+        if not session_key:
+            raise BitwardenCLIError("Unlock returned empty session key")
+
+        return session_key
+
+    def list_items(self, search: str, session_key: str) -> List[Dict]:
+        """
+        Search vault for items matching domain.
+
+        Args:
+            search: Search term (domain name)
+            session_key: Session key from unlock() (unused; bw serve holds the session)
+
+        Returns:
+            List of matching vault items
+
+        Raises:
+            BitwardenCLIError: If search fails
+        """
+        try:
+            data = self._request(
+                "GET", "/list/object/items", params={"search": search}
+            )
+        except BitwardenCLIError as e:
+            raise BitwardenCLIError(f"Failed to list items: {e}")
+
+        items = data.get("data")
+        if not isinstance(items, list):
+            raise BitwardenCLIError(
+                f"Expected list from bw serve, got {type(items)}"
+            )
+
+        return items
+
+    def lock(self) -> None:
+        """
+        Lock vault held by `bw serve`.
+
+        Raises:
+            BitwardenCLIError: If lock fails
+        """
+        if not self._server_proc or self._server_proc.poll() is not None:
+            return
+        try:
+            self._request("POST", "/lock", timeout=10)
+        except BitwardenCLIError as e:
+            raise BitwardenCLIError(f"Failed to lock vault: {e}")
+
+    def status(self) -> Dict:
+        """
+        Get current Bitwarden status from `bw serve`.
+
+        Returns:
+            Status dictionary with 'status' key
+
+        Raises:
+            BitwardenCLIError: If status check fails
+        """
+        data = self._request("GET", "/status", timeout=5)
+        return data.get("template", data)
+
+    async def unlock_async(self, password: Union[str, bytes, bytearray]) -> str:
+        """Unlock vault held by `bw serve` without blocking the event loop."""
+        return await asyncio.to_thread(self.unlock, password)
+
+    async def list_items_async(self, search: str, session_key: str) -> List[Dict]:
+        """Search vault via `bw serve` without blocking the event loop."""
+        return await asyncio.to_thread(self.list_items, search, session_key)
+
+    async def lock_async(self) -> None:
+        """Lock vault held by `bw serve` without blocking the event loop."""
+        await asyncio.to_thread(self.lock)
+
+    def close(self) -> None:
+        """Stop the `bw serve` process and release the HTTP session."""
+        if self._server_proc and self._server_proc.poll() is None:
+            logger.debug("Stopping bw serve")
+            self._server_proc.terminate()
+            try:
+                self._server_proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._server_proc.kill()
+        self._server_proc = None
+        self._http.close()
+
+
+def make_cli() -> BitwardenCLI:
+    """
+    Create the vault CLI backend selected by the environment.
+
+    Returns a subprocess-backed BitwardenCLI unless BW_SERVE=1 opts in to
+    BitwardenServeCLI (faster, but see its security warning).
+
+    Returns:
+        BitwardenCLI or BitwardenServeCLI instance
+
+    Raises:
+        BitwardenCLIError: If CLI not installed/logged in or bw serve fails to start
+    """
+    if os.environ.get(SERVE_ENV) == "1":
+        logger.warning(
+            "Using bw serve: its API is unauthenticated, any local process "
+            "can read the vault while it is unlocked"
+        )
+        return BitwardenServeCLI()
+    return BitwardenCLI()
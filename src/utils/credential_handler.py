@@ -4,7 +4,28 @@ Secure credential handling with automatic cleanup.
 This module provides the SecureCredential class for safely storing and handling
 credentials with guaranteed memory cleanup using context manager protocol.
 """
-from typing import Optional, Type, Any
+import ctypes
+import weakref
+from typing import Optional, Type, Any, Union
+
+
+def wipe_bytes(buffer: bytearray) -> None:
+    """
+    Overwrite a mutable buffer with zeros in place.
+
+    Unlike rebinding a str, this scrubs the actual memory holding the secret.
+
+    Args:
+        buffer: Buffer to zero
+    """
+    if buffer:
+        ctypes.memset((ctypes.c_char * len(buffer)).from_buffer(buffer), 0, len(buffer))
+
+
+def _wipe_all(*buffers: bytearray) -> None:
+    """Zero each buffer (finalizer callback; must not reference the owner)."""
+    for buffer in buffers:
+        wipe_bytes(buffer)
 
 
 class SecureCredential:
@@ -17,46 +38,59 @@ class SecureCredential:
         # Credential automatically cleared here
     """
 
-    def __init__(self, username: str, password: str):
+    # Fixed attributes; __weakref__ is needed for the cleanup finalizer
+    __slots__ = ("_username", "_password", "_cleared", "_finalizer", "__weakref__")
+
+    def __init__(self, username: Union[str, bytes, bytearray], password: Union[str, bytes, bytearray]):
         """
         Create secure credential.
 
+        Values are held in bytearrays so clear() can zero them in place.
+
         Args:
             username: Account username
             password: Account password
         """
-        self._username = username
-        self._password = password
+        self._username = self._to_buffer(username)
+        self._password = self._to_buffer(password)
         self._cleared = False
 
+        # Zero buffers if the object is collected without clear(); unlike
+        # __del__, a weakref finalizer runs at most once and also at exit
+        self._finalizer = weakref.finalize(self, _wipe_all, self._username, self._password)
+
+    @staticmethod
+    def _to_buffer(value: Union[str, bytes, bytearray]) -> bytearray:
+        """Copy a value into a mutable UTF-8 buffer."""
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        return bytearray(value)
+
     @property
     def username(self) -> str:
         """Get username (raises if cleared)."""
         if self._cleared:
             raise ValueError("Credential has been cleared")
-        return self._username
+        return self._username.decode('utf-8')
 
     @property
     def password(self) -> str:
-        """Get password (raises if cleared)."""
+        """Get password (raises if cleared). Each access returns a new str."""
         if self._cleared:
             raise ValueError("Credential has been cleared")
-        return self._password
+        return self._password.decode('utf-8')
 
     def clear(self) -> None:
         """
         Clear credential from memory.
 
-        Overwrites strings with 'X' characters before deletion.
+        Zeroes the username and password buffers in place before deletion.
         """
         if self._cleared:
             return
 
-        # Overwrite strings in memory (best effort)
-        if self._username:
-            self._username = "X" * len(self._username)
-        if self._password:
-            self._password = "X" * len(self._password)
+        # Overwrite buffers in memory
+        self._finalizer()
 
         self._cleared = True
 
@@ -78,13 +112,6 @@ class SecureCredential:
         self.clear()
         return False  # Don't suppress exceptions
 
-    def __del__(self) -> None:
-        """Cleanup on garbage collection."""
-        try:
-            self.clear()
-        except:
-            pass  # Ignore errors in __del__
-
     def __repr__(self) -> str:
         """Safe representation without credentials."""
         status = "cleared" if self._cleared else "active"
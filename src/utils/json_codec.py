@@ -0,0 +1,66 @@
+"""
+JSON encoding for request and credential payloads.
+
+Uses orjson (C extension, several times faster than the stdlib encoder)
+when it is installed, otherwise falls back to the stdlib json module.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# True when payloads are encoded with orjson
+HAS_ORJSON = orjson is not None
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize object to a compact JSON string.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def dumpb(obj: Any) -> bytes:
+    """
+    Serialize object to compact UTF-8 JSON bytes.
+
+    Avoids the str round trip when the result is encrypted or sent as-is.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        JSON text as UTF-8 bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """
+    Parse JSON text.
+
+    Args:
+        data: JSON text or UTF-8 bytes
+
+    Returns:
+        Parsed object
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
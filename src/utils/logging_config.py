@@ -2,9 +2,33 @@
 Application logging configuration with sensitive data protection.
 
 This module sets up logging with filters to prevent credential leakage.
+
+Loggers drop records below their level before any formatting happens, so
+pass values as %-style args rather than building the message up front. When
+the arguments themselves are expensive to compute, guard the call:
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Vault items: %s", summarize(items))
 """
+import atexit
 import logging
+import logging.handlers
+import queue
+import re
 import sys
+from collections.abc import Mapping
+
+# Level names accepted by setup_logging()
+_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+# Set once setup_logging() has installed the handlers
+_CONFIGURED = False
 
 
 class SensitiveDataFilter(logging.Filter):
@@ -16,36 +40,134 @@ class SensitiveDataFilter(logging.Filter):
         "credential", "auth"
     ]
 
-    def filter(self, record: logging.LogRecord) -> bool:
-        """Block log records that might contain sensitive data."""
-        message_lower = record.getMessage().lower()
+    def __init__(self, name: str = ""):
+        """
+        Initialize filter.
+
+        All keyword forms are compiled into one case-insensitive regex so
+        each message is scanned once instead of once per keyword.
 
-        # Block if message contains sensitive keywords with "="
+        Args:
+            name: Logger name passed to logging.Filter
+        """
+        super().__init__(name)
+        # Block if message contains sensitive keywords with "=" or as a JSON key
         # This catches "password=foo" but not "password input"
-        for pattern in self.SENSITIVE_PATTERNS:
-            if f"{pattern}=" in message_lower or f'"{pattern}"' in message_lower:
-                record.msg = f"[BLOCKED: Message contained sensitive data]"
-                return True
+        needles = [f"{p}=" for p in self.SENSITIVE_PATTERNS]
+        needles += [f'"{p}"' for p in self.SENSITIVE_PATTERNS]
+        self._sensitive_re = re.compile("|".join(map(re.escape, needles)), re.IGNORECASE)
+        self._min_len = min(map(len, needles))
 
+    def _is_sensitive(self, text: str) -> bool:
+        """Check text for sensitive keywords, skipping the regex if it can't match."""
+        # Too short for any keyword form, or missing the "=" / double quote
+        # every form contains
+        if len(text) < self._min_len or ('=' not in text and '"' not in text):
+            return False
+        return self._sensitive_re.search(text) is not None
+
+    def _args_sensitive(self, record: logging.LogRecord) -> bool:
+        """
+        Check a record's args, one value at a time, before formatting.
+
+        Records that pass keep the formatted message as record.msg (args
+        cleared), so handlers reuse it instead of formatting again.
+        """
+        args = record.args
+        values = args.values() if isinstance(args, Mapping) else args
+        if any(self._is_sensitive(str(value)) for value in values):
+            return True
+        # A keyword can still be split between msg and an arg ("%s=%s")
+        formatted = record.getMessage()
+        if self._is_sensitive(formatted):
+            return True
+        record.msg = formatted
+        record.args = None
+        return False
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Block log records that might contain sensitive data."""
+        # Check the unformatted message and each arg first; only records
+        # whose parts are all clean need the %-formatting pass
+        msg = record.msg if isinstance(record.msg, str) else str(record.msg)
+        if self._is_sensitive(msg) or (record.args and self._args_sensitive(record)):
+            record.msg = "[BLOCKED: Message contained sensitive data]"
+            record.args = None
         return True
 
 
+class _DrainFlushStreamHandler(logging.StreamHandler):
+    """
+    Stream handler that flushes once the log queue is drained.
+
+    StreamHandler flushes after every record. Run by a QueueListener, this
+    handler leaves records in the stream's buffer while more are queued, so a
+    burst of records goes out in one write instead of one per line.
+    """
+
+    def __init__(self, stream, log_queue: queue.SimpleQueue):
+        """
+        Initialize handler.
+
+        Args:
+            stream: Stream to write to
+            log_queue: Queue feeding this handler's listener
+        """
+        super().__init__(stream)
+        self._log_queue = log_queue
+
+    def flush(self) -> None:
+        """Flush the stream unless more records are waiting."""
+        if self._log_queue.empty():
+            super().flush()
+
+
 def setup_logging(level: str = "INFO") -> None:
     """
     Configure application logging.
 
+    Handlers are installed on the first call; later calls only change the
+    root level.
+
     CRITICAL: Logs must never contain credential values.
 
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR)
     """
-    logging.basicConfig(
-        level=getattr(logging, level.upper()),
-        format='%(asctime)s | %(name)s | %(levelname)s | %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-
-    # Ensure no sensitive data in logs
-    logging.getLogger().addFilter(SensitiveDataFilter())
+    global _CONFIGURED
+    root = logging.getLogger()
+    level_int = _LEVELS.get(level.upper(), logging.INFO)
+
+    if _CONFIGURED:
+        root.setLevel(level_int)
+        return
+
+    _CONFIGURED = True
+    if root.handlers:
+        # Configured elsewhere (basicConfig would be a no-op): keep those
+        # handlers but make sure each one filters sensitive data
+        for existing in root.handlers:
+            if not any(isinstance(f, SensitiveDataFilter) for f in existing.filters):
+                existing.addFilter(SensitiveDataFilter())
+        root.setLevel(level_int)
+        return
+
+    # Callers only scan and enqueue records; stdout writes happen on the
+    # listener thread
+    log_queue = queue.SimpleQueue()
+    handler = _DrainFlushStreamHandler(sys.stdout, log_queue)
+    handler.setFormatter(logging.Formatter('%(asctime)s | %(name)s | %(levelname)s | %(message)s'))
+
+    # Ensure no sensitive data in logs. The filter sits on the queue handler:
+    # logger filters only see records logged on that exact logger, while
+    # every propagated record passes through the handler. It must run before
+    # QueueHandler.prepare() merges msg and args, so it can still check each
+    # arg on its own.
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    queue_handler.addFilter(SensitiveDataFilter())
+    listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logging.basicConfig(level=level_int, handlers=[queue_handler])
@@ -0,0 +1,165 @@
+"""
+Shared cache for the Bitwarden vault session key.
+
+The master password is requested at most once per session: the first
+caller prompts and unlocks, later callers reuse the session key until it
+is older than the TTL (BW_SESSION_TTL, default 900 seconds), at which
+point the vault is locked again.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Callable, List, Optional
+
+from src.utils.bitwarden_cli import BitwardenCLI, BitwardenCLIError
+from src.utils.credential_handler import wipe_bytes
+
+logger = logging.getLogger(__name__)
+
+# Environment variable overriding the default session lifetime
+SESSION_TTL_ENV = "BW_SESSION_TTL"
+DEFAULT_SESSION_TTL = 900
+
+
+class SessionCache:
+    """
+    Thread-safe holder of the unlocked vault session key.
+
+    CRITICAL: Only the session key is kept. The master password is wiped
+    immediately after unlock.
+    """
+
+    def __init__(
+        self,
+        cli: BitwardenCLI,
+        password_prompt: Callable[[], bytearray],
+        ttl: Optional[float] = None
+    ):
+        """
+        Initialize session cache.
+
+        Args:
+            cli: BitwardenCLI used to unlock the vault
+            password_prompt: Callable returning the master password in a
+                mutable buffer (zeroed after unlock)
+            ttl: Seconds a session key stays valid (default: BW_SESSION_TTL
+                environment variable, or 900)
+        """
+        self.cli = cli
+        self.password_prompt = password_prompt
+        self.ttl = ttl if ttl is not None else float(
+            os.environ.get(SESSION_TTL_ENV, DEFAULT_SESSION_TTL)
+        )
+        self._lock = threading.Lock()
+        self._session_key: Optional[str] = None
+        self._unlocked_at: Optional[float] = None
+        self._drop_listeners: List[Callable[[], None]] = []
+
+    def cached_session_key(self) -> Optional[str]:
+        """Return cached session key if it is younger than ttl."""
+        with self._lock:
+            return self._fresh_session_key()
+
+    def get_session_key(self) -> str:
+        """
+        Return cached session key, prompting and unlocking if needed.
+
+        Concurrent callers wait for a single prompt instead of each asking
+        for the master password.
+
+        Returns:
+            Session key for vault operations
+
+        Raises:
+            BitwardenCLIError: If no password provided or unlock fails
+        """
+        with self._lock:
+            session_key = self._fresh_session_key()
+            if session_key:
+                return session_key
+
+            password = self.password_prompt()
+            if not password:
+                raise BitwardenCLIError("No password provided")
+            return self._unlock(password)
+
+    def unlock(self, password: bytearray) -> str:
+        """
+        Unlock vault with an already collected password and cache the key.
+
+        Args:
+            password: Master password buffer (zeroed after unlock)
+
+        Returns:
+            Session key for vault operations
+
+        Raises:
+            BitwardenCLIError: If unlock fails
+        """
+        with self._lock:
+            return self._unlock(password)
+
+    def add_drop_listener(self, callback: Callable[[], None]) -> None:
+        """
+        Register a callback run whenever the session key is dropped.
+
+        Called on lock(), invalidate() and TTL expiry, with the cache lock
+        held, so callbacks must not call back into this cache. Used to purge
+        data read from the vault once the vault is locked.
+
+        Args:
+            callback: Called with no arguments
+        """
+        self._drop_listeners.append(callback)
+
+    def invalidate(self) -> None:
+        """Drop the cached session key (e.g. after lock or rejection)."""
+        with self._lock:
+            self._drop_key()
+
+    def lock(self) -> None:
+        """
+        Lock the vault and drop the cached session key.
+
+        Use this instead of cli.lock() on a shared CLI, so no caller is
+        handed a session key the lock has already invalidated.
+
+        Raises:
+            BitwardenCLIError: If the lock command fails (key is dropped anyway)
+        """
+        with self._lock:
+            self._drop_key()
+            self.cli.lock()
+
+    def _fresh_session_key(self) -> Optional[str]:
+        """Return session key if not expired. Caller holds the lock."""
+        if self._session_key and self._unlocked_at is not None:
+            if time.monotonic() - self._unlocked_at < self.ttl:
+                return self._session_key
+            logger.info("Cached vault session expired, locking vault")
+            self._drop_key()
+            # Re-lock so the expired key cannot be used by anyone holding it
+            try:
+                self.cli.lock()
+            except BitwardenCLIError as e:
+                logger.warning(f"Failed to lock vault: {e}")
+        return None
+
+    def _drop_key(self) -> None:
+        """Forget the session key and notify drop listeners. Caller holds the lock."""
+        self._session_key = None
+        self._unlocked_at = None
+        for callback in self._drop_listeners:
+            callback()
+
+    def _unlock(self, password: bytearray) -> str:
+        """Unlock vault and store the session key. Caller holds the lock."""
+        try:
+            logger.info("Unlocking Bitwarden vault...")
+            self._session_key = self.cli.unlock(password)
+            self._unlocked_at = time.monotonic()
+            return self._session_key
+        finally:
+            # Zero password bytes in place
+            wipe_bytes(password)
@@ -0,0 +1,72 @@
+"""
+Coalescing of concurrent Bitwarden vault lookups.
+
+Every `bw list items` call starts a Node.js process. When several agents
+ask for the same domain at the same time on one session token, they share
+a single in-flight `bw --search` query. Different domains each run their
+own search, so the vault is never listed as a whole and matching stays
+bw's own.
+"""
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Tuple
+
+from src.utils.bitwarden_cli import BitwardenCLI
+
+logger = logging.getLogger(__name__)
+
+
+class VaultBatcher:
+    """
+    Shares concurrent identical list_items() calls.
+
+    The first caller for a (session token, search) pair runs the vault query
+    and resolves the future every later caller for that pair waits on. No
+    lock is held across the subprocess call, and a lone lookup never waits.
+    """
+
+    def __init__(self, cli_factory: Callable[[], BitwardenCLI]):
+        """
+        Initialize batcher.
+
+        Args:
+            cli_factory: Callable returning the BitwardenCLI to query
+        """
+        self.cli_factory = cli_factory
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], Future] = {}  # (session key, search) -> future
+
+    def list_items(self, search: str, session_key: str) -> List[Dict]:
+        """
+        Search vault for items matching domain, sharing identical in-flight queries.
+
+        Args:
+            search: Search term (domain name)
+            session_key: Session key from unlock()
+
+        Returns:
+            List of matching vault items
+
+        Raises:
+            BitwardenCLIError: If search fails
+        """
+        key = (session_key, search)
+        with self._lock:
+            future = self._pending.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._pending[key] = Future()
+
+        if is_leader:
+            try:
+                future.set_result(self.cli_factory().list_items(search, session_key))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._pending[key]
+        else:
+            logger.debug(f"Joining in-flight vault lookup for: {search}")
+
+        return future.result()
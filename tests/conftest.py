@@ -0,0 +1,19 @@
+"""
+Shared pytest fixtures.
+"""
+import os
+
+import pytest
+from src.sdk.pake_handler import PAKEHandler
+
+
+@pytest.fixture(scope="module")
+def pake_pair():
+    """
+    Ready client and server handlers sharing a random key (shared per module).
+
+    Built with from_key(), so no SPAKE2 math runs; tests that need a real
+    handshake run their own exchange.
+    """
+    key = os.urandom(32)
+    return PAKEHandler.from_key("client", key), PAKEHandler.from_key("server", key)
@@ -17,6 +17,9 @@ Usage:
     # Quick smoke test (pairing + one credential request)
     python -m tests.manual --quick
 
+    # Also run `bw status` in the prerequisite check
+    python -m tests.manual --strict
+
 Prerequisites:
     Terminal 1: python -m src.approval_client (must be running)
     Bitwarden: bw login (must be logged in)
@@ -24,21 +27,14 @@ Prerequisites:
 """
 import sys
 import argparse
-from rich.console import Console
-from tests.manual.test_pairing import PairingFlowTest
-from tests.manual.test_credential_request import CredentialRequestTest
-from tests.manual.test_session_management import SessionManagementTest
-from tests.manual.test_error_cases import ErrorCasesTest
-from tests.manual.base import TestStatus
+import importlib
+from collections import Counter
+from tests.manual.base import CONSOLE, ManualTestBase, TestContext, TestStatus, banner
 
 def print_banner():
     """Print welcome banner."""
-    console = Console()
-    console.print()
-    console.print("=" * 70, style="bold cyan")
-    console.print("  REMOTE CREDENTIAL ACCESS - MANUAL INTEGRATION TESTS", style="bold cyan")
-    console.print("=" * 70, style="bold cyan")
-    console.print()
+    console = CONSOLE
+    console.print(banner("REMOTE CREDENTIAL ACCESS - MANUAL INTEGRATION TESTS", "bold cyan"))
     console.print("[bold]Test Suite Overview:[/bold]")
     console.print("  1. [cyan]Pairing Flow[/cyan] - PAKE exchange, vault unlock")
     console.print("  2. [cyan]Credential Request[/cyan] - Encrypted requests, NO password prompt")
@@ -52,7 +48,7 @@ def print_banner():
     console.print()
 
 
-def run_quick_test() -> int:
+def run_quick_test(server_url: str = "http://localhost:5000") -> int:
     """
     Run quick smoke test (5 minutes).
     
@@ -60,15 +56,22 @@ def run_quick_test() -> int:
     - Pairing flow
     - One credential request (approved)
     
+    Args:
+        server_url: Approval server URL
+    
     Returns:
         Exit code
     """
-    console = Console()
+    console = CONSOLE
     console.print("[bold cyan]Running Quick Smoke Test[/bold cyan]")
     console.print()
     
+    from tests.manual.test_pairing import PairingFlowTest
+    from tests.manual.test_credential_request import CredentialRequestTest
+
     # Test 1: Pairing
-    pairing_test = PairingFlowTest()
+    ctx = TestContext(server_url)
+    pairing_test = PairingFlowTest(context=ctx)
     if not pairing_test.check_prerequisites():
         console.print("[red]Prerequisites not met - cannot continue[/red]")
         return 1
@@ -95,18 +98,13 @@ def run_quick_test() -> int:
     console.print("[cyan]Moving to credential request...[/cyan]")
     console.print()
     
-    cred_test = CredentialRequestTest()
-    cred_test.client = pairing_test.client  # Reuse paired client
+    cred_test = CredentialRequestTest(context=ctx)  # Reuses the paired client
     
     result2 = cred_test.test_credential_request_approved()
     cred_test.add_result(result2)
     
     # Combined summary
-    console.print()
-    console.print("=" * 70, style="cyan")
-    console.print("  QUICK TEST SUMMARY", style="bold cyan")
-    console.print("=" * 70, style="cyan")
-    console.print()
+    console.print(banner("QUICK TEST SUMMARY"))
     
     all_results = pairing_test.results + cred_test.results
     
@@ -118,7 +116,8 @@ def run_quick_test() -> int:
     
     console.print()
     
-    failed = sum(1 for r in all_results if r.status != TestStatus.PASSED)
+    counts = Counter(r.status for r in all_results)
+    failed = len(all_results) - counts[TestStatus.PASSED]
     if failed == 0:
         console.print("[bold green]✓ QUICK TEST PASSED[/bold green]")
         console.print()
@@ -133,86 +132,73 @@ def run_quick_test() -> int:
         return 1
 
 
-def run_all_tests() -> int:
+# Suite key -> (title, module, class), in run order
+SUITES = {
+    "pairing": ("Pairing Flow", "tests.manual.test_pairing", "PairingFlowTest"),
+    "credential": ("Credential Requests", "tests.manual.test_credential_request", "CredentialRequestTest"),
+    "session": ("Session Management", "tests.manual.test_session_management", "SessionManagementTest"),
+    "errors": ("Error Cases", "tests.manual.test_error_cases", "ErrorCasesTest"),
+}
+
+
+def load_suite(name: str):
+    """Import and return the test class for a suite key."""
+    _, module_name, class_name = SUITES[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def run_all_tests(server_url: str = "http://localhost:5000") -> int:
     """
     Run all manual integration tests.
     
+    Asks once up front which suites to run, then runs them without
+    prompting in between, stopping at the first failing suite. The suites
+    share one TestContext, so later suites reuse the paired client.
+    
+    Args:
+        server_url: Approval server URL
+    
     Returns:
         Exit code
     """
-    console = Console()
+    console = CONSOLE
     console.print("[bold cyan]Running All Manual Tests[/bold cyan]")
     console.print()
     
-    # Test 1: Pairing
-    console.print("[bold]Test Suite 1: Pairing Flow[/bold]")
-    pairing_test = PairingFlowTest()
-    exit_code1 = pairing_test.run()
-    
-    if exit_code1 != 0:
-        console.print("[red]Pairing tests failed - stopping[/red]")
-        return exit_code1
-    
-    console.print()
-    console.print("[green]✓ Pairing tests passed[/green]")
-    console.print()
     from rich.prompt import Prompt
-    response = Prompt.ask("Continue to credential tests?", choices=["y", "n"], default="y")
-    if response != "y":
-        return 0
-    
-    # Test 2: Credential requests
-    console.print()
-    console.print("[bold]Test Suite 2: Credential Requests[/bold]")
-    cred_test = CredentialRequestTest()
-    exit_code2 = cred_test.run()
-    
-    if exit_code2 != 0:
-        console.print("[red]Credential tests failed - stopping[/red]")
-        return exit_code2
-    
-    console.print()
-    console.print("[green]✓ Credential tests passed[/green]")
-    console.print()
-    response = Prompt.ask("Continue to session management tests?", choices=["y", "n"], default="y")
-    if response != "y":
-        return 0
-    
-    # Test 3: Session management
-    console.print()
-    console.print("[bold]Test Suite 3: Session Management[/bold]")
-    session_test = SessionManagementTest()
-    exit_code3 = session_test.run()
-    
-    if exit_code3 != 0:
-        console.print("[red]Session tests failed - stopping[/red]")
-        return exit_code3
-    
-    console.print()
-    console.print("[green]✓ Session tests passed[/green]")
-    console.print()
-    response = Prompt.ask("Continue to error case tests?", choices=["y", "n"], default="y")
-    if response != "y":
-        return 0
-    
-    # Test 4: Error cases
-    console.print()
-    console.print("[bold]Test Suite 4: Error Cases[/bold]")
-    error_test = ErrorCasesTest()
-    exit_code4 = error_test.run()
+    plan = Prompt.ask("Run suites", choices=["all", "quick", "custom"], default="all")
+    if plan == "quick":
+        return run_quick_test(server_url)
+    
+    selected = list(SUITES)
+    if plan == "custom":
+        answer = Prompt.ask(f"Suites to run (comma-separated: {', '.join(SUITES)})")
+        names = {name.strip() for name in answer.split(",")}
+        unknown = names - SUITES.keys()
+        if unknown:
+            console.print(f"[red]Unknown suites: {', '.join(sorted(unknown))}[/red]")
+            return 1
+        selected = [name for name in SUITES if name in names]
+    
+    ctx = TestContext(server_url)
+    for number, name in enumerate(selected, 1):
+        title = SUITES[name][0]
+        console.print()
+        console.print(f"[bold]Test Suite {number}: {title}[/bold]")
+        exit_code = load_suite(name)(context=ctx).run()
+        
+        if exit_code != 0:
+            console.print(f"[red]{title} tests failed - stopping[/red]")
+            return exit_code
+        
+        console.print()
+        console.print(f"[green]✓ {title} tests passed[/green]")
     
     # Final summary
+    console.print(banner("ALL TESTS COMPLETE", "bold cyan"))
+    console.print("[bold green]✓ ALL TEST SUITES PASSED[/bold green]")
     console.print()
-    console.print("=" * 70, style="bold cyan")
-    console.print("  ALL TESTS COMPLETE", style="bold cyan")
-    console.print("=" * 70, style="bold cyan")
-    console.print()
-    
-    all_passed = all(code == 0 for code in [exit_code1, exit_code2, exit_code3, exit_code4])
-    
-    if all_passed:
-        console.print("[bold green]✓ ALL TEST SUITES PASSED[/bold green]")
-        console.print()
+    if selected == list(SUITES):
         console.print("[bold]Validated:[/bold]")
         console.print("  ✓ PAKE protocol implementation")
         console.print("  ✓ Vault unlock timing (once during pairing)")
@@ -220,10 +206,7 @@ def run_all_tests() -> int:
         console.print("  ✓ Session management")
         console.print("  ✓ Error handling")
         console.print()
-        return 0
-    else:
-        console.print("[bold red]✗ SOME TESTS FAILED[/bold red]")
-        return 1
+    return 0
 
 
 def main():
@@ -236,7 +219,7 @@ def main():
     
     parser.add_argument(
         '--test',
-        choices=['pairing', 'credential', 'session', 'errors'],
+        choices=list(SUITES),
         help='Run specific test suite'
     )
     
@@ -252,34 +235,29 @@ def main():
         help='Approval server URL (default: http://localhost:5000)'
     )
     
+    parser.add_argument(
+        '--strict',
+        action='store_true',
+        help='Run `bw status` during prerequisite checks (default: only locate bw)'
+    )
+    
     args = parser.parse_args()
+    ManualTestBase.strict_prereqs = args.strict
     
     # Print banner
     print_banner()
     
     # Run requested tests
     if args.quick:
-        return run_quick_test()
-    
-    elif args.test == 'pairing':
-        test = PairingFlowTest(args.server)
-        return test.run()
-    
-    elif args.test == 'credential':
-        test = CredentialRequestTest(args.server)
-        return test.run()
-    
-    elif args.test == 'session':
-        test = SessionManagementTest(args.server)
-        return test.run()
+        return run_quick_test(args.server)
     
-    elif args.test == 'errors':
-        test = ErrorCasesTest(args.server)
+    elif args.test:
+        test = load_suite(args.test)(args.server)
         return test.run()
     
     else:
         # Run all tests
-        return run_all_tests()
+        return run_all_tests(args.server)
 
 
 if __name__ == '__main__':
@@ -6,16 +6,36 @@ and result reporting.
 
 Location: tests/manual/base.py
 """
+import os
 import sys
 import time
+import shutil
+import subprocess
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import logging
-from typing import Optional, List, Dict
-from dataclasses import dataclass
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, List, Dict, Union
+from dataclasses import dataclass, field
 from enum import Enum
+import requests
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.prompt import Prompt
+from rich.text import Text
+from src.sdk.credential_client import CredentialClient
+
+# Shared by every test suite and the runner; Rich probes the terminal once.
+# MANUAL_TESTS_QUIET=1 suppresses output (and skips building it) for CI runs.
+CONSOLE = Console(quiet=os.environ.get("MANUAL_TESTS_QUIET") == "1")
+
+# Keep-alive connection pool for server probes
+_SESSION = requests.Session()
+
+# Seconds a successful prerequisite check is reused by later suites
+PREREQ_CACHE_TTL = 60
 
 
 class TestStatus(Enum):
@@ -26,7 +46,70 @@ class TestStatus(Enum):
     PENDING = "pending"
 
 
-@dataclass
+def banner(title: str, rule_style: str = "cyan") -> Text:
+    """
+    Build a title framed by rules, with a blank line above and below.
+
+    Printed with a single console.print() call.
+
+    Args:
+        title: Banner title
+        rule_style: Rich style for the rule lines
+
+    Returns:
+        Banner text
+    """
+    rule = "=" * 70
+    return Text.assemble(
+        "\n", (rule, rule_style), "\n", (f"  {title}", "bold cyan"), "\n", (rule, rule_style), "\n"
+    )
+
+
+class Lazy:
+    """Message text that is only built when it is rendered."""
+
+    __slots__ = ("fn",)
+
+    def __init__(self, fn: Callable[[], str]):
+        """
+        Initialize lazy message.
+
+        Args:
+            fn: Callable returning the message (Rich markup allowed)
+        """
+        self.fn = fn
+
+    def __rich__(self) -> str:
+        return self.fn()
+
+    def __str__(self) -> str:
+        return self.fn()
+
+
+# Message argument accepted by the print_* helpers
+Message = Union[str, Lazy]
+
+
+def automated(test_method):
+    """
+    Mark a test method as needing no input from the user.
+
+    Suites may run automated tests while the user works on others.
+    """
+    test_method.requires_human = False
+    return test_method
+
+
+# Summary table cell for each status
+_STATUS_STR = {
+    TestStatus.PASSED: "[green]✓ PASSED[/green]",
+    TestStatus.FAILED: "[red]✗ FAILED[/red]",
+    TestStatus.SKIPPED: "[yellow]⊘ SKIPPED[/yellow]",
+    TestStatus.PENDING: "[dim]○ PENDING[/dim]",
+}
+
+
+@dataclass(slots=True, frozen=True)
 class TestResult:
     """Result of a test execution."""
     test_name: str
@@ -36,6 +119,21 @@ class TestResult:
     error: Optional[str] = None
 
 
+@dataclass
+class TestContext:
+    """
+    State shared by the test suites of one run.
+
+    Suites built with the same context reuse one HTTP session and the
+    most recently paired client instead of pairing again.
+    """
+    server_url: str = "http://localhost:5000"
+    http: requests.Session = field(default_factory=lambda: _SESSION)
+    client: Optional[CredentialClient] = None
+
+    __test__ = False  # Not a pytest test class
+
+
 class ManualTestBase:
     """
     Base class for manual integration tests.
@@ -43,17 +141,47 @@ class ManualTestBase:
     Provides common functionality for terminal coordination,
     user prompts, and result reporting.
     """
+
+    # Status prefixes parsed once; messages are appended as plain text
+    _PREFIX_STEP = Text.from_markup("[cyan]→[/cyan] ")
+    _PREFIX_OK = Text.from_markup("[green]✓[/green] ")
+    _PREFIX_ERR = Text.from_markup("[red]✗[/red] ")
+    _PREFIX_WARN = Text.from_markup("[yellow]⚠[/yellow] ")
+    _PREFIX_INFO = Text.from_markup("[blue]ℹ[/blue] ")
+
+    # Run `bw status` in check_prerequisites() instead of only locating bw
+    strict_prereqs = False
+
+    # server_url -> monotonic time of the last successful prerequisite check
+    _prereq_cache: Dict[str, float] = {}
+
+    # Held while printing one block of output (or prompting), so tests run
+    # in the background never interleave with the foreground test's output
+    _console_lock = threading.RLock()
     
-    def __init__(self, server_url: str = "http://localhost:5000"):
+    def __init__(
+        self,
+        server_url: str = "http://localhost:5000",
+        context: Optional[TestContext] = None
+    ):
         """
         Initialize manual test base.
         
         Args:
             server_url: URL of approval server (default: http://localhost:5000)
+            context: Shared run state; its server_url takes precedence
         """
-        self.server_url = server_url
-        self.console = Console()
+        self.ctx = context or TestContext(server_url)
+        self.server_url = self.ctx.server_url
+        self.console = CONSOLE
         self.results: List[TestResult] = []
+        # Pacing prompts are skipped when a script drives the tests
+        self.interactive = (
+            sys.stdin.isatty()
+            and os.environ.get("MANUAL_TESTS_NONINTERACTIVE") != "1"
+        )
+        # Runs blocking SDK calls while the console renders
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="manual-test")
         
         # Setup logging to show only errors
         logging.basicConfig(
@@ -61,56 +189,100 @@ class ManualTestBase:
             format='%(levelname)s: %(message)s'
         )
     
+    @property
+    def client(self) -> Optional[CredentialClient]:
+        """Paired client, shared with other suites using the same context."""
+        return self.ctx.client
+
+    @client.setter
+    def client(self, client: Optional[CredentialClient]):
+        self.ctx.client = client
+
+    def has_paired_client(self) -> bool:
+        """Check whether the context already holds a paired client."""
+        return self.client is not None and self.client.session_id is not None
+
+    @contextmanager
+    def timed(self) -> Iterator[Callable[[], float]]:
+        """
+        Time a test body.
+
+        Yields:
+            Function returning seconds elapsed since the block started
+        """
+        start = time.perf_counter()
+        yield lambda: time.perf_counter() - start
+
     def print_header(self, title: str):
         """Print test header."""
-        self.console.print()
-        self.console.print("=" * 70, style="cyan")
-        self.console.print(f"  {title}", style="bold cyan")
-        self.console.print("=" * 70, style="cyan")
-        self.console.print()
+        with self._console_lock:
+            self.console.print(banner(title))
     
     def print_section(self, title: str):
         """Print section header."""
-        self.console.print()
-        self.console.print(f"[bold yellow]{title}[/bold yellow]")
-        self.console.print("-" * 70)
+        if self.console.quiet:
+            return
+        with self._console_lock:
+            self.console.print()
+            self.console.print(f"[bold yellow]{title}[/bold yellow]")
+            self.console.print("-" * 70)
+    
+    def _print_prefixed(self, prefix: Text, message: Message):
+        """Print a status line; nothing is built when the console is quiet."""
+        if self.console.quiet:
+            return
+        with self._console_lock:
+            self.console.print(prefix + Text(str(message)))
     
-    def print_step(self, step: str):
+    def print_step(self, step: Message):
         """Print test step."""
-        self.console.print(f"[cyan]→[/cyan] {step}")
+        self._print_prefixed(self._PREFIX_STEP, step)
     
-    def print_success(self, message: str):
+    def print_success(self, message: Message):
         """Print success message."""
-        self.console.print(f"[green]✓[/green] {message}")
+        self._print_prefixed(self._PREFIX_OK, message)
     
-    def print_error(self, message: str):
+    def print_error(self, message: Message):
         """Print error message."""
-        self.console.print(f"[red]✗[/red] {message}")
+        self._print_prefixed(self._PREFIX_ERR, message)
     
-    def print_warning(self, message: str):
+    def print_warning(self, message: Message):
         """Print warning message."""
-        self.console.print(f"[yellow]⚠[/yellow] {message}")
+        self._print_prefixed(self._PREFIX_WARN, message)
     
-    def print_info(self, message: str):
+    def print_info(self, message: Message):
         """Print info message."""
-        self.console.print(f"[blue]ℹ[/blue] {message}")
+        self._print_prefixed(self._PREFIX_INFO, message)
+    
+    def _display_pairing_code(self, code: str):
+        """Print pairing code as soon as the SDK reports it."""
+        with self._console_lock:
+            self.console.print()
+            self.console.print(f"[bold green]✓ PAIRING CODE: {code}[/bold green]")
+            self.console.print()
     
-    def print_action_required(self, message: str):
+    def print_action_required(self, message: Message):
         """Print action required for user."""
+        if self.console.quiet:
+            return
         panel = Panel(
             message,
             title="🔵 ACTION REQUIRED IN TERMINAL 1",
             border_style="blue",
             padding=(1, 2)
         )
-        self.console.print()
-        self.console.print(panel)
-        self.console.print()
+        with self._console_lock:
+            self.console.print()
+            self.console.print(panel)
+            self.console.print()
     
     def wait_for_user(self, message: str = "Press Enter when ready..."):
-        """Wait for user confirmation."""
-        self.console.print()
-        Prompt.ask(f"[dim]{message}[/dim]")
+        """Wait for user confirmation (no-op when not interactive)."""
+        if not self.interactive:
+            return
+        with self._console_lock:
+            self.console.print()
+            Prompt.ask(f"[dim]{message}[/dim]")
     
     def check_prerequisites(self) -> bool:
         """
@@ -119,6 +291,11 @@ class ManualTestBase:
         Returns:
             True if all prerequisites met, False otherwise
         """
+        checked_at = self._prereq_cache.get(self.server_url)
+        if checked_at is not None and time.monotonic() - checked_at < PREREQ_CACHE_TTL:
+            self.print_info("Prerequisites verified by previous suite")
+            return True
+
         self.print_section("Checking Prerequisites")
         
         all_ok = True
@@ -126,8 +303,7 @@ class ManualTestBase:
         # Check 1: Approval server running
         self.print_step("Checking approval server...")
         try:
-            import requests
-            response = requests.get(f"{self.server_url}/health", timeout=5)
+            response = self.ctx.http.get(f"{self.server_url}/health", timeout=5)
             if response.status_code == 200:
                 self.print_success("Approval server is running")
             else:
@@ -141,8 +317,29 @@ class ManualTestBase:
         
         # Check 2: Bitwarden CLI
         self.print_step("Checking Bitwarden CLI...")
+        if shutil.which('bw') is None:
+            self.print_error("Bitwarden CLI not found")
+            self.print_info("Install: https://bitwarden.com/help/cli/")
+            all_ok = False
+        elif not self.strict_prereqs:
+            # Locating bw is enough here; `bw status` starts Node.js
+            self.print_success("Bitwarden CLI is available")
+        else:
+            all_ok = self._check_bw_status() and all_ok
+
+        self.console.print()
+        if all_ok:
+            self._prereq_cache[self.server_url] = time.monotonic()
+        return all_ok
+
+    def _check_bw_status(self) -> bool:
+        """
+        Run `bw status` to confirm the CLI works.
+
+        Returns:
+            True unless the status check failed
+        """
         try:
-            import subprocess
             result = subprocess.run(
                 ['bw', 'status'],
                 capture_output=True,
@@ -153,28 +350,25 @@ class ManualTestBase:
                 self.print_success("Bitwarden CLI is available")
             else:
                 self.print_error("Bitwarden CLI status check failed")
-                all_ok = False
+                return False
         except FileNotFoundError:
             self.print_error("Bitwarden CLI not found")
             self.print_info("Install: https://bitwarden.com/help/cli/")
-            all_ok = False
+            return False
         except Exception as e:
             self.print_warning(f"Could not verify Bitwarden CLI: {e}")
-        
-        self.console.print()
-        return all_ok
+        return True
     
     def add_result(self, result: TestResult):
         """Add test result to results list."""
         self.results.append(result)
+        # A connection failure means the server may be gone; re-probe next time
+        if result.status == TestStatus.FAILED and result.error and "connection" in result.error.lower():
+            self._prereq_cache.pop(self.server_url, None)
     
     def print_summary(self):
         """Print test execution summary."""
-        self.console.print()
-        self.console.print("=" * 70, style="cyan")
-        self.console.print("  TEST SUMMARY", style="bold cyan")
-        self.console.print("=" * 70, style="cyan")
-        self.console.print()
+        self.console.print(banner("TEST SUMMARY"))
         
         if not self.results:
             self.console.print("[yellow]No tests executed[/yellow]")
@@ -187,36 +381,23 @@ class ManualTestBase:
         table.add_column("Duration", style="yellow")
         table.add_column("Message")
         
-        passed = 0
-        failed = 0
-        skipped = 0
-        
         for result in self.results:
-            if result.status == TestStatus.PASSED:
-                status_str = "[green]✓ PASSED[/green]"
-                passed += 1
-            elif result.status == TestStatus.FAILED:
-                status_str = "[red]✗ FAILED[/red]"
-                failed += 1
-            elif result.status == TestStatus.SKIPPED:
-                status_str = "[yellow]⊘ SKIPPED[/yellow]"
-                skipped += 1
-            else:
-                status_str = "[dim]○ PENDING[/dim]"
-            
-            duration_str = f"{result.duration:.2f}s"
-            
             message = result.message
             if result.error:
                 message = f"{message}\n[red]{result.error}[/red]"
             
             table.add_row(
                 result.test_name,
-                status_str,
-                duration_str,
+                _STATUS_STR[result.status],
+                f"{result.duration:.2f}s",
                 message
             )
         
+        counts = Counter(result.status for result in self.results)
+        passed = counts[TestStatus.PASSED]
+        failed = counts[TestStatus.FAILED]
+        skipped = counts[TestStatus.SKIPPED]
+        
         self.console.print(table)
         self.console.print()
         
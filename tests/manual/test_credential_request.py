@@ -10,8 +10,8 @@ Usage:
     python -m tests.manual.test_credential_request
 """
 import sys
-import time
-from tests.manual.base import ManualTestBase, TestResult, TestStatus
+from typing import Optional
+from tests.manual.base import Lazy, ManualTestBase, TestContext, TestResult, TestStatus
 from src.sdk.credential_client import CredentialClient
 from src.models.credential_response import CredentialStatus
 
@@ -19,10 +19,9 @@ from src.models.credential_response import CredentialStatus
 class CredentialRequestTest(ManualTestBase):
     """Test class for credential request validation."""
     
-    def __init__(self, server_url: str = "http://localhost:5000"):
+    def __init__(self, server_url: str = "http://localhost:5000", context: Optional[TestContext] = None):
         """Initialize credential request test."""
-        super().__init__(server_url)
-        self.client: CredentialClient = None
+        super().__init__(server_url, context)
     
     def test_pairing_first(self) -> TestResult:
         """
@@ -32,50 +31,51 @@ class CredentialRequestTest(ManualTestBase):
             TestResult
         """
         test_name = "Setup: Pairing"
-        start_time = time.time()
-        
-        self.print_section("Setup: Pairing with Server")
-        
-        try:
-            self.client = CredentialClient(self.server_url)
-            
-            pairing_code = self.client.pair(
-                agent_id="manual-test-002",
-                agent_name="Manual Test Agent - Credentials",
-                timeout=120
-            )
-            
-            self.console.print()
-            self.console.print(f"[bold green]✓ PAIRING CODE: {pairing_code}[/bold green]")
-            
-            self.print_action_required(
-                f"Type this in Terminal 1:\n\n"
-                f"  [bold cyan]pair {pairing_code}[/bold cyan]\n\n"
-                f"Then enter your Bitwarden master password.\n\n"
-                f"⏳ Waiting for pairing to complete..."
-            )
-            
-            duration = time.time() - start_time
-            
-            self.console.print()
-            self.print_success(f"Pairing complete (Session: {self.client.session_id})")
-            
-            return TestResult(
-                test_name=test_name,
-                status=TestStatus.PASSED,
-                message="Pairing established for credential tests",
-                duration=duration
-            )
-            
-        except Exception as e:
-            duration = time.time() - start_time
-            return TestResult(
-                test_name=test_name,
-                status=TestStatus.FAILED,
-                message="Failed to establish pairing",
-                duration=duration,
-                error=str(e)
-            )
+        with self.timed() as elapsed:
+            try:
+                self.client = CredentialClient(self.server_url)
+                
+                # Start pairing before rendering so the round trip overlaps it
+                pairing = self._executor.submit(
+                    self.client.pair,
+                    agent_id="manual-test-002",
+                    agent_name="Manual Test Agent - Credentials",
+                    timeout=120
+                )
+                self.print_section("Setup: Pairing with Server")
+                pairing_code = pairing.result()
+                
+                self.console.print()
+                self.console.print(f"[bold green]✓ PAIRING CODE: {pairing_code}[/bold green]")
+                
+                self.print_action_required(
+                    f"Type this in Terminal 1:\n\n"
+                    f"  [bold cyan]pair {pairing_code}[/bold cyan]\n\n"
+                    f"Then enter your Bitwarden master password.\n\n"
+                    f"⏳ Waiting for pairing to complete..."
+                )
+                
+                duration = elapsed()
+                
+                self.console.print()
+                self.print_success(f"Pairing complete (Session: {self.client.session_id})")
+                
+                return TestResult(
+                    test_name=test_name,
+                    status=TestStatus.PASSED,
+                    message="Pairing established for credential tests",
+                    duration=duration
+                )
+                
+            except Exception as e:
+                duration = elapsed()
+                return TestResult(
+                    test_name=test_name,
+                    status=TestStatus.FAILED,
+                    message="Failed to establish pairing",
+                    duration=duration,
+                    error=str(e)
+                )
     
     def test_credential_request_approved(self) -> TestResult:
         """
@@ -93,93 +93,92 @@ class CredentialRequestTest(ManualTestBase):
             TestResult
         """
         test_name = "Credential Request (Approved)"
-        start_time = time.time()
-        
-        self.print_section(f"Test 1: {test_name}")
-        
-        if not self.client or not self.client.session_id:
-            return TestResult(
-                test_name=test_name,
-                status=TestStatus.FAILED,
-                message="No active session - pairing required",
-                duration=0.0
-            )
-        
-        try:
-            self.print_step("Requesting credential for example.com...")
-            self.console.print()
-            
-            # Make request (this will block until user approves)
-            response = self.client.request_credential(
-                domain="example.com",
-                reason="Manual integration test - validating NO password prompt",
-                agent_id="manual-test-002",
-                agent_name="Manual Test Agent - Credentials"
-            )
-            
-            self.print_action_required(
-                "[bold yellow]⚠️  CRITICAL VALIDATION:[/bold yellow]\n\n"
-                "In Terminal 1, you should see a credential request prompt.\n\n"
-                "[bold red]WATCH CAREFULLY:[/bold red] You should see:\n"
-                "  ✓ Agent name and domain\n"
-                "  ✓ [Y] Approve    [N] Deny\n\n"
-                "[bold red]You should NOT see:[/bold red]\n"
-                "  ✗ Password prompt\n"
-                "  ✗ 'Enter Bitwarden master password'\n\n"
-                "Press [bold cyan]Y[/bold cyan] to approve the request.\n\n"
-                "⏳ Waiting for your approval..."
-            )
+        with self.timed() as elapsed:
+            self.print_section(f"Test 1: {test_name}")
             
-            duration = time.time() - start_time
-            
-            # Check response
-            self.console.print()
-            if response.status == CredentialStatus.APPROVED:
-                self.print_success("Credential approved!")
-                
-                with response.credential as cred:
-                    self.console.print(f"   Username: [cyan]{cred.username}[/cyan]")
-                    self.console.print(f"   Password: [dim]{'*' * len(cred.password)}[/dim] (hidden)")
-                
-                self.console.print()
-                self.print_success("CRITICAL: No password prompt appeared ✓")
-                self.print_success("Vault was already unlocked from pairing ✓")
-                
+            if not self.client or not self.client.session_id:
                 return TestResult(
                     test_name=test_name,
-                    status=TestStatus.PASSED,
-                    message="Credential retrieved successfully, no password prompt",
-                    duration=duration
+                    status=TestStatus.FAILED,
+                    message="No active session - pairing required",
+                    duration=elapsed()
                 )
+            
+            try:
+                self.print_step("Requesting credential for example.com...")
+                self.console.print()
                 
-            elif response.status == CredentialStatus.DENIED:
-                self.print_warning("User denied credential request")
-                return TestResult(
-                    test_name=test_name,
-                    status=TestStatus.FAILED,
-                    message="User denied - expected approval for test",
-                    duration=duration
+                # Make request (this will block until user approves)
+                response = self.client.request_credential(
+                    domain="example.com",
+                    reason="Manual integration test - validating NO password prompt",
+                    agent_id="manual-test-002",
+                    agent_name="Manual Test Agent - Credentials"
                 )
-            else:
-                self.print_error(f"Error: {response.error_message}")
+                
+                self.print_action_required(Lazy(lambda: (
+                    "[bold yellow]⚠️  CRITICAL VALIDATION:[/bold yellow]\n\n"
+                    "In Terminal 1, you should see a credential request prompt.\n\n"
+                    "[bold red]WATCH CAREFULLY:[/bold red] You should see:\n"
+                    "  ✓ Agent name and domain\n"
+                    "  ✓ [Y] Approve    [N] Deny\n\n"
+                    "[bold red]You should NOT see:[/bold red]\n"
+                    "  ✗ Password prompt\n"
+                    "  ✗ 'Enter Bitwarden master password'\n\n"
+                    "Press [bold cyan]Y[/bold cyan] to approve the request.\n\n"
+                    "⏳ Waiting for your approval..."
+                )))
+                
+                duration = elapsed()
+                
+                # Check response
+                self.console.print()
+                if response.status == CredentialStatus.APPROVED:
+                    self.print_success("Credential approved!")
+                    
+                    with response.credential as cred:
+                        self.console.print(f"   Username: [cyan]{cred.username}[/cyan]")
+                        self.console.print(f"   Password: [dim]{'*' * len(cred.password)}[/dim] (hidden)")
+                    
+                    self.console.print()
+                    self.print_success("CRITICAL: No password prompt appeared ✓")
+                    self.print_success("Vault was already unlocked from pairing ✓")
+                    
+                    return TestResult(
+                        test_name=test_name,
+                        status=TestStatus.PASSED,
+                        message="Credential retrieved successfully, no password prompt",
+                        duration=duration
+                    )
+                    
+                elif response.status == CredentialStatus.DENIED:
+                    self.print_warning("User denied credential request")
+                    return TestResult(
+                        test_name=test_name,
+                        status=TestStatus.FAILED,
+                        message="User denied - expected approval for test",
+                        duration=duration
+                    )
+                else:
+                    self.print_error(f"Error: {response.error_message}")
+                    return TestResult(
+                        test_name=test_name,
+                        status=TestStatus.FAILED,
+                        message="Credential request failed",
+                        duration=duration,
+                        error=response.error_message
+                    )
+                    
+            except Exception as e:
+                duration = elapsed()
+                self.print_error(f"Test failed: {e}")
                 return TestResult(
                     test_name=test_name,
                     status=TestStatus.FAILED,
-                    message="Credential request failed",
+                    message="Test execution error",
                     duration=duration,
-                    error=response.error_message
+                    error=str(e)
                 )
-                
-        except Exception as e:
-            duration = time.time() - start_time
-            self.print_error(f"Test failed: {e}")
-            return TestResult(
-                test_name=test_name,
-                status=TestStatus.FAILED,
-                message="Test execution error",
-                duration=duration,
-                error=str(e)
-            )
     
     def test_credential_request_denied(self) -> TestResult:
         """
@@ -193,65 +192,64 @@ class CredentialRequestTest(ManualTestBase):
             TestResult
         """
         test_name = "Credential Request (Denied)"
-        start_time = time.time()
-        
-        self.print_section(f"Test 2: {test_name}")
-        
-        if not self.client or not self.client.session_id:
-            return TestResult(
-                test_name=test_name,
-                status=TestStatus.SKIPPED,
-                message="No active session",
-                duration=0.0
-            )
-        
-        try:
-            self.print_step("Requesting credential for example.com...")
-            
-            response = self.client.request_credential(
-                domain="example.com",
-                reason="Manual test - please DENY this request",
-                agent_id="manual-test-002",
-                agent_name="Manual Test Agent - Denial"
-            )
-            
-            self.print_action_required(
-                "In Terminal 1, you should see a credential request.\n\n"
-                "Press [bold red]N[/bold red] to DENY this request.\n\n"
-                "⏳ Waiting for your decision..."
-            )
+        with self.timed() as elapsed:
+            self.print_section(f"Test 2: {test_name}")
             
-            duration = time.time() - start_time
-            
-            self.console.print()
-            if response.status == CredentialStatus.DENIED:
-                self.print_success("User denied request (expected)")
-                self.console.print(f"   Error message: {response.error_message}")
-                
+            if not self.client or not self.client.session_id:
                 return TestResult(
                     test_name=test_name,
-                    status=TestStatus.PASSED,
-                    message="Denial handled correctly",
-                    duration=duration
+                    status=TestStatus.SKIPPED,
+                    message="No active session",
+                    duration=elapsed()
+                )
+            
+            try:
+                self.print_step("Requesting credential for example.com...")
+                
+                response = self.client.request_credential(
+                    domain="example.com",
+                    reason="Manual test - please DENY this request",
+                    agent_id="manual-test-002",
+                    agent_name="Manual Test Agent - Denial"
                 )
-            else:
-                self.print_warning(f"Unexpected status: {response.status}")
+                
+                self.print_action_required(
+                    "In Terminal 1, you should see a credential request.\n\n"
+                    "Press [bold red]N[/bold red] to DENY this request.\n\n"
+                    "⏳ Waiting for your decision..."
+                )
+                
+                duration = elapsed()
+                
+                self.console.print()
+                if response.status == CredentialStatus.DENIED:
+                    self.print_success("User denied request (expected)")
+                    self.console.print(f"   Error message: {response.error_message}")
+                    
+                    return TestResult(
+                        test_name=test_name,
+                        status=TestStatus.PASSED,
+                        message="Denial handled correctly",
+                        duration=duration
+                    )
+                else:
+                    self.print_warning(f"Unexpected status: {response.status}")
+                    return TestResult(
+                        test_name=test_name,
+                        status=TestStatus.FAILED,
+                        message="Expected DENIED status",
+                        duration=duration
+                    )
+                    
+            except Exception as e:
+                duration = elapsed()
                 return TestResult(
                     test_name=test_name,
                     status=TestStatus.FAILED,
-                    message="Expected DENIED status",
-                    duration=duration
+                    message="Test execution error",
+                    duration=duration,
+                    error=str(e)
                 )
-                
-        except Exception as e:
-            duration = time.time() - start_time
-            return TestResult(
-                test_name=test_name,
-                status=TestStatus.FAILED,
-                message="Test execution error",
-                duration=duration,
-                error=str(e)
-            )
     
     def run(self) -> int:
         """Run all credential request tests."""
@@ -273,17 +271,20 @@ class CredentialRequestTest(ManualTestBase):
         
         self.wait_for_user("Ready to start? Press Enter...")
         
-        # Setup: Pairing
-        result_setup = self.test_pairing_first()
-        self.add_result(result_setup)
-        
-        if result_setup.status != TestStatus.PASSED:
-            self.print_error("Pairing failed - cannot continue")
-            self.print_summary()
-            return 1
-        
-        self.console.print()
-        self.wait_for_user("Pairing complete. Press Enter to continue to credential tests...")
+        # Setup: Pairing (unless a previous suite left a paired client)
+        if self.has_paired_client():
+            self.print_info(f"Reusing paired session {self.client.session_id}")
+        else:
+            result_setup = self.test_pairing_first()
+            self.add_result(result_setup)
+            
+            if result_setup.status != TestStatus.PASSED:
+                self.print_error("Pairing failed - cannot continue")
+                self.print_summary()
+                return 1
+            
+            self.console.print()
+            self.wait_for_user("Pairing complete. Press Enter to continue to credential tests...")
         
         # Test 1: Approved
         result1 = self.test_credential_request_approved()
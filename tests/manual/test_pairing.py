@@ -11,42 +11,17 @@ Usage:
 """
 import sys
 import time
-import threading
-import logging
-from tests.manual.base import ManualTestBase, TestResult, TestStatus
+from typing import Optional
+from tests.manual.base import ManualTestBase, TestContext, TestResult, TestStatus
 from src.sdk.credential_client import CredentialClient
 
 
-class PairingCodeCapture:
-    """Captures pairing code from logs in real-time."""
-
-    def __init__(self):
-        self.pairing_code = None
-        self.console = None
-
-    def capture_from_log(self, record):
-        """Log filter that captures pairing code."""
-        if "Pairing code generated:" in record.getMessage():
-            # Extract code from log message
-            msg = record.getMessage()
-            self.pairing_code = msg.split(":")[-1].strip()
-
-            # Display it immediately
-            if self.console:
-                self.console.print()
-                self.console.print(f"[bold green]✓ PAIRING CODE: {self.pairing_code}[/bold green]")
-                self.console.print()
-
-        return True  # Allow log to pass through
-
-
 class PairingFlowTest(ManualTestBase):
     """Test class for pairing flow validation."""
 
-    def __init__(self, server_url: str = "http://localhost:5000"):
+    def __init__(self, server_url: str = "http://localhost:5000", context: Optional[TestContext] = None):
         """Initialize pairing flow test."""
-        super().__init__(server_url)
-        self.client: CredentialClient = None
+        super().__init__(server_url, context)
 
     def test_successful_pairing(self) -> TestResult:
         """
@@ -68,18 +43,10 @@ class PairingFlowTest(ManualTestBase):
         self.print_section(f"Test 1: {test_name}")
 
         try:
-            # Setup log capture to display pairing code in real-time
-            capture = PairingCodeCapture()
-            capture.console = self.console
-
-            # Add log filter to capture pairing code
-            credential_logger = logging.getLogger('src.sdk.credential_client')
-            credential_logger.addFilter(capture.capture_from_log)
-            credential_logger.setLevel(logging.INFO)
-
-            # Initialize client
+            # Initialize client; the pairing code is shown as soon as it is issued
             self.print_step("Initializing credential client...")
             self.client = CredentialClient(self.server_url)
+            self.client.set_pairing_code_callback(self._display_pairing_code)
 
             # Initiate pairing (this will block and poll)
             self.print_step("Initiating pairing with server...")
@@ -118,9 +85,6 @@ class PairingFlowTest(ManualTestBase):
             self.console.print()
             self.print_success("Session validated - PAKE exchange complete")
 
-            # Remove filter
-            credential_logger.removeFilter(capture.capture_from_log)
-
             return TestResult(
                 test_name=test_name,
                 status=TestStatus.PASSED,
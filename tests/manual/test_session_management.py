@@ -9,18 +9,18 @@ Usage:
 """
 import sys
 import time
-from tests.manual.base import ManualTestBase, TestResult, TestStatus
+from typing import Optional
+from tests.manual.base import ManualTestBase, TestContext, TestResult, TestStatus
 from src.sdk.credential_client import CredentialClient
-from src.models.credential_response import CredentialStatus
+from src.models.credential_response import CredentialErrorCode, CredentialStatus
 
 
 class SessionManagementTest(ManualTestBase):
     """Test class for session management validation."""
     
-    def __init__(self, server_url: str = "http://localhost:5000"):
+    def __init__(self, server_url: str = "http://localhost:5000", context: Optional[TestContext] = None):
         """Initialize session management test."""
-        super().__init__(server_url)
-        self.client: CredentialClient = None
+        super().__init__(server_url, context)
     
     def setup_pairing(self) -> TestResult:
         """Setup: Establish pairing for session tests."""
@@ -30,21 +30,21 @@ class SessionManagementTest(ManualTestBase):
         self.print_section("Setup: Establishing Session")
         
         try:
+            def show_pairing_code(pairing_code: str):
+                self._display_pairing_code(pairing_code)
+                self.print_action_required(
+                    f"Type in Terminal 1: [bold cyan]pair {pairing_code}[/bold cyan]\n"
+                    f"Then enter your Bitwarden master password."
+                )
+            
             self.client = CredentialClient(self.server_url)
-            pairing_code = self.client.pair(
+            self.client.set_pairing_code_callback(show_pairing_code)
+            self.client.pair(
                 agent_id="manual-test-003",
                 agent_name="Manual Test Agent - Session Mgmt",
                 timeout=120
             )
             
-            self.console.print()
-            self.console.print(f"[bold green]✓ PAIRING CODE: {pairing_code}[/bold green]")
-            
-            self.print_action_required(
-                f"Type in Terminal 1: [bold cyan]pair {pairing_code}[/bold cyan]\n"
-                f"Then enter your Bitwarden master password."
-            )
-            
             duration = time.time() - start_time
             self.print_success("Pairing successful")
             
@@ -190,7 +190,7 @@ class SessionManagementTest(ManualTestBase):
             
             # Should fail
             if response.status == CredentialStatus.ERROR:
-                if "Invalid or expired session" in response.error_message:
+                if response.error_code is CredentialErrorCode.INVALID_SESSION:
                     self.print_success("Session revocation worked!")
                     self.console.print(f"   Error (expected): {response.error_message}")
                     
@@ -239,17 +239,20 @@ class SessionManagementTest(ManualTestBase):
         self.print_success("Prerequisites met")
         self.wait_for_user("Ready to start? Press Enter...")
         
-        # Setup
-        result_setup = self.setup_pairing()
-        self.add_result(result_setup)
-        
-        if result_setup.status != TestStatus.PASSED:
-            self.print_error("Setup failed - cannot continue")
-            self.print_summary()
-            return 1
-        
-        self.console.print()
-        self.wait_for_user("Setup complete. Press Enter to continue...")
+        # Setup (unless a previous suite left a paired client)
+        if self.has_paired_client():
+            self.print_info(f"Reusing paired session {self.client.session_id}")
+        else:
+            result_setup = self.setup_pairing()
+            self.add_result(result_setup)
+            
+            if result_setup.status != TestStatus.PASSED:
+                self.print_error("Setup failed - cannot continue")
+                self.print_summary()
+                return 1
+            
+            self.console.print()
+            self.wait_for_user("Setup complete. Press Enter to continue...")
         
         # Test 1: List sessions
         result1 = self.test_list_sessions()
@@ -261,6 +264,8 @@ class SessionManagementTest(ManualTestBase):
             self.wait_for_user("Test 1 complete. Press Enter for revocation test...")
             result2 = self.test_session_revocation()
             self.add_result(result2)
+            # The session is gone either way; later suites must pair again
+            self.client = None
         
         # Print summary
         self.print_summary()
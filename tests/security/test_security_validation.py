@@ -8,32 +8,27 @@ These tests validate critical security properties:
 - PAKE protocol security
 """
 import pytest
+import datetime
 import logging
-import io
-from src.sdk.pake_handler import PAKEHandler
+from collections import Counter
+from unittest.mock import Mock, patch
 from src.sdk.credential_client import CredentialClient
+from src.sdk.pake_handler import PAKEHandler
+from src.server.pairing_manager import PairingManager, Session
+from src.utils import json_codec
 
 
 class TestEncryptionSecurity:
     """Test that sensitive data is properly encrypted."""
 
-    def test_credentials_never_plaintext_after_encryption(self):
+    def test_credentials_never_plaintext_after_encryption(self, pake_pair):
         """
         Verify that encrypted credentials don't contain plaintext.
 
         This is a basic sanity check - encrypted data should not reveal
         the original plaintext.
         """
-        password = "123456"
-
-        client = PAKEHandler(role="client")
-        server = PAKEHandler(role="server")
-
-        msg_a = client.start_exchange(password)
-        msg_b = server.start_exchange(password)
-
-        client.finish_exchange(msg_b)
-        server.finish_exchange(msg_a)
+        client, server = pake_pair
 
         # Test credential encryption
         plaintext_credential = '{"username": "testuser", "password": "SecretPass123"}'
@@ -59,30 +54,20 @@ class TestEncryptionSecurity:
         server = PAKEHandler(role="server")
         msg_b = server.start_exchange(password)
 
-        # Check protocol messages
-        assert password not in str(msg_a)
-        assert password not in str(msg_b)
-        assert password.encode('utf-8') not in msg_a
-        assert password.encode('utf-8') not in msg_b
-        assert password not in msg_a.hex()
-        assert password not in msg_b.hex()
+        # Check protocol messages as repr, raw bytes and hex
+        password_bytes = password.encode('utf-8')
+        for msg in (msg_a, msg_b):
+            assert password not in str(msg)
+            assert password_bytes not in msg
+            assert password not in msg.hex()
 
-    def test_encrypted_data_is_different_each_time(self):
+    def test_encrypted_data_is_different_each_time(self, pake_pair):
         """
         Verify that encrypting same data twice produces different ciphertext.
 
         This validates that encryption includes randomness (nonce/IV).
         """
-        password = "123456"
-
-        client = PAKEHandler(role="client")
-        server = PAKEHandler(role="server")
-
-        msg_a = client.start_exchange(password)
-        msg_b = server.start_exchange(password)
-
-        client.finish_exchange(msg_b)
-        server.finish_exchange(msg_a)
+        client, server = pake_pair
 
         plaintext = "same data"
         encrypted1 = client.encrypt(plaintext)
@@ -106,7 +91,6 @@ class TestLoggingSecurity:
         We can't access the internal _shared_key, but we can verify
         the log output doesn't contain key material.
         """
-        caplog.set_level(logging.DEBUG)
         password = "123456"
 
         client = PAKEHandler(role="client")
@@ -115,8 +99,10 @@ class TestLoggingSecurity:
         msg_a = client.start_exchange(password)
         msg_b = server.start_exchange(password)
 
-        client.finish_exchange(msg_b)
-        server.finish_exchange(msg_a)
+        # Key derivation happens here; capture only the handler's records
+        with caplog.at_level(logging.DEBUG, logger="src.sdk.pake_handler"):
+            client.finish_exchange(msg_b)
+            server.finish_exchange(msg_a)
 
         # Check all log messages
         log_text = caplog.text.lower()
@@ -132,11 +118,11 @@ class TestLoggingSecurity:
 
         Passwords used for PAKE should not appear in logs.
         """
-        caplog.set_level(logging.DEBUG)
         password = "SuperSecretPassword123"
 
         client = PAKEHandler(role="client")
-        msg_a = client.start_exchange(password)
+        with caplog.at_level(logging.DEBUG, logger="src.sdk.pake_handler"):
+            msg_a = client.start_exchange(password)
 
         # Check logs
         log_text = caplog.text
@@ -148,54 +134,69 @@ class TestLoggingSecurity:
 class TestReplayProtection:
     """Test replay attack protection mechanisms."""
 
-    def test_timestamp_validation_prevents_replay(self):
+    @pytest.mark.parametrize("age_seconds,expected_status", [(10, "denied"), (400, "error")])
+    @patch('src.server.pairing_manager.BitwardenCLI')
+    def test_timestamp_window_prevents_replay(
+        self, mock_cli_class, pake_pair, age_seconds, expected_status
+    ):
         """
-        Test that request timestamp validation prevents replay attacks.
+        Test that PairingManager rejects requests older than 5 minutes.
 
-        Note: This tests the timestamp mechanism in the request payload.
-        Actual replay protection would be tested at integration level.
+        A fresh request reaches the approval handler (which denies it); an
+        old one is rejected before the user is prompted.
         """
-        import datetime
-        import json
+        client, server = pake_pair
+        now = datetime.datetime.now(datetime.timezone.utc)
 
-        # Create a request payload with old timestamp
-        old_timestamp = datetime.datetime.utcnow() - datetime.timedelta(minutes=10)
-        payload = {
+        manager = PairingManager()
+        handler = Mock()
+        handler.handle_credential_request.return_value = {"approved": False}
+        manager.set_callback_handler(handler)
+        manager.active_sessions["sess_001"] = Session(
+            session_id="sess_001",
+            agent_id="agent-1",
+            agent_name="Agent 1",
+            pake_handler=server,
+            bitwarden_session_token="token1",
+            created_at=now,
+            last_access=now,
+            expires_at=now + datetime.timedelta(minutes=30)
+        )
+
+        sent_at = now - datetime.timedelta(seconds=age_seconds)
+        payload = client.encrypt(json_codec.dumpb({
             "domain": "example.com",
             "reason": "test",
-            "timestamp": old_timestamp.isoformat() + "Z",
+            "timestamp": sent_at.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
             "nonce": "abc123"
-        }
+        }))
 
-        # In real system, this would be validated by PairingManager
-        # Here we just test the timestamp check logic
-        timestamp = datetime.datetime.fromisoformat(payload['timestamp'].rstrip('Z'))
-        age = (datetime.datetime.utcnow() - timestamp).total_seconds()
+        result = manager.handle_credential_request("sess_001", payload)
 
-        # Should be rejected (>5 minutes old)
-        assert age > 300
+        assert result['status'] == expected_status
+        if expected_status == "error":
+            assert "too old" in result['error']
+            handler.handle_credential_request.assert_not_called()
 
-    def test_nonce_included_in_requests(self):
+    def test_nonce_included_in_requests(self, pake_pair):
         """
         Verify that requests include nonce for replay protection.
 
-        Each request should have a unique nonce.
+        Each request should have a unique nonce, across requests from one
+        client and across clients.
         """
-        import datetime
-        import secrets
-
-        # Simulate creating multiple requests
+        client_handler, server_handler = pake_pair
         nonces = []
-        for _ in range(10):
-            payload = {
-                "domain": "example.com",
-                "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
-                "nonce": secrets.token_hex(8)
-            }
-            nonces.append(payload["nonce"])
+        for _ in range(2):
+            client = CredentialClient()
+            client.pake_handler = client_handler
+            for _ in range(100):
+                encrypted = client._encrypt_request("aa.com", "Login", "agent-1", "Agent 1")
+                nonces.append(json_codec.loads(server_handler.decrypt(encrypted))["nonce"])
 
-        # All nonces should be unique
-        assert len(nonces) == len(set(nonces))
+        # All nonces should be present and unique
+        assert all(nonces)
+        assert len(set(nonces)) == 200
 
 
 class TestPAKESecurity:
@@ -269,56 +270,25 @@ class TestPAKESecurity:
 class TestDataProtection:
     """Test data protection mechanisms."""
 
-    def test_tampered_ciphertext_rejected(self):
+    @pytest.mark.parametrize("mutate", [
+        pytest.param(lambda c: c[:-5] + "XXXXX", id="tampered"),
+        pytest.param(lambda c: c[:len(c) // 2], id="truncated"),
+        pytest.param(lambda c: c[::-1], id="reversed"),
+        pytest.param(lambda c: "", id="empty"),
+    ])
+    def test_corrupted_ciphertext_rejected(self, pake_pair, mutate):
         """
-        Verify that tampered ciphertext is detected and rejected.
+        Verify that tampered or truncated ciphertext is rejected.
 
         Security property: Message authentication (integrity).
         """
-        password = "123456"
-
-        client = PAKEHandler(role="client")
-        server = PAKEHandler(role="server")
-
-        msg_a = client.start_exchange(password)
-        msg_b = server.start_exchange(password)
-
-        client.finish_exchange(msg_b)
-        server.finish_exchange(msg_a)
+        client, server = pake_pair
 
-        # Encrypt data
         encrypted = client.encrypt("sensitive data")
 
-        # Tamper with ciphertext (change last character)
-        tampered = encrypted[:-5] + "XXXXX"
-
         # Decryption should fail
         with pytest.raises(ValueError, match="Decryption failed"):
-            server.decrypt(tampered)
-
-    def test_truncated_ciphertext_rejected(self):
-        """
-        Verify that truncated ciphertext is rejected.
-        """
-        password = "123456"
-
-        client = PAKEHandler(role="client")
-        server = PAKEHandler(role="server")
-
-        msg_a = client.start_exchange(password)
-        msg_b = server.start_exchange(password)
-
-        client.finish_exchange(msg_b)
-        server.finish_exchange(msg_a)
-
-        encrypted = client.encrypt("data")
-
-        # Truncate ciphertext
-        truncated = encrypted[:len(encrypted)//2]
-
-        # Should fail
-        with pytest.raises(ValueError):
-            server.decrypt(truncated)
+            server.decrypt(mutate(encrypted))
 
 
 class TestSessionSecurity:
@@ -359,28 +329,23 @@ class TestSessionSecurity:
 
         Generate multiple codes and verify they don't follow a pattern.
         """
-        from src.server.pairing_manager import PairingManager
-
         manager = PairingManager()
-        codes = []
 
-        for _ in range(100):
-            code, _ = manager.create_pairing("test-agent", "Test")
-            codes.append(int(code))
+        # create_pairing() wraps the generator; check that once
+        code, _ = manager.create_pairing("test-agent", "Test")
+        assert code in manager.pending_pairings
 
-        # Check statistical properties
-        # 1. All codes should be 6 digits
-        assert all(100000 <= c <= 999999 for c in codes)
+        codes = [int(manager._generate_pairing_code()) for _ in range(100)]
+
+        # Check statistical properties in one pass: bucket by leading digit
+        buckets = Counter(c // 100000 for c in codes)
+
+        # 1. All codes should be 6 digits (leading digit 1-9)
+        assert all(1 <= bucket <= 9 for bucket in buckets)
 
         # 2. Should have good distribution (no obvious pattern)
-        # Not all in same range
-        ranges = {
-            "100k": sum(1 for c in codes if 100000 <= c < 200000),
-            "200k": sum(1 for c in codes if 200000 <= c < 300000),
-            "900k": sum(1 for c in codes if 900000 <= c < 1000000),
-        }
         # Should have codes in different ranges (not all clustered)
-        assert len([r for r in ranges.values() if r > 0]) >= 2
+        assert len(buckets) >= 2
 
         # 3. Should have high uniqueness
         unique_codes = len(set(codes))
@@ -390,35 +355,24 @@ class TestSessionSecurity:
 class TestErrorHandlingSecurity:
     """Test that error handling doesn't leak sensitive information."""
 
-    def test_decryption_errors_dont_leak_key_info(self):
+    def test_decryption_errors_dont_leak_key_info(self, pake_pair):
         """
         Verify that decryption errors don't reveal key information.
 
         Error messages should be generic, not specific about why decryption failed.
         """
-        password = "123456"
-
-        client = PAKEHandler(role="client")
-        server = PAKEHandler(role="server")
-
-        msg_a = client.start_exchange(password)
-        msg_b = server.start_exchange(password)
-
-        client.finish_exchange(msg_b)
-        server.finish_exchange(msg_a)
+        client, server = pake_pair
 
         encrypted = client.encrypt("data")
         tampered = encrypted[:-5] + "XXXXX"
 
-        try:
+        # Should indicate decryption failed
+        with pytest.raises(ValueError, match=r"(?i)decrypt|failed") as exc_info:
             server.decrypt(tampered)
-            assert False, "Should have raised exception"
-        except ValueError as e:
-            error_msg = str(e)
-            # Should not contain sensitive details
-            assert "key" not in error_msg.lower() or "wrong key" in error_msg.lower()
-            # Should indicate decryption failed
-            assert "decrypt" in error_msg.lower() or "failed" in error_msg.lower()
+
+        # Should not contain sensitive details
+        error_msg = str(exc_info.value).lower()
+        assert "key" not in error_msg or "wrong key" in error_msg
 
     def test_pake_failure_error_messages_generic(self):
         """
@@ -427,10 +381,6 @@ class TestErrorHandlingSecurity:
         client = PAKEHandler(role="client")
         client.start_exchange("123456")
 
-        try:
+        # Should mention PAKE or password, not internal details
+        with pytest.raises(ValueError, match=r"(?i)pake|password|invalid"):
             client.finish_exchange(b"invalid_message")
-            assert False, "Should have raised exception"
-        except ValueError as e:
-            error_msg = str(e).lower()
-            # Should mention PAKE or password, not internal details
-            assert "pake" in error_msg or "password" in error_msg or "invalid" in error_msg
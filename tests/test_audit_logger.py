@@ -0,0 +1,108 @@
+"""
+Unit tests for AuditLogger - batched background audit writes.
+
+Tests validate:
+- Events reach the audit file after flush()
+- Log line format
+- Batching does not reorder events
+- close() writes pending events and stops the writer
+"""
+from src.utils.audit_logger import AuditLogger
+
+
+class TestAuditLogger:
+    """Test audit event writing."""
+
+    def test_flush_writes_queued_events(self, tmp_path):
+        """Test that flush() blocks until queued events are on disk."""
+        log_file = tmp_path / "audit.log"
+        audit = AuditLogger(log_file=str(log_file))
+
+        audit.log_request("agent-1", "example.com", "testing")
+        audit.log_success("agent-1", "example.com")
+        audit.flush()
+
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == 2
+        assert "REQUEST | agent=agent-1 | domain=example.com | reason=testing" in lines[0]
+        assert "SUCCESS | agent=agent-1 | domain=example.com" in lines[1]
+
+    def test_log_line_format(self, tmp_path):
+        """Test that lines carry timestamp, level and message."""
+        log_file = tmp_path / "audit.log"
+        audit = AuditLogger(log_file=str(log_file))
+
+        audit.log_not_found("agent-1", "example.com")
+        audit.flush()
+
+        timestamp, level, message = log_file.read_text().strip().split(" | ", 2)
+        assert timestamp.endswith("Z")
+        assert level == "WARNING"
+        assert message == "NOT_FOUND | agent=agent-1 | domain=example.com"
+
+    def test_batched_events_keep_order(self, tmp_path):
+        """Test that events spanning several batches are written in order."""
+        log_file = tmp_path / "audit.log"
+        audit = AuditLogger(log_file=str(log_file), batch_size=4)
+
+        for i in range(10):
+            audit.log_denial(f"agent-{i}", "example.com")
+        audit.flush()
+
+        lines = log_file.read_text().splitlines()
+        assert [line.split("agent=")[1].split(" ")[0] for line in lines] == [
+            f"agent-{i}" for i in range(10)
+        ]
+
+    def test_error_message_truncated(self, tmp_path):
+        """Test that error messages are limited to 200 characters."""
+        log_file = tmp_path / "audit.log"
+        audit = AuditLogger(log_file=str(log_file))
+
+        audit.log_error("agent-1", "example.com", "x" * 500)
+        audit.flush()
+
+        assert "error=" + "x" * 200 + "\n" in log_file.read_text()
+
+    def test_full_queue_drops_and_counts_events(self, tmp_path):
+        """Test that events beyond queue capacity are dropped and counted."""
+        import threading
+        import time
+
+        log_file = tmp_path / "audit.log"
+        audit = AuditLogger(
+            log_file=str(log_file),
+            batch_size=1,
+            max_queue_size=2,
+            backpressure_timeout=0.01
+        )
+
+        # Stall the writer on its first batch
+        release = threading.Event()
+        original_write = audit._write_batch
+        audit._write_batch = lambda batch: (release.wait(), original_write(batch))
+
+        audit.log_denial("agent-0", "example.com")
+        while not audit._queue.empty():
+            time.sleep(0.001)
+
+        for i in range(1, 5):
+            audit.log_denial(f"agent-{i}", "example.com")
+
+        assert audit.dropped_count == 2
+
+        release.set()
+        audit.flush()
+        assert len(log_file.read_text().splitlines()) == 3
+
+    def test_close_writes_pending_events_and_stops_writer(self, tmp_path):
+        """Test that close() drains the queue, joins the writer and closes the file."""
+        log_file = tmp_path / "audit.log"
+        audit = AuditLogger(log_file=str(log_file))
+
+        audit.log_success("agent-1", "example.com")
+        audit.close()
+
+        assert not audit._writer.is_alive()
+        assert audit._file.closed
+        assert "SUCCESS | agent=agent-1" in log_file.read_text()
@@ -0,0 +1,54 @@
+"""
+Unit tests for the Bitwarden CLI backends.
+
+Tests validate:
+- The subprocess CLI is the default backend; bw serve is opt-in
+- A failed bw serve startup never leaves the child process running
+"""
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.utils.bitwarden_cli import BitwardenCLIError, BitwardenServeCLI, make_cli
+
+
+class TestMakeCli:
+    """Test backend selection."""
+
+    def test_defaults_to_subprocess_cli(self, monkeypatch):
+        """Test that bw serve is not started unless BW_SERVE=1."""
+        monkeypatch.delenv("BW_SERVE", raising=False)
+        with patch("src.utils.bitwarden_cli.BitwardenCLI") as cli_class, \
+                patch("src.utils.bitwarden_cli.BitwardenServeCLI") as serve_class:
+            assert make_cli() is cli_class.return_value
+
+        serve_class.assert_not_called()
+
+    def test_bw_serve_opt_in(self, monkeypatch):
+        """Test that BW_SERVE=1 selects the bw serve backend."""
+        monkeypatch.setenv("BW_SERVE", "1")
+        with patch("src.utils.bitwarden_cli.BitwardenServeCLI") as serve_class:
+            assert make_cli() is serve_class.return_value
+
+
+class TestServeStartup:
+    """Test bw serve startup failure handling."""
+
+    def test_slow_status_stops_child(self):
+        """Test that /status read timeouts end in an error and a stopped child."""
+        cli = BitwardenServeCLI.__new__(BitwardenServeCLI)
+        cli.cli_path = "bw"
+        cli.port = 8087
+        cli.base_url = "http://127.0.0.1:8087"
+        cli._http = Mock()
+        cli._http.get.side_effect = requests.exceptions.ReadTimeout()
+        proc = Mock()
+        proc.poll.return_value = None
+
+        with patch("src.utils.bitwarden_cli.subprocess.Popen", return_value=proc):
+            with pytest.raises(BitwardenCLIError):
+                cli._start_server(startup_timeout=0.05)
+
+        proc.terminate.assert_called_once()
+        assert cli._server_proc is None
@@ -0,0 +1,122 @@
+"""
+Unit tests for CredentialClient - session export and resume.
+
+Tests validate:
+- An exported session can be resumed by a new client without re-pairing
+- Resumed sessions send requests the server can decrypt
+- Resuming a session the server no longer holds fails cleanly
+"""
+import datetime
+import os
+from unittest.mock import MagicMock, Mock, patch
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+from src.models.credential_response import CredentialStatus
+from src.sdk.credential_client import CredentialClient
+from src.sdk.pake_handler import PAKEHandler
+from src.server import approval_server
+from src.server.pairing_manager import PairingManager, Session
+
+
+class _Response:
+    """The parts of requests.Response the client reads."""
+
+    def __init__(self, flask_response):
+        self.status_code = flask_response.status_code
+        self.content = flask_response.data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error")
+
+
+class _FlaskHTTP:
+    """requests.Session stand-in that sends calls to the Flask test client."""
+
+    def __init__(self):
+        self._client = approval_server.app.test_client()
+
+    def get(self, url, params=None, timeout=None):
+        return _Response(self._client.get(urlsplit(url).path, query_string=params))
+
+    def post(self, url, json=None, timeout=None):
+        return _Response(self._client.post(urlsplit(url).path, json=json))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def paired_client():
+    """Client holding a session on a fresh PairingManager behind the Flask app."""
+    manager = PairingManager()
+    cli = MagicMock()
+    cli.list_items.return_value = [
+        {"type": 1, "login": {"username": "user", "password": "pass"}}
+    ]
+    manager.set_cli(cli)
+    callback = Mock()
+    callback.handle_credential_request.return_value = {"approved": True}
+    manager.set_callback_handler(callback)
+
+    key = os.urandom(32)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    manager.active_sessions["sess_001"] = Session(
+        session_id="sess_001",
+        agent_id="agent-1",
+        agent_name="Agent 1",
+        pake_handler=PAKEHandler.from_key("server", key),
+        bitwarden_session_token="token1",
+        created_at=now,
+        last_access=now,
+        expires_at=now + datetime.timedelta(minutes=30)
+    )
+
+    client = CredentialClient()
+    client._http_session = _FlaskHTTP()
+    client.session_id = "sess_001"
+    client.pake_handler = PAKEHandler.from_key("client", key)
+
+    with patch.object(approval_server, "pairing_manager", manager):
+        yield client, manager
+
+
+def _resuming_client() -> CredentialClient:
+    """New client (as after a restart) talking to the same Flask app."""
+    client = CredentialClient()
+    client._http_session = _FlaskHTTP()
+    return client
+
+
+class TestResume:
+    """Test re-attaching to an exported session."""
+
+    def test_resumed_session_requests_credentials(self, paired_client):
+        """Test that export_session() then resume() gives a working session."""
+        client, _ = paired_client
+        session_id, shared_key = client.export_session()
+
+        resumed = _resuming_client()
+        assert resumed.resume(session_id, shared_key) is True
+
+        response = resumed.request_credential("aa.com", "Login", "agent-1", "Agent 1")
+
+        assert response.status == CredentialStatus.APPROVED
+        with response.credential as cred:
+            assert cred.username == "user"
+
+    def test_resume_unknown_session_fails(self, paired_client):
+        """Test that a session the server no longer holds is not resumed."""
+        client, manager = paired_client
+        session_id, shared_key = client.export_session()
+        manager.revoke_session(session_id)
+
+        resumed = _resuming_client()
+
+        assert resumed.resume(session_id, shared_key) is False
+        assert resumed.session_id is None
+        assert resumed.pake_handler is None
+        with pytest.raises(RuntimeError):
+            resumed.export_session()
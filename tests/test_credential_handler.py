@@ -0,0 +1,36 @@
+"""
+Unit tests for SecureCredential - credential container with cleanup.
+
+Tests validate:
+- Credential values are readable until cleared
+- clear() zeroes the underlying buffers in place
+"""
+import pytest
+
+from src.utils.credential_handler import SecureCredential
+
+
+class TestSecureCredential:
+    """Test credential storage and cleanup."""
+
+    def test_values_readable_until_cleared(self):
+        """Test that username and password round-trip and then raise."""
+        credential = SecureCredential("user@example.com", "pässword")
+
+        with credential as cred:
+            assert cred.username == "user@example.com"
+            assert cred.password == "pässword"
+
+        with pytest.raises(ValueError, match="cleared"):
+            credential.password
+
+    def test_clear_zeroes_buffers(self):
+        """Test that clear() overwrites the stored bytes with zeros."""
+        credential = SecureCredential("user", "secret")
+        username_buffer = credential._username
+        password_buffer = credential._password
+
+        credential.clear()
+
+        assert username_buffer == bytearray(len(b"user"))
+        assert password_buffer == bytearray(len(b"secret"))
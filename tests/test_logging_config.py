@@ -0,0 +1,60 @@
+"""
+Unit tests for logging configuration - sensitive data filter.
+
+Tests validate:
+- Messages with sensitive keywords are replaced
+- Sensitive values passed as args are caught
+- Ordinary messages pass through unchanged
+"""
+import logging
+
+from src.utils.logging_config import SensitiveDataFilter
+
+BLOCKED = "[BLOCKED: Message contained sensitive data]"
+
+
+def make_record(msg, *args):
+    """Build a log record for filtering."""
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args or None, None)
+
+
+class TestSensitiveDataFilter:
+    """Test blocking of sensitive log messages."""
+
+    def test_blocks_keyword_assignment_and_json_key(self):
+        """Test that key=value and "key" forms are blocked in any case."""
+        log_filter = SensitiveDataFilter()
+
+        for msg in ("Password=hunter2", '{"token": "abc"}', "got api_KEY=%s"):
+            record = make_record(msg, "x") if "%s" in msg else make_record(msg)
+            assert log_filter.filter(record)
+            assert record.getMessage() == BLOCKED
+
+    def test_blocks_sensitive_args(self):
+        """Test that keywords in args, or split across msg and args, are blocked."""
+        log_filter = SensitiveDataFilter()
+
+        for record in (
+            make_record("Request body: %s", '{"secret": "x"}'),
+            make_record("%s=%s", "password", "hunter2"),
+            make_record("Config %(cfg)s", {"cfg": "token=abc"}),
+        ):
+            assert log_filter.filter(record)
+            assert record.getMessage() == BLOCKED
+
+    def test_passes_ordinary_messages(self):
+        """Test that messages mentioning keywords without values pass."""
+        log_filter = SensitiveDataFilter()
+        record = make_record("Waiting for password input from %s", "user")
+
+        assert log_filter.filter(record)
+        assert record.getMessage() == "Waiting for password input from user"
+
+    def test_clean_record_is_formatted_once(self):
+        """Test that a passing record keeps its formatted message for handlers."""
+        log_filter = SensitiveDataFilter()
+        record = make_record("Loaded %d items for %s", 3, "aa.com")
+
+        assert log_filter.filter(record)
+        assert record.msg == "Loaded 3 items for aa.com"
+        assert record.args is None
@@ -8,41 +8,100 @@ Tests validate:
 - PAKE exchange coordination
 """
 import pytest
+import dataclasses
 import datetime
+import json
 import base64
+import time
 from unittest.mock import Mock, patch, MagicMock
-from src.server.pairing_manager import PairingManager, PairingState, Session
+from src.server.pairing_manager import PairingManager, PairingState, Session, _parse_ts
 from src.sdk.pake_handler import PAKEHandler
+from src.utils.bitwarden_cli import BitwardenCLIError
+from src.utils.session_cache import SessionCache
+
+
+def _b64(data: bytes) -> str:
+    """Base64-encode a PAKE message the way the SDK sends it."""
+    return base64.b64encode(data).decode('ascii')
+
+
+class _FakePAKE:
+    """Ready PAKE handler stand-in whose decrypt always fails."""
+
+    def is_ready(self):
+        return True
+
+    def decrypt(self, encrypted_data):
+        raise ValueError("Decryption failed")
+
+    def wipe(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def mock_cli_class():
+    """Patch BitwardenCLI for every test so no test reaches the real bw CLI."""
+    with patch('src.server.pairing_manager.BitwardenCLI') as cli_class:
+        yield cli_class
+
+
+@pytest.fixture
+def fake_pake():
+    """PAKE handler stub for session tests that never decrypt successfully."""
+    return _FakePAKE()
+
+
+@pytest.fixture
+def manager_with_session():
+    """PairingManager holding one active 30-minute session."""
+    manager = PairingManager()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    manager.active_sessions["sess_001"] = Session(
+        session_id="sess_001",
+        agent_id="agent-1",
+        agent_name="Agent 1",
+        pake_handler=Mock(),
+        bitwarden_session_token="token1",
+        created_at=now,
+        last_access=now,
+        expires_at=now + datetime.timedelta(minutes=30)
+    )
+    return manager, "sess_001"
+
+
+@pytest.fixture
+def fresh_pairing():
+    """One create_pairing() call with a callback handler registered."""
+    manager = PairingManager()
+    callback = Mock()
+    manager.set_callback_handler(callback)
+    pairing_code, expires_at = manager.create_pairing("test-001", "Test Agent")
+    return manager, callback, pairing_code, expires_at
 
 
 class TestPairingCreation:
     """Test pairing code generation and initialization."""
 
-    def test_create_pairing_generates_6_digit_code(self):
+    def test_create_pairing_generates_6_digit_code(self, fresh_pairing):
         """Test that pairing codes are 6-digit numbers."""
-        manager = PairingManager()
-        pairing_code, expires_at = manager.create_pairing("test-agent", "Test Agent")
+        _, _, pairing_code, _ = fresh_pairing
 
         # Verify code is 6 digits
         assert pairing_code.isdigit()
         assert len(pairing_code) == 6
         assert 100000 <= int(pairing_code) <= 999999
 
-    def test_create_pairing_sets_expiration(self):
+    def test_create_pairing_sets_expiration(self, fresh_pairing):
         """Test that pairing has correct expiration time (5 minutes)."""
-        manager = PairingManager()
-        before = datetime.datetime.utcnow()
-        pairing_code, expires_at = manager.create_pairing("test-agent", "Test Agent")
-        after = datetime.datetime.utcnow()
+        manager, _, pairing_code, expires_at = fresh_pairing
 
-        # Expires in ~5 minutes from now
-        expected_expiry = before + datetime.timedelta(minutes=5)
-        assert abs((expires_at - expected_expiry).total_seconds()) < 2
+        # Expires 5 minutes after creation (no second clock read needed)
+        created_at = manager.pending_pairings[pairing_code].created_at
+        assert expires_at - created_at == datetime.timedelta(minutes=5)
 
-    def test_create_pairing_stores_agent_info(self):
+    def test_create_pairing_stores_agent_info(self, fresh_pairing):
         """Test that pairing stores agent metadata."""
-        manager = PairingManager()
-        pairing_code, _ = manager.create_pairing("test-001", "Test Agent")
+        manager, _, pairing_code, _ = fresh_pairing
 
         pairing = manager.pending_pairings[pairing_code]
         assert pairing.agent_id == "test-001"
@@ -50,13 +109,9 @@ class TestPairingCreation:
         assert pairing.pairing_code == pairing_code
         assert not pairing.user_entered
 
-    def test_create_pairing_calls_callback(self):
+    def test_create_pairing_calls_callback(self, fresh_pairing):
         """Test that callback handler is notified of new pairing."""
-        manager = PairingManager()
-        callback = Mock()
-        manager.set_callback_handler(callback)
-
-        pairing_code, _ = manager.create_pairing("test-agent", "Test Agent")
+        _, callback, pairing_code, _ = fresh_pairing
 
         callback.on_pairing_created.assert_called_once()
         call_args = callback.on_pairing_created.call_args[0][0]
@@ -67,7 +122,6 @@ class TestPairingCreation:
 class TestVaultUnlock:
     """Test vault unlock during pairing phase."""
 
-    @patch('src.server.pairing_manager.BitwardenCLI')
     def test_mark_user_entered_code_unlocks_vault(self, mock_cli_class):
         """Test that marking code as entered unlocks vault and stores token."""
         # Setup mock
@@ -97,15 +151,14 @@ class TestVaultUnlock:
 
         assert not success
 
-    @patch('src.server.pairing_manager.BitwardenCLI')
-    def test_mark_user_entered_code_expired(self, mock_cli_class):
+    def test_mark_user_entered_code_expired(self):
         """Test that expired pairing code is rejected."""
         manager = PairingManager()
         pairing_code, _ = manager.create_pairing("test-agent", "Test Agent")
 
         # Manually expire the pairing
         pairing = manager.pending_pairings[pairing_code]
-        pairing.expires_at = datetime.datetime.utcnow() - datetime.timedelta(minutes=1)
+        pairing.expires_at = pairing.created_at - datetime.timedelta(seconds=1)
 
         success = manager.mark_user_entered_code(pairing_code, "password")
 
@@ -113,7 +166,6 @@ class TestVaultUnlock:
         # Expired pairing should be removed
         assert pairing_code not in manager.pending_pairings
 
-    @patch('src.server.pairing_manager.BitwardenCLI')
     def test_mark_user_entered_code_vault_unlock_fails(self, mock_cli_class):
         """Test that vault unlock failure is handled gracefully."""
         mock_cli = MagicMock()
@@ -131,8 +183,7 @@ class TestVaultUnlock:
 class TestPAKEExchange:
     """Test PAKE protocol message exchange."""
 
-    @patch('src.server.pairing_manager.BitwardenCLI')
-    def test_exchange_pake_message_waiting_for_user(self, mock_cli_class):
+    def test_exchange_pake_message_waiting_for_user(self):
         """Test exchange returns waiting status when user hasn't entered code."""
         manager = PairingManager()
         pairing_code, _ = manager.create_pairing("test-agent", "Test Agent")
@@ -142,7 +193,6 @@ class TestPAKEExchange:
 
         assert result['status'] == 'waiting'
 
-    @patch('src.server.pairing_manager.BitwardenCLI')
     def test_exchange_pake_message_completes_exchange(self, mock_cli_class):
         """Test complete PAKE exchange and session creation."""
         # Setup vault mock
@@ -162,7 +212,7 @@ class TestPAKEExchange:
         # Agent starts PAKE exchange
         client = PAKEHandler(role="client")
         msg_out_a = client.start_exchange(password)
-        msg_out_a_b64 = base64.b64encode(msg_out_a).decode('utf-8')
+        msg_out_a_b64 = _b64(msg_out_a)
 
         # Server processes exchange
         result = manager.exchange_pake_message(pairing_code, msg_out_a_b64)
@@ -185,6 +235,29 @@ class TestPAKEExchange:
         # Pairing should be removed (one-time use)
         assert pairing_code not in manager.pending_pairings
 
+    def test_exchange_reuses_early_server_message(self):
+        """Test that an agent can derive the key from the early SPAKE2_B message."""
+        manager = PairingManager()
+        pairing_code, _ = manager.create_pairing("test-agent", "Test Agent")
+        manager.mark_user_entered_code(pairing_code, session_token="vault_token_123")
+
+        # Server message sent with the "ready" event, before the agent's message
+        early_msg_b = manager.start_server_exchange(pairing_code)
+        assert manager.start_server_exchange(pairing_code) == early_msg_b
+
+        client = PAKEHandler(role="client")
+        msg_out_a = client.start_exchange(pairing_code)
+        client.finish_exchange(base64.b64decode(early_msg_b))
+
+        result = manager.exchange_pake_message(
+            pairing_code, _b64(msg_out_a)
+        )
+
+        assert result['status'] == 'success'
+        assert result['pake_message'] == early_msg_b
+        session = manager.active_sessions[result['session_id']]
+        assert session.pake_handler.decrypt(client.encrypt("hello")) == "hello"
+
     def test_exchange_pake_message_invalid_code(self):
         """Test exchange with invalid pairing code."""
         manager = PairingManager()
@@ -194,15 +267,14 @@ class TestPAKEExchange:
         assert result['status'] == 'error'
         assert 'Invalid pairing code' in result['error']
 
-    @patch('src.server.pairing_manager.BitwardenCLI')
-    def test_exchange_pake_message_expired_code(self, mock_cli_class):
+    def test_exchange_pake_message_expired_code(self):
         """Test exchange with expired pairing code."""
         manager = PairingManager()
         pairing_code, _ = manager.create_pairing("test-agent", "Test Agent")
 
         # Expire the pairing
         pairing = manager.pending_pairings[pairing_code]
-        pairing.expires_at = datetime.datetime.utcnow() - datetime.timedelta(minutes=1)
+        pairing.expires_at = pairing.created_at - datetime.timedelta(seconds=1)
 
         result = manager.exchange_pake_message(pairing_code, "fake_message")
 
@@ -210,59 +282,93 @@ class TestPAKEExchange:
         assert 'expired' in result['error'].lower()
 
 
-class TestSessionManagement:
-    """Test session lifecycle and management."""
+class TestWaitForUserEntry:
+    """Test blocking wait used by the pairing event stream."""
 
-    def test_active_session_count(self):
-        """Test session count tracking."""
+    def test_wait_returns_true_after_code_entered(self):
+        """Test that waiters are released once the user enters the code."""
         manager = PairingManager()
+        pairing_code, _ = manager.create_pairing("test-agent", "Test Agent")
 
-        assert manager.active_session_count() == 0
+        assert manager.wait_for_user_entry(pairing_code, 0) is False
 
-        # Manually create sessions for testing
-        session1 = Session(
-            session_id="sess_001",
-            agent_id="agent-1",
-            agent_name="Agent 1",
-            pake_handler=Mock(),
-            bitwarden_session_token="token1",
-            created_at=datetime.datetime.utcnow(),
-            last_access=datetime.datetime.utcnow(),
-            expires_at=datetime.datetime.utcnow() + datetime.timedelta(minutes=30)
-        )
-        manager.active_sessions["sess_001"] = session1
+        manager.mark_user_entered_code(pairing_code, session_token="vault_token_123")
+
+        assert manager.wait_for_user_entry(pairing_code, 0) is True
+
+    def test_wait_invalid_or_expired_code(self):
+        """Test that unknown and expired codes return None."""
+        manager = PairingManager()
+        pairing_code, _ = manager.create_pairing("test-agent", "Test Agent")
+        pairing = manager.pending_pairings[pairing_code]
+        pairing.expires_at = pairing.created_at - datetime.timedelta(seconds=1)
+
+        assert manager.wait_for_user_entry("999999", 0) is None
+        assert manager.wait_for_user_entry(pairing_code, 0) is None
 
+
+class TestSessionManagement:
+    """Test session lifecycle and management."""
+
+    def test_active_session_count(self, manager_with_session):
+        """Test session count tracking."""
+        manager, _ = manager_with_session
+
+        assert PairingManager().active_session_count() == 0
         assert manager.active_session_count() == 1
 
-    @patch('src.server.pairing_manager.BitwardenCLI')
-    def test_revoke_session_locks_vault(self, mock_cli_class):
+    def test_revoke_session_locks_vault(self, mock_cli_class, manager_with_session):
         """Test that revoking session locks the vault."""
         mock_cli = MagicMock()
         mock_cli_class.return_value = mock_cli
-
-        manager = PairingManager()
-
-        # Create a session
-        session = Session(
-            session_id="sess_001",
-            agent_id="agent-1",
-            agent_name="Agent 1",
-            pake_handler=Mock(),
-            bitwarden_session_token="token1",
-            created_at=datetime.datetime.utcnow(),
-            last_access=datetime.datetime.utcnow(),
-            expires_at=datetime.datetime.utcnow() + datetime.timedelta(minutes=30)
-        )
-        manager.active_sessions["sess_001"] = session
+        manager, session_id = manager_with_session
 
         # Revoke session
-        manager.revoke_session("sess_001")
+        manager.revoke_session(session_id)
 
         # Verify vault locked
         mock_cli.lock.assert_called_once()
 
         # Session should be removed
-        assert "sess_001" not in manager.active_sessions
+        assert session_id not in manager.active_sessions
+
+    def test_revoke_session_drops_shared_session_key(self, manager_with_session):
+        """Test that revoking locks through the shared session cache."""
+        manager, session_id = manager_with_session
+        cli = Mock()
+        session_cache = Mock()
+        manager.set_cli(cli, session_cache)
+
+        manager.revoke_session(session_id)
+
+        session_cache.lock.assert_called_once()
+        cli.lock.assert_not_called()
+
+    def test_revoke_session_clears_every_item_cache(self, manager_with_session):
+        """Test that locking the shared vault purges all sessions' cached items."""
+        manager, session_id = manager_with_session
+        other = dataclasses.replace(
+            manager.active_sessions[session_id],
+            session_id="sess_002",
+            item_cache={"aa.com": (time.monotonic(), [{"type": 1}])}
+        )
+        manager.active_sessions["sess_002"] = other
+
+        manager.revoke_session(session_id)
+
+        assert other.item_cache == {}
+
+    def test_session_cache_lock_clears_item_caches(self, manager_with_session):
+        """Test that a lock or expiry in the shared SessionCache purges cached items."""
+        manager, session_id = manager_with_session
+        session_cache = SessionCache(Mock(), Mock(), ttl=60)
+        manager.set_cli(session_cache.cli, session_cache)
+        session = manager.active_sessions[session_id]
+        session.item_cache["aa.com"] = (time.monotonic(), [{"type": 1}])
+
+        session_cache.lock()
+
+        assert session.item_cache == {}
 
     def test_revoke_nonexistent_session(self):
         """Test revoking nonexistent session doesn't crash."""
@@ -271,44 +377,58 @@ class TestSessionManagement:
         # Should not raise exception
         manager.revoke_session("nonexistent")
 
-    def test_get_session_status(self):
+    def test_get_session_status(self, manager_with_session):
         """Test getting session status."""
-        manager = PairingManager()
-
-        now = datetime.datetime.utcnow()
-        session = Session(
-            session_id="sess_001",
-            agent_id="agent-1",
-            agent_name="Agent 1",
-            pake_handler=Mock(),
-            bitwarden_session_token="token1",
-            created_at=now,
-            last_access=now,
-            expires_at=now + datetime.timedelta(minutes=30)
-        )
-        manager.active_sessions["sess_001"] = session
+        manager, session_id = manager_with_session
 
-        status = manager.get_session_status("sess_001")
+        status = manager.get_session_status(session_id)
 
         assert status is not None
         assert status['active'] is True
         assert 'last_access' in status
         assert 'expires_at' in status
 
-    def test_get_session_status_nonexistent(self):
+    def test_get_session_status_nonexistent(self, manager_with_session):
         """Test getting status of nonexistent session."""
-        manager = PairingManager()
+        manager, _ = manager_with_session
 
         status = manager.get_session_status("nonexistent")
 
         assert status is None
 
+    def test_session_cap_evicts_least_recently_used(self, mock_cli_class):
+        """Test that exceeding the session cap drops the oldest session."""
+        mock_cli_class.return_value.unlock.return_value = "vault_token_123"
+        manager = PairingManager()
+        manager._max_sessions = 1
+        now = datetime.datetime.now(datetime.timezone.utc)
+        old_handler = Mock()
+        manager.active_sessions["sess_old"] = Session(
+            session_id="sess_old",
+            agent_id="agent-1",
+            agent_name="Agent 1",
+            pake_handler=old_handler,
+            bitwarden_session_token="token1",
+            created_at=now,
+            last_access=now,
+            expires_at=now + datetime.timedelta(minutes=30)
+        )
+
+        pairing_code, _ = manager.create_pairing("test-agent", "Test Agent")
+        manager.mark_user_entered_code(pairing_code, "master_password")
+        msg_out_a = PAKEHandler(role="client").start_exchange(pairing_code)
+        result = manager.exchange_pake_message(pairing_code, _b64(msg_out_a))
+
+        assert list(manager.active_sessions) == [result['session_id']]
+        old_handler.wipe.assert_called_once()
+        # The vault is shared with the new session and must stay unlocked
+        mock_cli_class.return_value.lock.assert_not_called()
+
 
 class TestCredentialRequest:
     """Test credential request handling."""
 
-    @patch('src.server.pairing_manager.BitwardenCLI')
-    def test_handle_credential_request_invalid_session(self, mock_cli_class):
+    def test_handle_credential_request_invalid_session(self):
         """Test credential request with invalid session."""
         manager = PairingManager()
 
@@ -316,22 +436,23 @@ class TestCredentialRequest:
 
         assert result['status'] == 'error'
         assert 'Invalid or expired session' in result['error']
+        assert result['code'] == 'invalid_session'
 
-    @patch('src.server.pairing_manager.BitwardenCLI')
-    def test_handle_credential_request_expired_session(self, mock_cli_class):
+    def test_handle_credential_request_expired_session(self, fake_pake):
         """Test credential request with expired session."""
         manager = PairingManager()
 
         # Create expired session
+        now = datetime.datetime.now(datetime.timezone.utc)
         session = Session(
             session_id="sess_001",
             agent_id="agent-1",
             agent_name="Agent 1",
-            pake_handler=Mock(spec=PAKEHandler),
+            pake_handler=fake_pake,
             bitwarden_session_token="token1",
-            created_at=datetime.datetime.utcnow() - datetime.timedelta(hours=1),
-            last_access=datetime.datetime.utcnow() - datetime.timedelta(hours=1),
-            expires_at=datetime.datetime.utcnow() - datetime.timedelta(minutes=1)
+            created_at=now - datetime.timedelta(hours=1),
+            last_access=now - datetime.timedelta(hours=1),
+            expires_at=now - datetime.timedelta(minutes=1)
         )
         manager.active_sessions["sess_001"] = session
 
@@ -339,27 +460,25 @@ class TestCredentialRequest:
 
         assert result['status'] == 'error'
         assert 'Session expired' in result['error']
+        assert result['code'] == 'expired_session'
         # Expired session should be removed
         assert "sess_001" not in manager.active_sessions
 
-    @patch('src.server.pairing_manager.BitwardenCLI')
-    def test_handle_credential_request_decryption_fails(self, mock_cli_class):
+    def test_handle_credential_request_decryption_fails(self, fake_pake):
         """Test credential request with invalid encrypted payload."""
         manager = PairingManager()
 
-        # Create valid session with mock PAKE handler
-        mock_pake = Mock(spec=PAKEHandler)
-        mock_pake.decrypt.side_effect = ValueError("Decryption failed")
-
+        # Create valid session with a PAKE handler that fails to decrypt
+        now = datetime.datetime.now(datetime.timezone.utc)
         session = Session(
             session_id="sess_001",
             agent_id="agent-1",
             agent_name="Agent 1",
-            pake_handler=mock_pake,
+            pake_handler=fake_pake,
             bitwarden_session_token="token1",
-            created_at=datetime.datetime.utcnow(),
-            last_access=datetime.datetime.utcnow(),
-            expires_at=datetime.datetime.utcnow() + datetime.timedelta(minutes=30)
+            created_at=now,
+            last_access=now,
+            expires_at=now + datetime.timedelta(minutes=30)
         )
         manager.active_sessions["sess_001"] = session
 
@@ -367,3 +486,108 @@ class TestCredentialRequest:
 
         assert result['status'] == 'error'
         assert 'Decryption failed' in result['error']
+
+    def _approved_request(self, manager, mock_cli_class, approval_result):
+        """Run an approved credential request through a mocked vault."""
+        mock_cli = MagicMock()
+        mock_cli.list_items.return_value = [
+            {"type": 1, "login": {"username": "user", "password": "pass"}}
+        ]
+        mock_cli_class.return_value = mock_cli
+
+        callback = Mock()
+        callback.handle_credential_request.return_value = approval_result
+        manager.set_callback_handler(callback)
+
+        mock_pake = Mock(spec=PAKEHandler)
+        mock_pake.decrypt.return_value = json.dumps({
+            "domain": "aa.com",
+            "reason": "Login",
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat()
+        })
+        mock_pake.encrypt.return_value = "encrypted_cred"
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        manager.active_sessions["sess_001"] = Session(
+            session_id="sess_001",
+            agent_id="agent-1",
+            agent_name="Agent 1",
+            pake_handler=mock_pake,
+            bitwarden_session_token="token1",
+            created_at=now,
+            last_access=now,
+            expires_at=now + datetime.timedelta(minutes=30)
+        )
+
+        result = manager.handle_credential_request("sess_001", "encrypted_payload")
+        return result, mock_cli
+
+    def test_handle_credential_request_looks_up_vault_once(self, mock_cli_class):
+        """Test that an approved request searches the vault once with the session token."""
+        manager = PairingManager()
+
+        result, mock_cli = self._approved_request(manager, mock_cli_class, {"approved": True})
+
+        assert result['status'] == 'approved'
+        mock_cli.list_items.assert_called_once_with("aa.com", "token1")
+
+    def test_denied_request_never_reads_vault(self, mock_cli_class):
+        """Test that no vault lookup runs before or after a denial."""
+        manager = PairingManager()
+
+        result, mock_cli = self._approved_request(manager, mock_cli_class, {"approved": False})
+
+        assert result['status'] == 'denied'
+        mock_cli.list_items.assert_not_called()
+
+    def test_handle_credential_request_uses_refreshed_token(self, mock_cli_class):
+        """Test that a token refreshed during approval is used for the lookup."""
+        manager = PairingManager()
+
+        result, mock_cli = self._approved_request(
+            manager, mock_cli_class, {"approved": True, "session_token": "token2"}
+        )
+
+        assert result['status'] == 'approved'
+        mock_cli.list_items.assert_called_once_with("aa.com", "token2")
+
+    def test_repeat_request_uses_item_cache(self, mock_cli_class):
+        """Test that a repeat request within the TTL skips the vault lookup."""
+        manager = PairingManager()
+
+        self._approved_request(manager, mock_cli_class, {"approved": True})
+        result = manager.handle_credential_request("sess_001", "encrypted_payload")
+
+        assert result['status'] == 'approved'
+        mock_cli_class.return_value.list_items.assert_called_once()
+
+
+    def test_stale_session_token_retried_once(self, mock_cli_class):
+        """Test that a rejected vault token is replaced from the session cache."""
+        manager = PairingManager()
+        shared_cli = MagicMock()
+        shared_cli.list_items.side_effect = [
+            BitwardenCLIError("Vault is locked."),
+            [{"type": 1, "login": {"username": "user", "password": "pass"}}]
+        ]
+        session_cache = Mock()
+        session_cache.get_session_key.return_value = "token2"
+        manager.set_cli(shared_cli, session_cache)
+
+        result, _ = self._approved_request(manager, mock_cli_class, {"approved": True})
+
+        assert result['status'] == 'approved'
+        session_cache.invalidate.assert_called_once()
+        shared_cli.list_items.assert_called_with("aa.com", "token2")
+        assert manager.active_sessions["sess_001"].bitwarden_session_token == "token2"
+
+
+class TestTimestampParsing:
+    """Test request timestamp parsing."""
+
+    def test_client_layout_and_isoformat_agree(self):
+        """Test that the fixed-layout fast path matches fromisoformat()."""
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        assert _parse_ts(now.strftime("%Y-%m-%dT%H:%M:%S.%fZ")) == now
+        assert _parse_ts(now.isoformat()) == now
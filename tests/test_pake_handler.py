@@ -10,10 +10,54 @@ Test Coverage:
 - TC1.3: PAKE messages are protocol messages, not keys
 - Additional edge cases and error handling
 """
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+
 import pytest
 from src.sdk.pake_handler import PAKEHandler
 
 
+def _paired(password: str = "123456") -> Tuple[PAKEHandler, PAKEHandler]:
+    """Run a full exchange and return the ready (client, server) handlers."""
+    client = PAKEHandler(role="client")
+    server = PAKEHandler(role="server")
+    msg_a = client.start_exchange(password)
+    msg_b = server.start_exchange(password)
+    client.finish_exchange(msg_b)
+    server.finish_exchange(msg_a)
+    return client, server
+
+
+class _FakeSPAKE2:
+    """SPAKE2 stand-in with fixed messages and key (no curve arithmetic)."""
+
+    def __init__(self, password):
+        self.password = password
+
+    def start(self):
+        return b"\x00" * 33
+
+    def finish(self, msg_in):
+        return b"\x11" * 32
+
+
+@pytest.fixture
+def fake_spake2(monkeypatch):
+    """Replace SPAKE2 for tests that only exercise PAKEHandler's state checks."""
+    monkeypatch.setattr("spake2.SPAKE2_A", _FakeSPAKE2)
+    monkeypatch.setattr("spake2.SPAKE2_B", _FakeSPAKE2)
+
+
+@pytest.fixture(scope="module")
+def started_pair():
+    """Client and server after start_exchange only, with their messages (shared per module)."""
+    client = PAKEHandler(role="client")
+    server = PAKEHandler(role="server")
+    return client, server, client.start_exchange("123456"), server.start_exchange("123456")
+
+
+@pytest.mark.crypto
 class TestPAKEKeyDerivation:
     """Test PAKE protocol key derivation (TC1.1)."""
 
@@ -43,7 +87,7 @@ class TestPAKEKeyDerivation:
         assert server_handler.is_ready()
 
         # Encrypt/decrypt test - verify keys are identical
-        plaintext = "test message"
+        plaintext = '{"domain": "example.com", "username": "test"}'
         encrypted = client_handler.encrypt(plaintext)
         decrypted = server_handler.decrypt(encrypted)
 
@@ -56,27 +100,30 @@ class TestPAKEKeyDerivation:
 
         assert decrypted2 == plaintext2
 
-    def test_pake_with_6_digit_pairing_code(self):
-        """Test PAKE works with realistic 6-digit pairing codes."""
-        pairing_code = "847293"
+    def test_finish_in_process_pool(self):
+        """Test that finishing in a worker process derives the same key."""
+        client_handler = PAKEHandler(role="client")
+        server_handler = PAKEHandler(role="server")
+        msg_out_a = client_handler.start_exchange("123456")
+        msg_out_b = server_handler.start_exchange("123456")
 
-        client = PAKEHandler(role="client")
-        server = PAKEHandler(role="server")
+        client_handler.finish_exchange(msg_out_b)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            server_handler.finish_exchange(msg_out_a, executor=executor)
 
-        msg_a = client.start_exchange(pairing_code)
-        msg_b = server.start_exchange(pairing_code)
+        assert server_handler.decrypt(client_handler.encrypt("secret")) == "secret"
 
-        client.finish_exchange(msg_b)
-        server.finish_exchange(msg_a)
+    def test_from_key_resumes_session(self):
+        """Test that a handler rebuilt from an exported key interoperates."""
+        client_handler, server_handler = _paired()
 
-        # Verify encryption/decryption works
-        test_data = '{"domain": "example.com", "username": "test"}'
-        encrypted = client.encrypt(test_data)
-        decrypted = server.decrypt(encrypted)
+        resumed = PAKEHandler.from_key("client", client_handler.export_key())
 
-        assert decrypted == test_data
+        assert resumed.is_ready()
+        assert server_handler.decrypt(resumed.encrypt("secret")) == "secret"
 
 
+@pytest.mark.crypto
 class TestPAKEWrongPassword:
     """Test PAKE failure with wrong password (TC1.2)."""
 
@@ -116,20 +163,9 @@ class TestPAKEWrongPassword:
         Even if both sides complete the exchange (shouldn't happen in practice),
         they would have different keys and decryption would fail.
         """
-        # Create two separate PAKE exchanges with different passwords
-        client1 = PAKEHandler(role="client")
-        server1 = PAKEHandler(role="server")
-        msg_a1 = client1.start_exchange("password1")
-        msg_b1 = server1.start_exchange("password1")
-        client1.finish_exchange(msg_b1)
-        server1.finish_exchange(msg_a1)
-
-        client2 = PAKEHandler(role="client")
-        server2 = PAKEHandler(role="server")
-        msg_a2 = client2.start_exchange("password2")
-        msg_b2 = server2.start_exchange("password2")
-        client2.finish_exchange(msg_b2)
-        server2.finish_exchange(msg_a2)
+        # Two full exchanges, each with its own password
+        client1, _ = _paired("123456")
+        _, server2 = _paired("password2")
 
         # Encrypt with first pair's client
         plaintext = "secret data"
@@ -140,60 +176,54 @@ class TestPAKEWrongPassword:
             server2.decrypt(encrypted)
 
 
+@pytest.mark.crypto
 class TestPAKEMessagesNotKeys:
     """Test that PAKE messages are protocol messages, not keys (TC1.3)."""
 
-    def test_pake_messages_are_not_keys(self):
+    def test_pake_messages_are_not_keys(self, started_pair):
         """
         TC1.3: Verify PAKE messages are not valid encryption keys.
 
         This validates the educational goal: the messages exchanged are
         public protocol elements, not the shared secret itself.
         """
-        client = PAKEHandler(role="client")
-        msg_a = client.start_exchange("123456")
+        client, _, msg_a, _ = started_pair
 
         # PAKE message should be bytes (public element)
         assert isinstance(msg_a, bytes)
         assert len(msg_a) > 0
 
-        # Message should not be a valid Fernet key
-        # Fernet keys are 44 bytes base64-encoded (32 bytes raw + padding)
-        # PAKE messages are different length
-        assert len(msg_a) != 32  # Not raw key length
+        # Message should not be usable as the AES-256-GCM session key:
+        # it is a SPAKE2 element (1 side byte + 32-byte Ed25519 point),
+        # never the 32-byte key derived from it
+        assert len(msg_a) == 33
+        assert len(msg_a) != 32  # Not AES-256 key length
 
         # Client should NOT be ready for encryption yet
         assert not client.is_ready()
 
-    def test_messages_transmitted_not_derived_keys(self):
+    def test_messages_transmitted_not_derived_keys(self, started_pair):
         """
         Verify that the messages transmitted are different from the derived keys.
 
         Educational: This demonstrates that eavesdropping the protocol messages
         does not reveal the shared secret.
         """
-        password = "123456"
-
-        client = PAKEHandler(role="client")
-        msg_a = client.start_exchange(password)
-
-        server = PAKEHandler(role="server")
-        msg_b = server.start_exchange(password)
-
-        # Complete exchanges
-        client.finish_exchange(msg_b)
-        server.finish_exchange(msg_a)
+        _, _, msg_a, msg_b = started_pair
 
         # The messages transmitted (msg_a, msg_b) are different from the keys
         # We can't directly access _shared_key, but we can verify behavior:
         # If messages were keys, we could use them directly for encryption
         # Instead, we need the full PAKE exchange
+        assert msg_a != msg_b
 
         # Create another client that tries to use message as key
         client2 = PAKEHandler(role="client")
         # This client has msg_a and msg_b but hasn't done PAKE exchange
         # It should NOT be able to decrypt data encrypted by client/server
         assert not client2.is_ready()
+        with pytest.raises(RuntimeError):
+            client2.encrypt("secret")
 
 
 class TestPAKEErrorHandling:
@@ -204,6 +234,12 @@ class TestPAKEErrorHandling:
         with pytest.raises(ValueError, match="Role must be"):
             PAKEHandler(role="invalid")
 
+    def test_different_roles_have_correct_attributes(self):
+        """Test that client (SPAKE2_A) and server (SPAKE2_B) keep their role."""
+        assert PAKEHandler(role="client").role == "client"
+        assert PAKEHandler(role="server").role == "server"
+
+    @pytest.mark.usefixtures("fake_spake2")
     def test_encrypt_before_exchange_raises_error(self):
         """Test that encrypt() before finish_exchange() raises error."""
         client = PAKEHandler(role="client")
@@ -213,6 +249,7 @@ class TestPAKEErrorHandling:
         with pytest.raises(RuntimeError, match="PAKE exchange not completed"):
             client.encrypt("test")
 
+    @pytest.mark.usefixtures("fake_spake2")
     def test_decrypt_before_exchange_raises_error(self):
         """Test that decrypt() before finish_exchange() raises error."""
         server = PAKEHandler(role="server")
@@ -222,6 +259,7 @@ class TestPAKEErrorHandling:
         with pytest.raises(RuntimeError, match="PAKE exchange not completed"):
             server.decrypt("fake_ciphertext")
 
+    @pytest.mark.usefixtures("fake_spake2")
     def test_finish_exchange_before_start_raises_error(self):
         """Test that finish_exchange() before start_exchange() raises error."""
         client = PAKEHandler(role="client")
@@ -229,6 +267,7 @@ class TestPAKEErrorHandling:
         with pytest.raises(RuntimeError, match="Must call start_exchange"):
             client.finish_exchange(b"fake_message")
 
+    @pytest.mark.usefixtures("fake_spake2")
     def test_start_exchange_twice_raises_error(self):
         """Test that calling start_exchange() twice raises error."""
         client = PAKEHandler(role="client")
@@ -237,6 +276,7 @@ class TestPAKEErrorHandling:
         with pytest.raises(RuntimeError, match="already started"):
             client.start_exchange("123456")
 
+    @pytest.mark.usefixtures("fake_spake2")
     def test_finish_exchange_twice_raises_error(self):
         """Test that calling finish_exchange() twice raises error."""
         client = PAKEHandler(role="client")
@@ -250,6 +290,7 @@ class TestPAKEErrorHandling:
         with pytest.raises(RuntimeError, match="already completed"):
             client.finish_exchange(msg_b)
 
+    @pytest.mark.crypto
     def test_invalid_pake_message_raises_error(self):
         """Test that invalid PAKE message causes ValueError."""
         client = PAKEHandler(role="client")
@@ -258,21 +299,12 @@ class TestPAKEErrorHandling:
         with pytest.raises(ValueError, match="PAKE exchange failed"):
             client.finish_exchange(b"invalid_message_bytes")
 
-    def test_tampered_ciphertext_raises_error(self):
+    def test_tampered_ciphertext_raises_error(self, pake_pair):
         """Test that tampered ciphertext causes decryption failure."""
-        password = "123456"
-
-        client = PAKEHandler(role="client")
-        server = PAKEHandler(role="server")
-
-        msg_a = client.start_exchange(password)
-        msg_b = server.start_exchange(password)
-
-        client.finish_exchange(msg_b)
-        server.finish_exchange(msg_a)
+        client, server = pake_pair
 
-        # Encrypt valid data
-        encrypted = client.encrypt("secret")
+        # Encrypt valid data (the GCM tag check fails whatever the payload size)
+        encrypted = client.encrypt("x")
 
         # Tamper with ciphertext (modify one character)
         tampered = encrypted[:-1] + "X"
@@ -285,98 +317,46 @@ class TestPAKEErrorHandling:
 class TestPAKEEncryptionDecryption:
     """Test encryption/decryption functionality."""
 
-    def test_encrypt_decrypt_json_data(self):
-        """Test encryption/decryption of JSON data structures."""
-        password = "123456"
-
-        client = PAKEHandler(role="client")
-        server = PAKEHandler(role="server")
-
-        msg_a = client.start_exchange(password)
-        msg_b = server.start_exchange(password)
-
-        client.finish_exchange(msg_b)
-        server.finish_exchange(msg_a)
-
-        # Test with JSON string (typical use case)
-        import json
-        payload = {
+    @pytest.mark.parametrize("plaintext", [
+        # JSON string (typical use case)
+        json.dumps({
             "domain": "example.com",
             "username": "testuser",
             "password": "testpass",
             "timestamp": "2025-10-29T00:00:00Z"
-        }
-        plaintext = json.dumps(payload)
+        }),
+        "",
+        "x" * 1024,
+        "Hello 世界 🔐 Привет",
+    ], ids=["json", "empty", "1k", "unicode"])
+    def test_encrypt_decrypt_roundtrip(self, pake_pair, plaintext):
+        """Test encryption/decryption round trip for different payloads."""
+        client, server = pake_pair
 
         encrypted = client.encrypt(plaintext)
         decrypted = server.decrypt(encrypted)
 
         assert decrypted == plaintext
-        assert json.loads(decrypted) == payload
 
-    def test_encrypt_decrypt_empty_string(self):
-        """Test encryption/decryption of empty string."""
-        password = "123456"
 
-        client = PAKEHandler(role="client")
-        server = PAKEHandler(role="server")
-
-        msg_a = client.start_exchange(password)
-        msg_b = server.start_exchange(password)
-
-        client.finish_exchange(msg_b)
-        server.finish_exchange(msg_a)
-
-        encrypted = client.encrypt("")
-        decrypted = server.decrypt(encrypted)
-
-        assert decrypted == ""
-
-    def test_encrypt_decrypt_large_data(self):
-        """Test encryption/decryption of large data."""
-        password = "123456"
-
-        client = PAKEHandler(role="client")
-        server = PAKEHandler(role="server")
-
-        msg_a = client.start_exchange(password)
-        msg_b = server.start_exchange(password)
-
-        client.finish_exchange(msg_b)
-        server.finish_exchange(msg_a)
-
-        # Large data (10KB)
-        large_data = "x" * 10000
-
-        encrypted = client.encrypt(large_data)
-        decrypted = server.decrypt(encrypted)
-
-        assert decrypted == large_data
-        assert len(decrypted) == 10000
-
-    def test_encrypt_decrypt_unicode(self):
-        """Test encryption/decryption with unicode characters."""
-        password = "123456"
+@pytest.mark.crypto
+class TestPAKESecurityProperties:
+    """Test security properties of PAKE implementation."""
 
+    def test_wipe_zeroes_shared_key(self):
+        """Test that wipe() zeroes the key buffer and disables encryption."""
         client = PAKEHandler(role="client")
         server = PAKEHandler(role="server")
+        client.start_exchange("123456")
+        client.finish_exchange(server.start_exchange("123456"))
 
-        msg_a = client.start_exchange(password)
-        msg_b = server.start_exchange(password)
-
-        client.finish_exchange(msg_b)
-        server.finish_exchange(msg_a)
-
-        unicode_data = "Hello 世界 🔐 Привет"
-
-        encrypted = client.encrypt(unicode_data)
-        decrypted = server.decrypt(encrypted)
-
-        assert decrypted == unicode_data
-
+        key_buffer = client._shared_key
+        client.wipe()
 
-class TestPAKESecurityProperties:
-    """Test security properties of PAKE implementation."""
+        assert key_buffer == bytearray(len(key_buffer))
+        assert not client.is_ready()
+        with pytest.raises(RuntimeError):
+            client.encrypt("secret")
 
     def test_is_ready_returns_correct_state(self):
         """Test that is_ready() returns correct state at each stage."""
@@ -395,29 +375,6 @@ class TestPAKESecurityProperties:
         client.finish_exchange(msg_b)
         assert client.is_ready()
 
-    def test_different_roles_can_communicate(self):
-        """Verify that client (SPAKE2_A) and server (SPAKE2_B) can communicate."""
-        password = "123456"
-
-        # Client uses SPAKE2_A
-        client = PAKEHandler(role="client")
-        assert client.role == "client"
-
-        # Server uses SPAKE2_B
-        server = PAKEHandler(role="server")
-        assert server.role == "server"
-
-        # Exchange should work
-        msg_a = client.start_exchange(password)
-        msg_b = server.start_exchange(password)
-
-        client.finish_exchange(msg_b)
-        server.finish_exchange(msg_a)
-
-        # Both should be ready
-        assert client.is_ready()
-        assert server.is_ready()
-
     def test_password_not_transmitted_in_messages(self):
         """
         Verify that password is not present in protocol messages.
@@ -434,9 +391,6 @@ class TestPAKESecurityProperties:
         msg_b = server.start_exchange(password)
 
         # Password should not appear in messages (as bytes)
-        assert password.encode('utf-8') not in msg_a
-        assert password.encode('utf-8') not in msg_b
-
-        # Password should not appear in hex representation
-        assert password not in msg_a.hex()
-        assert password not in msg_b.hex()
+        password_bytes = password.encode('utf-8')
+        assert password_bytes not in msg_a
+        assert password_bytes not in msg_b
@@ -0,0 +1,137 @@
+"""
+Unit tests for SessionCache - shared vault session key.
+
+Tests validate:
+- Master password is requested only once per session
+- Session key expires after TTL and the vault is locked again
+- Password buffer is wiped after unlock
+"""
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from src.utils.bitwarden_cli import BitwardenCLIError
+from src.utils.session_cache import SessionCache
+
+
+class TestSessionCache:
+    """Test session key caching."""
+
+    def test_prompts_once(self):
+        """Test that repeated calls reuse the cached session key."""
+        cli = Mock()
+        cli.unlock.return_value = "session_key_1"
+        prompt = Mock(side_effect=lambda: bytearray(b"master"))
+        cache = SessionCache(cli, prompt, ttl=60)
+
+        assert cache.get_session_key() == "session_key_1"
+        assert cache.get_session_key() == "session_key_1"
+
+        assert prompt.call_count == 1
+        assert cli.unlock.call_count == 1
+
+    def test_concurrent_callers_share_one_prompt(self):
+        """Test that threads waiting on the lock reuse the first unlock."""
+        cli = Mock()
+        cli.unlock.return_value = "session_key_1"
+        prompt = Mock(side_effect=lambda: bytearray(b"master"))
+        cache = SessionCache(cli, prompt, ttl=60)
+
+        threads = [threading.Thread(target=cache.get_session_key) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert prompt.call_count == 1
+
+    def test_expired_session_prompts_again(self):
+        """Test that a key older than ttl is not reused."""
+        cli = Mock()
+        cli.unlock.side_effect = ["session_key_1", "session_key_2"]
+        prompt = Mock(side_effect=lambda: bytearray(b"master"))
+        cache = SessionCache(cli, prompt, ttl=0)
+
+        assert cache.get_session_key() == "session_key_1"
+        assert cache.cached_session_key() is None
+        assert cache.get_session_key() == "session_key_2"
+
+    def test_expired_session_locks_vault(self):
+        """Test that the vault is locked once the key passes its ttl."""
+        cli = Mock()
+        cli.unlock.return_value = "session_key_1"
+        cache = SessionCache(cli, lambda: bytearray(b"master"), ttl=0)
+
+        cache.get_session_key()
+        cli.lock.assert_not_called()
+
+        assert cache.cached_session_key() is None
+        cli.lock.assert_called_once()
+
+    def test_ttl_from_environment(self, monkeypatch):
+        """Test that BW_SESSION_TTL sets the default ttl."""
+        monkeypatch.setenv("BW_SESSION_TTL", "120")
+        cache = SessionCache(Mock(), Mock())
+
+        assert cache.ttl == 120
+
+    def test_password_wiped_after_unlock(self):
+        """Test that the password buffer is zeroed after unlock."""
+        password = bytearray(b"master")
+        cli = Mock()
+        cli.unlock.return_value = "session_key_1"
+        cache = SessionCache(cli, lambda: password, ttl=60)
+
+        cache.get_session_key()
+
+        assert password == bytearray(len(b"master"))
+
+    def test_empty_password_raises(self):
+        """Test that an empty password is rejected without unlocking."""
+        cli = Mock()
+        cache = SessionCache(cli, lambda: bytearray(), ttl=60)
+
+        with pytest.raises(BitwardenCLIError):
+            cache.get_session_key()
+
+        cli.unlock.assert_not_called()
+
+    def test_invalidate_drops_key(self):
+        """Test that invalidate() forces a new unlock."""
+        cli = Mock()
+        cli.unlock.return_value = "session_key_1"
+        cache = SessionCache(cli, lambda: bytearray(b"master"), ttl=60)
+
+        cache.get_session_key()
+        cache.invalidate()
+
+        assert cache.cached_session_key() is None
+
+    def test_lock_drops_key_and_locks_vault(self):
+        """Test that lock() locks the vault and forces a new unlock."""
+        cli = Mock()
+        cli.unlock.return_value = "session_key_1"
+        cache = SessionCache(cli, lambda: bytearray(b"master"), ttl=60)
+
+        cache.get_session_key()
+        cache.lock()
+
+        cli.lock.assert_called_once()
+        assert cache.cached_session_key() is None
+
+    def test_drop_listeners_run_on_lock_invalidate_and_expiry(self):
+        """Test that listeners hear about every way the key is dropped."""
+        cli = Mock()
+        cli.unlock.return_value = "session_key_1"
+        cache = SessionCache(cli, lambda: bytearray(b"master"), ttl=60)
+        listener = Mock()
+        cache.add_drop_listener(listener)
+
+        cache.lock()
+        cache.invalidate()
+        cache.get_session_key()
+        cache.ttl = 0
+        cache.cached_session_key()
+
+        assert listener.call_count == 3
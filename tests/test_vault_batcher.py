@@ -0,0 +1,97 @@
+"""
+Unit tests for VaultBatcher - coalesced vault lookups.
+
+Tests validate:
+- A lone lookup runs the bw search term directly
+- Concurrent lookups for one search share a single vault query
+- Different searches each run their own bw search
+- Query failures reach every waiting caller
+"""
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.utils.bitwarden_cli import BitwardenCLIError
+from src.utils.vault_batcher import VaultBatcher
+
+AA_ITEM = {"name": "American Airlines", "login": {"uris": [{"uri": "https://www.aa.com"}]}}
+UA_ITEM = {"name": "United", "login": {"uris": [{"uri": "https://united.com"}]}}
+
+
+def _blocking_cli(results):
+    """CLI mock whose list_items blocks until released, then returns results[search]."""
+    cli = Mock()
+    release = threading.Event()
+
+    def list_items(search, session_key):
+        release.wait(5)
+        return results[search]
+
+    cli.list_items.side_effect = list_items
+    return cli, release
+
+
+def _run_lookups(batcher, searches):
+    """Start one lookup thread per search and return (threads, results)."""
+    results = {}
+
+    def lookup(index, domain):
+        results[index] = batcher.list_items(domain, "token1")
+
+    threads = [threading.Thread(target=lookup, args=(i, d)) for i, d in enumerate(searches)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+class TestVaultBatcher:
+    """Test vault lookup coalescing."""
+
+    def test_single_lookup_uses_search(self):
+        """Test that a lookup with no concurrent peers runs bw --search."""
+        cli = Mock()
+        cli.list_items.return_value = [AA_ITEM]
+        batcher = VaultBatcher(lambda: cli)
+
+        assert batcher.list_items("aa.com", "token1") == [AA_ITEM]
+        cli.list_items.assert_called_once_with("aa.com", "token1")
+
+    def test_concurrent_same_search_shares_one_query(self):
+        """Test that lookups for one search while it runs share its result."""
+        cli, release = _blocking_cli({"aa.com": [AA_ITEM]})
+        batcher = VaultBatcher(lambda: cli)
+
+        threads, results = _run_lookups(batcher, ["aa.com", "aa.com", "aa.com"])
+        time.sleep(0.2)  # Let every lookup reach the in-flight query
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        cli.list_items.assert_called_once_with("aa.com", "token1")
+        assert list(results.values()) == [[AA_ITEM]] * 3
+
+    def test_different_searches_run_own_queries(self):
+        """Test that concurrent lookups for different domains never list the whole vault."""
+        cli, release = _blocking_cli({"aa.com": [AA_ITEM], "united.com": [UA_ITEM]})
+        batcher = VaultBatcher(lambda: cli)
+
+        release.set()
+        threads, results = _run_lookups(batcher, ["aa.com", "united.com"])
+        for thread in threads:
+            thread.join()
+
+        searches = sorted(call.args[0] for call in cli.list_items.call_args_list)
+        assert searches == ["aa.com", "united.com"]
+        assert results == {0: [AA_ITEM], 1: [UA_ITEM]}
+
+    def test_query_error_raised_to_caller(self):
+        """Test that a failed vault query raises BitwardenCLIError."""
+        cli = Mock()
+        cli.list_items.side_effect = BitwardenCLIError("Failed to list items")
+        batcher = VaultBatcher(lambda: cli)
+
+        with pytest.raises(BitwardenCLIError):
+            batcher.list_items("aa.com", "token1")
+        assert batcher._pending == {}